@@ -0,0 +1,83 @@
+"""
+Benchmark the block-tree walk in NotionClient against the fake Notion API.
+
+Every API call sleeps for a fixed latency, so the numbers show how well
+sibling subtrees overlap at different concurrency limits. Smaller result
+pages and injected 429s show how pagination and retries cost throughput.
+
+Usage:
+    python benchmarks/bench_block_tree.py [--latency 0.02] [--days 20]
+        [--page-size 100] [--rate-limit-every 0] [--cassette recorded.jsonl]
+"""
+
+import argparse
+import time
+
+from notion_assistant.api.client import NotionClient
+from notion_assistant.api.fake import Cassette, FakeNotionWorkspace, fake_notion_client
+from notion_assistant.api.ratelimit import RateLimiter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--blocks-per-day", type=int, default=5)
+    parser.add_argument("--fanout", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument(
+        "--rate-limit-every", type=int, default=0, help="answer every n-th call 429"
+    )
+    parser.add_argument(
+        "--cassette", help="replay recorded responses (needs --page-id)", default=None
+    )
+    parser.add_argument("--page-id", default=None)
+    args = parser.parse_args()
+
+    if args.cassette:
+        workspace = Cassette(args.cassette)
+        page_id = args.page_id
+        print(f"recorded page {page_id}, {args.latency * 1000:.0f} ms per call")
+    else:
+        workspace = FakeNotionWorkspace(page_size=args.page_size)
+        page_id = workspace.add_synthetic_journal(
+            days=args.days,
+            blocks_per_day=args.blocks_per_day,
+            fanout=args.fanout,
+            depth=args.depth,
+        )
+        print(
+            f"page with {len(workspace.blocks)} blocks, "
+            f"{args.latency * 1000:.0f} ms per call, {args.page_size} per result page"
+        )
+    print(f"{'workers':>8} {'calls':>6} {'429s':>5} {'seconds':>8} {'speedup':>8}")
+
+    baseline = None
+    for workers in args.workers:
+        sdk_client, transport = fake_notion_client(
+            workspace,
+            latency=args.latency,
+            rate_limit_every=args.rate_limit_every,
+        )
+        # Pacing off: this measures the walk itself, not Notion's rate limit
+        client = NotionClient(
+            client=sdk_client,
+            max_workers=workers,
+            rate_limiter=RateLimiter(rate=None, base_delay=args.latency),
+        )
+        start = time.perf_counter()
+        content = client.get_page_content(page_id)
+        elapsed = time.perf_counter() - start
+        client.close()
+        assert content is not None
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>8} {transport.calls:>6} {transport.rate_limited:>5} "
+            f"{elapsed:>8.2f} {baseline / elapsed:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
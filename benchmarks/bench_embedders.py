@@ -0,0 +1,110 @@
+"""
+Compare the embedding backends: throughput, query latency and agreement.
+
+Embeds the same synthetic entries with every backend and reports texts per
+second at a fixed batch size, then the latency of embedding one query at a
+time. Agreement with the first backend is the mean cosine similarity of the
+two vectors of each text, and how many of the top-k entries for each query
+both backends retrieve.
+
+The model is staged and exported into --data-dir on first use, as
+MemoryManager does; pass --offline to only use what is already there.
+
+Usage:
+    python benchmarks/bench_embedders.py [--texts 1000] [--queries 100]
+        [--backends torch onnx-int8] [--model all-MiniLM-L6-v2]
+        [--data-dir ~/notion_assistant_data]
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from notion_assistant.memory.embedders import BACKENDS
+from notion_assistant.memory.resources import DEFAULT_DATA_DIR, registry
+
+WORDS = (
+    "meeting shipped bug review walk dinner call plan idea tired focus read "
+    "wrote fixed garden gym friend budget design test deploy notes"
+).split()
+
+
+def synthetic_texts(count, words, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(words)) for _ in range(count)]
+
+
+def top_k(queries, corpus, k):
+    return np.argsort(-(queries @ corpus.T), axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=60, help="words per text")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--offline", action="store_true")
+    args = parser.parse_args()
+
+    corpus = synthetic_texts(args.texts, args.words)
+    queries = synthetic_texts(args.queries, 6, seed=1)
+    print(
+        f"{args.texts} texts of {args.words} words, {args.queries} queries, "
+        f"model {args.model}, batch {args.batch_size}"
+    )
+    print(
+        f"{'backend':>10} {'load s':>7} {'texts/s':>8} {'p50 ms':>7} "
+        f"{'p95 ms':>7} {'cosine':>7} {f'top-{args.top_k}':>6} {'top-1':>6}"
+    )
+    baseline = None
+    for backend in args.backends:
+        where = {"data_dir": args.data_dir, "offline": args.offline}
+        model = registry.model(args.model, backend=backend, **where)
+        load = registry.model_load(args.model, backend=backend, **where)
+        model.encode(corpus[: args.batch_size], batch_size=args.batch_size)  # warm up
+
+        start = time.perf_counter()
+        vectors = np.asarray(model.encode(corpus, batch_size=args.batch_size))
+        throughput = len(corpus) / (time.perf_counter() - start)
+
+        latencies = []
+        query_vectors = []
+        for query in queries:
+            start = time.perf_counter()
+            query_vectors.append(model.encode([query])[0])
+            latencies.append((time.perf_counter() - start) * 1000)
+        query_vectors = np.asarray(query_vectors)
+        hits = top_k(query_vectors, vectors, args.top_k)
+
+        if baseline is None:
+            baseline = (vectors, hits)
+            agreement = (1.0, 1.0, 1.0)
+        else:
+            base_vectors, base_hits = baseline
+            cosine = np.mean(
+                np.sum(vectors * base_vectors, axis=1)
+                / (
+                    np.linalg.norm(vectors, axis=1)
+                    * np.linalg.norm(base_vectors, axis=1)
+                )
+            )
+            overlap = np.mean(
+                [len(set(a) & set(b)) / args.top_k for a, b in zip(hits, base_hits)]
+            )
+            agreement = (cosine, overlap, np.mean(hits[:, 0] == base_hits[:, 0]))
+        print(
+            f"{backend:>10} {load.seconds:>7.2f} {throughput:>8.0f} "
+            f"{np.percentile(latencies, 50):>7.1f} {np.percentile(latencies, 95):>7.1f} "
+            f"{agreement[0]:>7.4f} {agreement[1]:>6.0%} {agreement[2]:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark HTTP connection reuse during concurrent block-tree walks.
+
+Serves a synthetic journal from a local FakeNotionServer over real TCP
+sockets, walks it with NotionClient at several HTTP client settings, and
+reports how many connections each walk opened.
+
+Usage:
+    python benchmarks/bench_http_pool.py [--days 20] [--workers 8] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import httpx
+
+from notion_assistant.api.client import NotionClient
+from notion_assistant.api.fake import FakeNotionServer, FakeNotionWorkspace
+from notion_assistant.api.http import HttpOptions, build_http_client, build_sdk_client
+from notion_assistant.api.ratelimit import RateLimiter
+
+
+def walk(server, http_client, page_id, workers, repeat):
+    """Walk the page ``repeat`` times with one client; return (seconds, calls, conns)."""
+    client = NotionClient(
+        client=build_sdk_client("fake-token", http_client, base_url=server.url),
+        max_workers=workers,
+        rate_limiter=RateLimiter(rate=None),
+    )
+    server.reset_counters()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        assert client.get_page_content(page_id) is not None
+    elapsed = time.perf_counter() - start
+    client.close()
+    http_client.close()
+    return elapsed, server.requests, server.connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    workspace = FakeNotionWorkspace()
+    page_id = workspace.add_synthetic_journal(days=args.days)
+    pool_size = args.workers + 1
+
+    modes = [
+        (
+            "no keep-alive",
+            lambda: build_http_client(
+                HttpOptions(max_keepalive_connections=0), pool_size
+            ),
+        ),
+        ("httpx defaults", lambda: httpx.Client()),
+        ("pooled", lambda: build_http_client(HttpOptions(), pool_size)),
+    ]
+
+    with FakeNotionServer(workspace, latency=args.latency) as server:
+        print(
+            f"page with {len(workspace.blocks)} blocks, {args.workers} workers, "
+            f"{args.repeat} walks"
+        )
+        print(
+            f"{'mode':>15} {'requests':>9} {'connections':>12} "
+            f"{'req/conn':>9} {'seconds':>8}"
+        )
+        for name, make_client in modes:
+            seconds, requests, connections = walk(
+                server, make_client(), page_id, args.workers, args.repeat
+            )
+            print(
+                f"{name:>15} {requests:>9} {connections:>12} "
+                f"{requests / max(1, connections):>9.1f} {seconds:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark block parsing: validated pydantic models vs the fast path.
+
+Parses every block of a synthetic journal and reports the per-block cost
+and the memory held by the parsed models.
+
+Usage:
+    python benchmarks/bench_parse.py [--days 200] [--repeat 3]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from notion_assistant.api.client import MAX_PAGE_SIZE, NotionClient
+from notion_assistant.api.fake import FakeNotionWorkspace, fake_notion_client
+
+
+def parse_all(client, raw_blocks):
+    """Parse in listings of MAX_PAGE_SIZE, as the API returns them."""
+    parsed = []
+    for start in range(0, len(raw_blocks), MAX_PAGE_SIZE):
+        parsed.extend(client._parse_blocks(raw_blocks[start : start + MAX_PAGE_SIZE]))
+    return parsed
+
+
+def measure(client, raw_blocks, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_all(client, raw_blocks)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    parsed = parse_all(client, raw_blocks)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+    return best, held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    workspace = FakeNotionWorkspace()
+    workspace.add_synthetic_journal(days=args.days)
+    raw_blocks = list(workspace.blocks.values())
+    sdk_client, _ = fake_notion_client(workspace)
+
+    modes = [
+        ("validated", dict()),
+        ("fast + annotations", dict(fast_parse=True, keep_annotations=True)),
+        ("fast", dict(fast_parse=True)),
+    ]
+    print(f"{len(raw_blocks)} blocks")
+    print(f"{'mode':>20} {'us/block':>9} {'bytes/block':>12}")
+    for name, options in modes:
+        client = NotionClient(client=sdk_client, **options)
+        seconds, held = measure(client, raw_blocks, args.repeat)
+        print(
+            f"{name:>20} {seconds / len(raw_blocks) * 1e6:>9.2f} "
+            f"{held / len(raw_blocks):>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark LogEntryProcessor.process_pages against serial process_page calls.
+
+Builds a synthetic corpus of journal pages, processes it serially and over
+process pools of different sizes, and checks every run yields the same
+entries in the same order. Pools only pay off with several cores and a
+large corpus; with one core they show the dispatch overhead.
+
+Usage:
+    python benchmarks/bench_process_pages.py [--pages 3000] [--workers 2 4]
+"""
+
+import argparse
+import os
+import time
+
+from notion_assistant.api.models import NotionBlock, PageContent
+from notion_assistant.memory.processor import LogEntryProcessor
+
+
+def synthetic_corpus(pages, days, blocks_per_day):
+    def block(block_id, block_type, text):
+        return NotionBlock.model_validate(
+            {
+                "id": block_id,
+                "type": block_type,
+                "content": {"rich_text": [{"plain_text": text}]},
+            }
+        )
+
+    corpus = []
+    for page in range(pages):
+        blocks = []
+        for day in range(days):
+            blocks.append(
+                block(
+                    f"{page}-{day}",
+                    "heading_2",
+                    f"2024-{day % 12 + 1:02d}-{day % 28 + 1:02d}",
+                )
+            )
+            for i in range(blocks_per_day):
+                blocks.append(
+                    block(
+                        f"{page}-{day}-{i}",
+                        "paragraph",
+                        f"note {i} of page {page}: what happened, what's next, how it felt",
+                    )
+                )
+        corpus.append(PageContent(title=f"Page {page}", blocks=blocks, id=str(page)))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=3000)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--blocks-per-day", type=int, default=8)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({2, os.cpu_count() or 1})
+    )
+    parser.add_argument("--chunksize", type=int, default=None)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.pages, args.days, args.blocks_per_day)
+    processor = LogEntryProcessor()
+    print(
+        f"{args.pages} pages, {sum(len(p.blocks) for p in corpus)} blocks, "
+        f"{os.cpu_count()} CPUs"
+    )
+
+    start = time.perf_counter()
+    expected = [processor.process_page(page) for page in corpus]
+    serial = time.perf_counter() - start
+    entries = sum(len(page) for page in expected)
+    print(f"{'workers':>8} {'seconds':>8} {'pages/s':>9} {'speedup':>8}")
+    print(f"{'serial':>8} {serial:>8.2f} {args.pages / serial:>9.0f} {1.0:>7.1f}x")
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        result = processor.process_pages(
+            corpus, workers=workers, chunksize=args.chunksize
+        )
+        elapsed = time.perf_counter() - start
+        assert result == expected, "process_pages changed the entries"
+        print(
+            f"{workers:>8} {elapsed:>8.2f} {args.pages / elapsed:>9.0f} "
+            f"{serial / elapsed:>7.1f}x"
+        )
+    print(f"{entries} entries per run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark MemoryManager.store_entries at different batch sizes.
+
+Stores the same synthetic entries into a fresh Chroma collection once per
+batch size and reports entries per second. Batch size 1 pays one model call
+and one set of Chroma writes per entry, as storing entries one by one does.
+
+Usage:
+    python benchmarks/bench_store_entries.py [--entries 2000]
+        [--batch-sizes 1 8 32 128] [--model all-MiniLM-L6-v2]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from notion_assistant.memory.manager import MemoryManager
+from notion_assistant.memory.models import LogEntry
+
+WORDS = (
+    "meeting shipped bug review walk dinner call plan idea tired focus read "
+    "wrote fixed garden gym friend budget design test deploy notes"
+).split()
+
+
+def synthetic_entries(count, words, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1)
+    return [
+        LogEntry(
+            date=start + timedelta(days=i),
+            blocks=[],
+            raw_text=" ".join(rng.choice(WORDS) for _ in range(words)),
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=60, help="words per entry")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    args = parser.parse_args()
+
+    print(f"{args.entries} entries of {args.words} words, model {args.model}")
+    print(f"{'batch':>6} {'seconds':>8} {'entries/s':>10} {'speedup':>8}")
+    baseline = None
+    for batch_size in args.batch_sizes:
+        entries = synthetic_entries(args.entries, args.words)
+        with tempfile.TemporaryDirectory() as data_dir:
+            manager = MemoryManager(data_dir=data_dir, model_name=args.model)
+            start = time.perf_counter()
+            ids = manager.store_entries(entries, batch_size=batch_size)
+            elapsed = time.perf_counter() - start
+            assert len(ids) == args.entries
+            assert manager.collection.count() == args.entries
+        baseline = baseline or elapsed
+        print(
+            f"{batch_size:>6} {elapsed:>8.2f} {args.entries / elapsed:>10.0f} "
+            f"{baseline / elapsed:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from notion_client import AsyncClient
+from .client import (
+    MAX_PAGE_SIZE,
+    BaseNotionClient,
+    NotionPage,
+    _read_token,
+    print_content,
+)
+from .models import NotionBlock, PageContent
+from .ratelimit import RateLimiter, get_rate_limiter
+
+
+class AsyncNotionClient(BaseNotionClient):
+    """Asynchronous Notion client built on ``notion_client.AsyncClient``.
+
+    Returns the same ``NotionPage``/``PageContent`` models as ``NotionClient``.
+    Sibling subtrees are fetched as concurrent tasks, and a semaphore caps the
+    number of requests in flight.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncClient] = None,
+        max_concurrency: int = 8,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        if client is None:
+            self.token = _read_token()
+            client = AsyncClient(auth=self.token)
+        self.client = client
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the request semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _request(self, endpoint: Callable[..., Awaitable[Any]], **kwargs) -> Any:
+        """Run one API call under the concurrency limit and the rate limiter."""
+        async with self._get_semaphore():
+            return await self.rate_limiter.call_async(endpoint, **kwargs)
+
+    async def aclose(self):
+        """Close the underlying HTTP connection pool."""
+        await self.client.aclose()
+
+    async def _iter_search(self, object_type: str) -> AsyncIterator[Dict]:
+        """Yield every search result of one object type, following next_cursor."""
+        has_more = True
+        start_cursor = None
+
+        while has_more:
+            response = await self._request(
+                self.client.search,
+                filter={"property": "object", "value": object_type},
+                page_size=MAX_PAGE_SIZE,
+                start_cursor=start_cursor,
+            )
+            for result in response.get("results", []):
+                yield result
+
+            has_more = response.get("has_more", False)
+            start_cursor = response.get("next_cursor")
+
+    async def iter_shared_pages(self) -> AsyncIterator[NotionPage]:
+        """Yield pages shared with the integration as search results arrive."""
+        async for page in self._iter_search("page"):
+            yield self._parse_page(page)
+
+    async def iter_shared_databases(self) -> AsyncIterator[NotionPage]:
+        """Yield databases shared with the integration as search results arrive."""
+        async for database in self._iter_search("database"):
+            yield self._parse_database(database)
+
+    async def list_shared_pages(self) -> List[NotionPage]:
+        """List all pages shared with the integration."""
+        try:
+            return [page async for page in self.iter_shared_pages()]
+        except Exception as e:
+            print(f"Error listing pages: {e}")
+            return []
+
+    async def list_shared_databases(self) -> List[NotionPage]:
+        """List all databases shared with the integration."""
+        try:
+            return [database async for database in self.iter_shared_databases()]
+        except Exception as e:
+            print(f"Error listing databases: {e}")
+            return []
+
+    async def _list_block_children(self, block_id: str) -> List[NotionBlock]:
+        """Get the direct children of a block, following pagination."""
+        blocks = []
+        has_more = True
+        start_cursor = None
+
+        while has_more:
+            response = await self._request(
+                self.client.blocks.children.list,
+                block_id=block_id,
+                start_cursor=start_cursor,
+            )
+
+            blocks.extend(self._parse_blocks(response.get("results", [])))
+
+            has_more = response.get("has_more", False)
+            start_cursor = response.get("next_cursor")
+
+        return blocks
+
+    async def _get_block_children(self, block_id: str) -> List[NotionBlock]:
+        """Recursively get all child blocks, fetching sibling subtrees concurrently."""
+        blocks = await self._list_block_children(block_id)
+
+        parents = [block for block in blocks if block.has_children]
+        # Same semantics as asyncio.TaskGroup (3.11+), which python_requires
+        # rules out: the first failure cancels the sibling subtrees and is raised.
+        tasks = [
+            asyncio.ensure_future(self._get_block_children(parent.id))
+            for parent in parents
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        for parent, children in zip(parents, results):
+            parent.children = children
+
+        return blocks
+
+    async def get_page_content(self, page_id: str) -> Optional[PageContent]:
+        """Retrieve all content from a specific page."""
+        try:
+            page, blocks = await asyncio.gather(
+                self._request(self.client.pages.retrieve, page_id=page_id),
+                self._get_block_children(page_id),
+            )
+            return PageContent(
+                title=self._page_title(page),
+                blocks=blocks,
+                id=page["id"],
+                last_edited_time=page.get("last_edited_time"),
+                archived=self._is_archived(page),
+            )
+        except Exception as e:
+            print(f"Error getting page content: {e}")
+            return None
+
+
+class BlockingNotionClient:
+    """Synchronous facade over ``AsyncNotionClient``.
+
+    Exposes the same methods as ``NotionClient`` so callers such as
+    ``main.py`` can use the async fetch path without becoming async. All calls
+    run on one private event loop, so the HTTP pool is reused between calls.
+    """
+
+    def __init__(self, client: Optional[AsyncNotionClient] = None, **kwargs):
+        self.async_client = client or AsyncNotionClient(**kwargs)
+        self._loop = asyncio.new_event_loop()
+
+    def _run(self, coroutine: Awaitable[Any]) -> Any:
+        return self._loop.run_until_complete(coroutine)
+
+    def close(self):
+        """Close the HTTP pool and the private event loop."""
+        if not self._loop.is_closed():
+            self._run(self.async_client.aclose())
+            self._loop.close()
+
+    def list_shared_pages(self) -> List[NotionPage]:
+        return self._run(self.async_client.list_shared_pages())
+
+    def list_shared_databases(self) -> List[NotionPage]:
+        return self._run(self.async_client.list_shared_databases())
+
+    def get_page_content(self, page_id: str) -> Optional[PageContent]:
+        return self._run(self.async_client.get_page_content(page_id))
+
+    def print_page_content(self, page_id: str):
+        """Print the content of a page in a readable format."""
+        content = self.get_page_content(page_id)
+        if not content:
+            print("Could not retrieve page content")
+            return
+
+        print_content(content)
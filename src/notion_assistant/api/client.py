@@ -1,80 +1,185 @@
-from typing import List, Dict, Any, Optional
+from typing import (
+    TYPE_CHECKING,
+    List,
+    Dict,
+    Any,
+    Iterable,
+    Iterator,
+    FrozenSet,
+    Optional,
+)
+from dataclasses import dataclass
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from notion_client import Client
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from dotenv import load_dotenv
 import os
-from .models import NotionBlock, BlockContent, RichText, PageContent
+import httpx
+from .models import NotionBlock, BlockContent, LazyChildren, RichText, PageContent
+from .http import HttpOptions, build_http_client, build_sdk_client
+from .mirror import NotionMirror
+from .ratelimit import RateLimiter, get_rate_limiter
 
+if TYPE_CHECKING:
+    from .snapshot import SnapshotStats
 
-class NotionPage(BaseModel):
-    id: str
-    title: str
-    url: str
-    type: str
+# Largest page_size the search and block-children endpoints accept
+MAX_PAGE_SIZE = 100
 
+_BLOCK_LIST = TypeAdapter(List[NotionBlock])
 
-class NotionClient:
-    def __init__(self):
-        load_dotenv()
-        self.token = os.getenv("NOTION_TOKEN")
-        if not self.token:
-            raise ValueError("NOTION_TOKEN not found in environment variables")
-        self.client = Client(auth=self.token)
 
-    def list_shared_pages(self) -> List[NotionPage]:
-        """List all pages shared with the integration."""
-        try:
-            response = self.client.search(
-                filter={"property": "object", "value": "page"}
-            )
+@dataclass(frozen=True)
+class TreeLimits:
+    """Which children of a block tree to fetch, and when.
 
-            pages = []
-            for page in response.get("results", []):
-                title = (
-                    page.get("properties", {})
-                    .get("title", {})
-                    .get("title", [{}])[0]
-                    .get("plain_text", "Untitled")
-                )
-                pages.append(
-                    NotionPage(
-                        id=page["id"], title=title, url=page.get("url", ""), type="page"
-                    )
-                )
-            return pages
-        except Exception as e:
-            print(f"Error listing pages: {e}")
-            return []
+    Top-level blocks are at depth 0; with ``max_depth=0`` none of their
+    children are fetched. Blocks of a type in ``skip_types`` keep
+    ``has_children`` but are not expanded. With ``lazy``, children are
+    fetched on first access of ``NotionBlock.children`` instead of up front.
+    """
 
-    def list_shared_databases(self) -> List[NotionPage]:
-        """List all databases shared with the integration."""
-        try:
-            response = self.client.search(
-                filter={"property": "object", "value": "database"}
-            )
+    max_depth: Optional[int] = None
+    skip_types: FrozenSet[str] = frozenset()
+    lazy: bool = False
 
-            databases = []
-            for database in response.get("results", []):
-                title = database.get("title", [{}])[0].get("plain_text", "Untitled")
-                databases.append(
-                    NotionPage(
-                        id=database["id"],
-                        title=title,
-                        url=database.get("url", ""),
-                        type="database",
-                    )
-                )
-            return databases
-        except Exception as e:
-            print(f"Error listing databases: {e}")
-            return []
+    @classmethod
+    def of(
+        cls,
+        max_depth: Optional[int] = None,
+        skip_types: Optional[Iterable[str]] = None,
+        lazy: bool = False,
+    ) -> "TreeLimits":
+        return cls(max_depth, frozenset(skip_types or ()), lazy)
+
+    @property
+    def complete(self) -> bool:
+        """Whether the whole tree is fetched up front."""
+        return self.max_depth is None and not self.skip_types and not self.lazy
+
+    def expands(self, block: NotionBlock, depth: int) -> bool:
+        return (
+            block.has_children
+            and block.type not in self.skip_types
+            and (self.max_depth is None or depth < self.max_depth)
+        )
+
+
+FULL_TREE = TreeLimits()
+
+
+class NotionPage(BaseModel):
+    id: str
+    title: str
+    url: str
+    type: str
+    last_edited_time: Optional[str] = None
+    parent_id: Optional[str] = None  # database id, for database rows
+    archived: bool = False  # archived or in the trash
+
+
+def edited_since_filter(timestamp: str) -> Dict[str, Any]:
+    """Database filter matching rows edited after an ISO timestamp."""
+    return {"timestamp": "last_edited_time", "last_edited_time": {"after": timestamp}}
+
+
+def date_on_or_after_filter(property_name: str, date: str) -> Dict[str, Any]:
+    """Database filter matching rows whose date property is on or after ``date``."""
+    return {"property": property_name, "date": {"on_or_after": date}}
+
+
+def _read_token() -> str:
+    """Read the integration token from the environment (or a .env file)."""
+    load_dotenv()
+    token = os.getenv("NOTION_TOKEN")
+    if not token:
+        raise ValueError("NOTION_TOKEN not found in environment variables")
+    return token
+
+
+class BaseNotionClient:
+    """Response parsing shared by the sync and async Notion clients."""
+
+    # Validate each block tree in a single pydantic pass instead of building
+    # RichText/BlockContent/NotionBlock one model at a time
+    fast_parse: bool = False
+    # Copy rich-text annotations (bold, color, ...) into RichText models
+    keep_annotations: bool = True
+
+    def _page_title(self, page: Dict) -> str:
+        """Extract the title of a page object (or database row)."""
+        properties = page.get("properties", {})
+        title_property = properties.get("title") or next(
+            (prop for prop in properties.values() if prop.get("type") == "title"), {}
+        )
+        return (title_property.get("title") or [{}])[0].get("plain_text", "Untitled")
+
+    def _property_value(self, prop: Dict) -> Any:
+        """Reduce a database property to a plain JSON value."""
+        prop_type = prop.get("type", "")
+        value = prop.get(prop_type)
+
+        if prop_type in ("title", "rich_text"):
+            return "".join(item.get("plain_text", "") for item in value or [])
+        if prop_type in ("select", "status"):
+            return value.get("name") if value else None
+        if prop_type == "multi_select":
+            return [option.get("name") for option in value or []]
+        if prop_type == "date":
+            return value.get("start") if value else None
+        if prop_type == "people":
+            return [person.get("name") or person.get("id") for person in value or []]
+        if prop_type == "relation":
+            return [related.get("id") for related in value or []]
+        if prop_type == "formula":
+            return (value or {}).get((value or {}).get("type", ""))
+        if prop_type in ("created_by", "last_edited_by"):
+            return (value or {}).get("name") or (value or {}).get("id")
+        return value
+
+    def _parse_properties(self, page: Dict) -> Dict[str, Any]:
+        return {
+            name: self._property_value(prop)
+            for name, prop in page.get("properties", {}).items()
+        }
+
+    def _is_archived(self, page: Dict) -> bool:
+        # Newer API versions report trashed pages with in_trash
+        return bool(page.get("archived") or page.get("in_trash"))
+
+    def _database_title(self, database: Dict) -> str:
+        """Extract the title of a database object."""
+        return database.get("title", [{}])[0].get("plain_text", "Untitled")
+
+    def _parse_page(self, page: Dict) -> NotionPage:
+        return NotionPage(
+            id=page["id"],
+            title=self._page_title(page),
+            url=page.get("url", ""),
+            type="page",
+            last_edited_time=page.get("last_edited_time"),
+            parent_id=page.get("parent", {}).get("database_id"),
+            archived=self._is_archived(page),
+        )
+
+    def _parse_database(self, database: Dict) -> NotionPage:
+        return NotionPage(
+            id=database["id"],
+            title=self._database_title(database),
+            url=database.get("url", ""),
+            type="database",
+            last_edited_time=database.get("last_edited_time"),
+        )
 
     def _parse_rich_text(self, rich_text_list: List[Dict]) -> List[RichText]:
         """Parse rich text content from Notion blocks."""
         return [
             RichText(
                 plain_text=item.get("plain_text", ""),
-                annotations=item.get("annotations", {}),
+                annotations=(
+                    item.get("annotations", {}) if self.keep_annotations else {}
+                ),
                 href=item.get("href"),
             )
             for item in rich_text_list
@@ -102,66 +207,474 @@ class NotionClient:
 
         return content
 
-    def _get_block_children(self, block_id: str) -> List[NotionBlock]:
-        """Recursively get all child blocks for a given block."""
-        try:
-            blocks = []
-            has_more = True
-            start_cursor = None
+    def _block_fields(self, block: Dict) -> Dict[str, Any]:
+        """Plain-dict form of a NotionBlock, for one-pass validation."""
+        block_type = block.get("type", "")
+        block_data = block.get(block_type, {})
 
-            while has_more:
-                # Get blocks with pagination
-                response = self.client.blocks.children.list(
-                    block_id=block_id, start_cursor=start_cursor
+        if self.keep_annotations:
+            rich_text = [
+                {
+                    "plain_text": item.get("plain_text", ""),
+                    "annotations": item.get("annotations", {}),
+                    "href": item.get("href"),
+                }
+                for item in block_data.get("rich_text", [])
+            ]
+        else:
+            rich_text = [
+                {"plain_text": item.get("plain_text", ""), "href": item.get("href")}
+                for item in block_data.get("rich_text", [])
+            ]
+
+        content: Dict[str, Any] = {"rich_text": rich_text}
+        if block_type == "to_do":
+            content["checked"] = block_data.get("checked", False)
+        elif block_type in ("bulleted_list_item", "numbered_list_item"):
+            content["items"] = [item["plain_text"] for item in rich_text]
+
+        return {
+            "id": block["id"],
+            "type": block_type,
+            "content": content,
+            "has_children": block.get("has_children", False),
+            "last_edited_time": block.get("last_edited_time"),
+        }
+
+    def _parse_block(self, block: Dict) -> NotionBlock:
+        """Parse a raw block object (without its children)."""
+        if self.fast_parse:
+            return NotionBlock.model_validate(self._block_fields(block))
+
+        return NotionBlock(
+            id=block["id"],
+            type=block.get("type", ""),
+            content=self._parse_block_content(block),
+            has_children=block.get("has_children", False),
+            last_edited_time=block.get("last_edited_time"),
+        )
+
+    def _parse_blocks(self, blocks: List[Dict]) -> List[NotionBlock]:
+        """Parse one listing of raw blocks (without their children)."""
+        if self.fast_parse:
+            return _BLOCK_LIST.validate_python(
+                [self._block_fields(block) for block in blocks]
+            )
+        return [self._parse_block(block) for block in blocks]
+
+
+def print_content(content: PageContent):
+    """Print page content in a readable format."""
+    print(f"\nPage: {content.title}\n")
+
+    def print_block(block: NotionBlock, level: int = 0):
+        indent = "  " * level
+
+        # Print block content
+        if block.content.rich_text:
+            text = "".join(rt.plain_text for rt in block.content.rich_text)
+            print(f"{indent}{text}")
+
+        # Print child blocks
+        if block.children:
+            for child in block.children:
+                print_block(child, level + 1)
+
+    for block in content.blocks:
+        print_block(block)
+
+
+class NotionClient(BaseNotionClient):
+    def __init__(
+        self,
+        client: Optional[Client] = None,
+        max_workers: int = 8,
+        rate_limiter: Optional[RateLimiter] = None,
+        mirror: Optional[NotionMirror] = None,
+        fast_parse: bool = False,
+        keep_annotations: Optional[bool] = None,
+        http_client: Optional[httpx.Client] = None,
+        http_options: Optional[HttpOptions] = None,
+    ):
+        """
+        Args:
+            client: Optional pre-built SDK client (e.g. one wired to a fake server).
+                When omitted, a client is created from NOTION_TOKEN on top of
+                a pooled keep-alive HTTP client that is closed by ``close()``.
+            max_workers: Maximum number of concurrent block-children requests
+                used when walking a page's block tree.
+            rate_limiter: Limiter every API call goes through. Defaults to the
+                process-wide limiter shared by all clients.
+            mirror: Optional local SQLite mirror. Fetched pages and blocks are
+                written through to it and can be served back from it.
+            fast_parse: Parse blocks with one pydantic validation pass per
+                listing rather than one model construction per object.
+            keep_annotations: Keep rich-text annotations (bold, color, ...).
+                Defaults to True, or to False when fast_parse is set.
+            http_client: Optional ``httpx.Client`` for the SDK client to send
+                every request through. The NotionClient takes ownership of it.
+            http_options: Pool limits, keep-alive and timeouts for the HTTP
+                client built when neither client nor http_client is given.
+        """
+        self.max_workers = max(1, max_workers)
+        self._owns_client = client is None
+        if client is None:
+            self.token = _read_token()
+            if http_client is None:
+                # One connection per tree-walk worker plus one for enumeration
+                http_client = build_http_client(
+                    http_options, pool_size=self.max_workers + 1
                 )
+            client = build_sdk_client(self.token, http_client)
+        self.client = client
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.mirror = mirror
+        self.fast_parse = fast_parse
+        self.keep_annotations = (
+            not fast_parse if keep_annotations is None else keep_annotations
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the worker pool shared by all tree walks."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="notion-fetch"
+            )
+        return self._executor
+
+    def _request(self, endpoint, **kwargs) -> Any:
+        """Send one API call through the rate limiter."""
+        return self.rate_limiter.call(endpoint, **kwargs)
+
+    def close(self):
+        """Shut down the block-fetching worker pool and owned HTTP connections."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._owns_client:
+            self.client.close()
+
+    def _iter_search(self, object_type: str) -> Iterator[Dict]:
+        """Yield every search result of one object type, following next_cursor."""
+        has_more = True
+        start_cursor = None
+
+        while has_more:
+            response = self._request(
+                self.client.search,
+                filter={"property": "object", "value": object_type},
+                page_size=MAX_PAGE_SIZE,
+                start_cursor=start_cursor,
+            )
+            yield from response.get("results", [])
 
-                for block in response.get("results", []):
-                    block_type = block.get("type", "")
-                    has_children = block.get("has_children", False)
+            has_more = response.get("has_more", False)
+            start_cursor = response.get("next_cursor")
 
-                    parsed_block = NotionBlock(
-                        id=block["id"],
-                        type=block_type,
-                        content=self._parse_block_content(block),
-                        has_children=has_children,
-                    )
+    def iter_shared_pages(self) -> Iterator[NotionPage]:
+        """Yield pages shared with the integration as search results arrive."""
+        for page in self._iter_search("page"):
+            yield self._parse_page(page)
 
-                    if has_children:
-                        parsed_block.children = self._get_block_children(block["id"])
+    def iter_shared_databases(self) -> Iterator[NotionPage]:
+        """Yield databases shared with the integration as search results arrive."""
+        for database in self._iter_search("database"):
+            yield self._parse_database(database)
 
-                    blocks.append(parsed_block)
+    def list_shared_pages(self) -> List[NotionPage]:
+        """List all pages shared with the integration."""
+        try:
+            return list(self.iter_shared_pages())
+        except Exception as e:
+            print(f"Error listing pages: {e}")
+            return []
 
-                # Check if there are more pages
-                has_more = response.get("has_more", False)
-                start_cursor = response.get("next_cursor")
+    def list_shared_databases(self) -> List[NotionPage]:
+        """List all databases shared with the integration."""
+        try:
+            return list(self.iter_shared_databases())
+        except Exception as e:
+            print(f"Error listing databases: {e}")
+            return []
+
+    def _iter_raw_children(self, block_id: str) -> Iterator[List[Dict]]:
+        """Yield the raw child blocks of a block one API result page at a time."""
+        has_more = True
+        start_cursor = None
+
+        while has_more:
+            # Get blocks with pagination
+            response = self._request(
+                self.client.blocks.children.list,
+                block_id=block_id,
+                start_cursor=start_cursor,
+            )
+            yield response.get("results", [])
+
+            # Check if there are more pages
+            has_more = response.get("has_more", False)
+            start_cursor = response.get("next_cursor")
+
+    def _list_raw_children(self, block_id: str) -> List[Dict]:
+        return [block for batch in self._iter_raw_children(block_id) for block in batch]
+
+    def _list_block_children(self, block_id: str) -> List[NotionBlock]:
+        """Get the direct children of a block, following pagination."""
+        raw_blocks = self._list_raw_children(block_id)
+
+        if self.mirror is not None:
+            self.mirror.write_children(block_id, raw_blocks)
+
+        return self._parse_blocks(raw_blocks)
+
+    def _attach_lazy_children(self, block: NotionBlock, depth: int, limits: TreeLimits):
+        if limits.expands(block, depth):
+            block.children = LazyChildren(
+                partial(self._load_lazy_children, block.id, depth + 1, limits)
+            )
+
+    def _load_lazy_children(
+        self, block_id: str, depth: int, limits: TreeLimits
+    ) -> List[NotionBlock]:
+        children = self._list_block_children(block_id)
+        for child in children:
+            self._attach_lazy_children(child, depth, limits)
+        return children
+
+    def _resolve_subtrees(
+        self, roots: List[NotionBlock], limits: TreeLimits = FULL_TREE
+    ) -> Iterator[NotionBlock]:
+        """Fetch the subtrees below ``roots`` and yield each root once complete.
+
+        Sibling subtrees are fetched concurrently on the client's worker pool.
+        The walk is coordinated from the calling thread, so workers never wait
+        on each other. Roots are yielded in their original order, and children
+        keep the order returned by Notion. ``limits`` decides which blocks
+        are expanded; lazy limits yield the roots right away.
+
+        A request that still fails after the rate limiter's retries is raised
+        rather than silently dropping the subtree.
+        """
+        if limits.lazy:
+            for root in roots:
+                self._attach_lazy_children(root, 0, limits)
+            yield from roots
+            return
+
+        executor = self._get_executor()
+        pending = {}  # future -> (parent block, index of its root, parent depth)
+        outstanding = [0] * len(roots)  # unfinished fetches below each root
+        next_root = 0
+
+        def submit(block: NotionBlock, root: int, depth: int):
+            future = executor.submit(self._list_block_children, block.id)
+            pending[future] = (block, root, depth)
+            outstanding[root] += 1
+
+        for index, root in enumerate(roots):
+            if limits.expands(root, 0):
+                submit(root, index, 0)
+
+        try:
+            while True:
+                while next_root < len(roots) and outstanding[next_root] == 0:
+                    yield roots[next_root]
+                    next_root += 1
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    parent, root, depth = pending.pop(future)
+                    parent.children = future.result()
+                    outstanding[root] -= 1
+                    for child in parent.children:
+                        if limits.expands(child, depth + 1):
+                            submit(child, root, depth + 1)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _get_block_children(
+        self, block_id: str, limits: TreeLimits = FULL_TREE
+    ) -> List[NotionBlock]:
+        """Get the child block tree for a given block, within ``limits``."""
+        return list(self._resolve_subtrees(self._list_block_children(block_id), limits))
+
+    def iter_page_blocks(
+        self,
+        page_id: str,
+        max_depth: Optional[int] = None,
+        skip_types: Optional[Iterable[str]] = None,
+        lazy: bool = False,
+    ) -> Iterator[NotionBlock]:
+        """Yield a page's top-level blocks, children resolved, as each is fetched.
+
+        Subtrees of one result page of top-level blocks are fetched
+        concurrently, and each block is yielded as soon as it and every block
+        before it are complete, so callers can start processing early.
+        ``max_depth``, ``skip_types`` and ``lazy`` work as in
+        ``get_page_content``.
+        """
+        limits = TreeLimits.of(max_depth, skip_types, lazy)
+        # Only the mirror needs the raw top-level blocks, written in one go
+        raw_blocks = [] if self.mirror is not None else None
+        for batch in self._iter_raw_children(page_id):
+            if raw_blocks is not None:
+                raw_blocks.extend(batch)
+            yield from self._resolve_subtrees(self._parse_blocks(batch), limits)
+
+        if self.mirror is not None:
+            self.mirror.write_children(page_id, raw_blocks)
+
+    def _page_content(self, page: Dict, blocks: List[NotionBlock]) -> PageContent:
+        return PageContent(
+            title=self._page_title(page),
+            blocks=blocks,
+            id=page["id"],
+            last_edited_time=page.get("last_edited_time"),
+            archived=self._is_archived(page),
+        )
+
+    def _get_mirrored_page_content(
+        self, page_id: str, limits: TreeLimits = FULL_TREE
+    ) -> Optional[PageContent]:
+        """Rebuild a page's block tree from the mirror, or None if not mirrored."""
+        page = self.mirror.read_page(page_id)
+        if page is None:
+            return None
 
+        children = self.mirror.read_children(page_id)
+
+        def build(parent_id: str, depth: int) -> List[NotionBlock]:
+            blocks = []
+            for raw_block in children.get(parent_id, []):
+                block = self._parse_block(raw_block)
+                # Local reads are cheap, so lazy limits build the tree eagerly
+                if limits.expands(block, depth):
+                    block.children = build(block.id, depth + 1)
+                blocks.append(block)
             return blocks
+
+        return self._page_content(page, build(page_id, 0))
+
+    def get_page(self, page_id: str) -> Optional[NotionPage]:
+        """Retrieve a page's title, parent and last edit, without its blocks."""
+        try:
+            return self._parse_page(
+                self._request(self.client.pages.retrieve, page_id=page_id)
+            )
         except Exception as e:
-            print(f"Error getting block children: {e}")
-            return []
+            print(f"Error getting page: {e}")
+            return None
 
-    def get_page_content(self, page_id: str) -> Optional[PageContent]:
-        """Retrieve all content from a specific page."""
+    def get_page_content(
+        self,
+        page_id: str,
+        from_mirror: bool = False,
+        max_depth: Optional[int] = None,
+        skip_types: Optional[Iterable[str]] = None,
+        lazy: bool = False,
+    ) -> Optional[PageContent]:
+        """Retrieve all content from a specific page.
+
+        Args:
+            page_id: Page to read.
+            from_mirror: Serve the page from the local mirror when it holds a
+                complete copy, falling back to the API otherwise.
+            max_depth: Deepest level whose children are fetched (top-level
+                blocks are level 0, so 0 fetches no children). None for all.
+            skip_types: Block types whose children are never fetched, e.g.
+                ``child_page`` or ``synced_block``.
+            lazy: Fetch each block's children on first access of
+                ``block.children`` rather than up front.
+        """
+        limits = TreeLimits.of(max_depth, skip_types, lazy)
         try:
+            if from_mirror and self.mirror is not None:
+                content = self._get_mirrored_page_content(page_id, limits)
+                if content is not None:
+                    return content
+
             # Get page metadata
-            page = self.client.pages.retrieve(page_id=page_id)
-
-            # Get page title
-            title = (
-                page.get("properties", {})
-                .get("title", {})
-                .get("title", [{}])[0]
-                .get("plain_text", "Untitled")
-            )
+            page = self._request(self.client.pages.retrieve, page_id=page_id)
+
+            # Drop the old copy so blocks removed in Notion leave the mirror too
+            if self.mirror is not None and limits.complete:
+                self.mirror.clear_page(page_id)
 
             # Get all blocks
-            blocks = self._get_block_children(page_id)
+            blocks = self._get_block_children(page_id, limits)
+
+            # Only a fully fetched tree is marked as mirrored
+            if self.mirror is not None and limits.complete:
+                self.mirror.write_page(page)
 
-            return PageContent(title=title, blocks=blocks)
+            return self._page_content(page, blocks)
         except Exception as e:
             print(f"Error getting page content: {e}")
             return None
 
+    def query_database(
+        self,
+        database_id: str,
+        filter: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        include_blocks: bool = True,
+        max_depth: Optional[int] = None,
+        skip_types: Optional[Iterable[str]] = None,
+        lazy: bool = False,
+    ) -> Iterator[PageContent]:
+        """Yield the rows of a database that match ``filter``, in ``sorts`` order.
+
+        Filtering happens on Notion's side, so e.g. ``edited_since_filter(ts)``
+        only transfers rows changed since the last ingestion. Each row becomes
+        a ``PageContent`` whose ``properties`` hold the row's values; its block
+        tree is fetched too unless ``include_blocks`` is False, within
+        ``max_depth``, ``skip_types`` and ``lazy`` as in ``get_page_content``.
+        """
+        limits = TreeLimits.of(max_depth, skip_types, lazy)
+        body: Dict[str, Any] = {"page_size": MAX_PAGE_SIZE}
+        if filter:
+            body["filter"] = filter
+        if sorts:
+            body["sorts"] = sorts
+
+        has_more = True
+        while has_more:
+            # Called by path: newer notion-client releases dropped
+            # databases.query in favor of the data sources endpoints
+            response = self._request(
+                self.client.request,
+                path=f"databases/{database_id}/query",
+                method="POST",
+                body=body,
+            )
+
+            for row in response.get("results", []):
+                blocks = (
+                    self._get_block_children(row["id"], limits)
+                    if include_blocks
+                    else []
+                )
+                content = self._page_content(row, blocks)
+                content.properties = self._parse_properties(row)
+                yield content
+
+            has_more = response.get("has_more", False)
+            body["start_cursor"] = response.get("next_cursor")
+
+    def export_snapshot(self, path: str) -> "SnapshotStats":
+        """Write every shared page, database and block tree to a snapshot file.
+
+        See ``snapshot.py`` for the format; ``OfflineNotionClient`` reads it
+        back with the same interface as this client.
+        """
+        from .snapshot import export_snapshot
+
+        return export_snapshot(self, path)
+
     def print_page_content(self, page_id: str):
         """Print the content of a page in a readable format."""
         content = self.get_page_content(page_id)
@@ -169,20 +682,27 @@ class NotionClient:
             print("Could not retrieve page content")
             return
 
-        print(f"\nPage: {content.title}\n")
+        print_content(content)
+
+
+class NotionClientOwner:
+    """Mixin for classes that use a NotionClient, creating one if none is given.
+
+    A client created here owns HTTP connections and threads, so ``close`` (or
+    leaving a ``with`` block) closes it; a client passed in is left open.
+    """
 
-        def print_block(block: NotionBlock, level: int = 0):
-            indent = "  " * level
+    def _init_client(self, client: Optional[NotionClient]):
+        self._owns_client = client is None
+        self.client = client or NotionClient()
 
-            # Print block content
-            if block.content.rich_text:
-                text = "".join(rt.plain_text for rt in block.content.rich_text)
-                print(f"{indent}{text}")
+    def close(self):
+        """Close the Notion client if it was created here."""
+        if self._owns_client:
+            self.client.close()
 
-            # Print child blocks
-            if block.children:
-                for child in block.children:
-                    print_block(child, level + 1)
+    def __enter__(self):
+        return self
 
-        for block in content.blocks:
-            print_block(block)
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,723 @@
+"""
+In-process fake of the Notion API for offline tests and benchmarks.
+
+The fake speaks the same HTTP surface the SDK uses, so a real
+``notion_client.Client`` can be pointed at it through an httpx transport or,
+over real sockets, at ``FakeNotionServer``. Responses come from a synthetic
+``FakeNotionWorkspace`` or from a ``Cassette`` recorded off the live API with
+``RecordingTransport``; latency, page sizes and 429s are configurable.
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from notion_client import AsyncClient, Client
+from notion_client.errors import APIErrorCode, APIResponseError
+
+DEFAULT_EDITED_TIME = "2024-03-28T00:00:00.000Z"
+
+
+def block(
+    block_type: str, text: str = "", children: Optional[List[Dict]] = None, **extra
+) -> Dict[str, Any]:
+    """Build a block spec for ``FakeNotionWorkspace.add_page``."""
+    return {"type": block_type, "text": text, "children": children or [], **extra}
+
+
+def _rich_text(text: str) -> List[Dict[str, Any]]:
+    if not text:
+        return []
+    return [
+        {
+            "type": "text",
+            "text": {"content": text, "link": None},
+            "plain_text": text,
+            "annotations": {
+                "bold": False,
+                "italic": False,
+                "strikethrough": False,
+                "underline": False,
+                "code": False,
+                "color": "default",
+            },
+            "href": None,
+        }
+    ]
+
+
+def _title_property(title: str, name: str = "title") -> Dict[str, Any]:
+    return {name: {"id": "title", "type": "title", "title": _rich_text(title)}}
+
+
+def date_property(start: str, end: Optional[str] = None) -> Dict[str, Any]:
+    """Build a date property value for ``add_database_row``."""
+    return {"type": "date", "date": {"start": start, "end": end, "time_zone": None}}
+
+
+def select_property(name: str) -> Dict[str, Any]:
+    """Build a select property value for ``add_database_row``."""
+    return {"type": "select", "select": {"name": name, "color": "default"}}
+
+
+class FakeNotionWorkspace:
+    """An in-memory workspace holding pages and block trees."""
+
+    def __init__(self, page_size: int = 100):
+        self.page_size = page_size
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.databases: Dict[str, Dict[str, Any]] = {}
+        self.blocks: Dict[str, Dict[str, Any]] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.parents: Dict[str, str] = {}
+
+    def _new_id(self) -> str:
+        return str(uuid.uuid4())
+
+    def add_page(
+        self,
+        title: str,
+        blocks: Optional[List[Dict]] = None,
+        page_id: Optional[str] = None,
+        last_edited_time: str = DEFAULT_EDITED_TIME,
+        parent: Optional[Dict[str, Any]] = None,
+        properties: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Add a page with the given block specs and return its id."""
+        page_id = page_id or self._new_id()
+        self.pages[page_id] = {
+            "object": "page",
+            "id": page_id,
+            "url": f"https://www.notion.so/{page_id.replace('-', '')}",
+            "created_time": last_edited_time,
+            "last_edited_time": last_edited_time,
+            "archived": False,
+            "parent": parent or {"type": "workspace", "workspace": True},
+            "properties": properties or _title_property(title),
+        }
+        self.children[page_id] = []
+        for spec in blocks or []:
+            self.add_block(page_id, spec, last_edited_time=last_edited_time)
+        return page_id
+
+    def add_database(self, title: str, database_id: Optional[str] = None) -> str:
+        """Add an empty database and return its id."""
+        database_id = database_id or self._new_id()
+        self.databases[database_id] = {
+            "object": "database",
+            "id": database_id,
+            "url": f"https://www.notion.so/{database_id.replace('-', '')}",
+            "last_edited_time": DEFAULT_EDITED_TIME,
+            "title": _rich_text(title),
+        }
+        return database_id
+
+    def add_database_row(
+        self,
+        database_id: str,
+        title: str,
+        properties: Optional[Dict[str, Any]] = None,
+        blocks: Optional[List[Dict]] = None,
+        last_edited_time: str = DEFAULT_EDITED_TIME,
+    ) -> str:
+        """Add a row (a page whose parent is the database) and return its id."""
+        row_properties = _title_property(title, name="Name")
+        row_properties.update(properties or {})
+        return self.add_page(
+            title,
+            blocks,
+            last_edited_time=last_edited_time,
+            parent={"type": "database_id", "database_id": database_id},
+            properties=row_properties,
+        )
+
+    def add_block(
+        self,
+        parent_id: str,
+        spec: Dict[str, Any],
+        last_edited_time: str = DEFAULT_EDITED_TIME,
+    ) -> str:
+        """Append a block (and its nested children) under ``parent_id``."""
+        block_id = spec.get("id") or self._new_id()
+        block_type = spec["type"]
+        payload = {"rich_text": _rich_text(spec.get("text", ""))}
+        if block_type == "to_do":
+            payload["checked"] = spec.get("checked", False)
+        children = spec.get("children", [])
+        self.blocks[block_id] = {
+            "object": "block",
+            "id": block_id,
+            "type": block_type,
+            block_type: payload,
+            "has_children": bool(children),
+            "last_edited_time": spec.get("last_edited_time", last_edited_time),
+            "archived": False,
+        }
+        self.children.setdefault(parent_id, []).append(block_id)
+        self.children[block_id] = []
+        self.parents[block_id] = parent_id
+        for child in children:
+            self.add_block(block_id, child, last_edited_time=last_edited_time)
+        return block_id
+
+    def add_raw_children(self, parent_id: str, blocks: List[Dict[str, Any]]):
+        """Set the children of a page or block from raw API block objects."""
+        self.children[parent_id] = [block["id"] for block in blocks]
+        for block in blocks:
+            self.blocks[block["id"]] = block
+            self.parents[block["id"]] = parent_id
+            self.children.setdefault(block["id"], [])
+
+    def page_of(self, block_id: str) -> str:
+        """Return the id of the page a block lives on."""
+        while block_id in self.parents:
+            block_id = self.parents[block_id]
+        return block_id
+
+    def edit_block(self, block_id: str, text: str, last_edited_time: str):
+        """Change a block's text, bumping its and its page's last_edited_time."""
+        block = self.blocks[block_id]
+        block[block["type"]]["rich_text"] = _rich_text(text)
+        block["last_edited_time"] = last_edited_time
+        self.pages[self.page_of(block_id)]["last_edited_time"] = last_edited_time
+
+    def remove_page(self, page_id: str):
+        """Delete a page and its blocks."""
+        del self.pages[page_id]
+        pending = self.children.pop(page_id, [])
+        while pending:
+            block_id = pending.pop()
+            del self.blocks[block_id]
+            del self.parents[block_id]
+            pending.extend(self.children.pop(block_id, []))
+
+    def add_synthetic_journal(
+        self,
+        title: str = "Journal",
+        days: int = 30,
+        blocks_per_day: int = 5,
+        fanout: int = 2,
+        depth: int = 2,
+    ) -> str:
+        """Add a journal page with date headings and nested bullet lists."""
+
+        def nested(prefix: str, level: int) -> List[Dict]:
+            if level >= depth:
+                return []
+            return [
+                block(
+                    "bulleted_list_item",
+                    f"{prefix}.{i}",
+                    children=nested(f"{prefix}.{i}", level + 1),
+                )
+                for i in range(fanout)
+            ]
+
+        start = datetime(2024, 1, 1)
+        specs = []
+        for day in range(days):
+            date = (start + timedelta(days=day)).strftime("%Y-%m-%d")
+            specs.append(block("heading_2", date))
+            for i in range(blocks_per_day):
+                specs.append(
+                    block(
+                        "toggle",
+                        f"note {date} #{i}",
+                        children=nested(f"{date}/{i}", 0),
+                    )
+                )
+        return self.add_page(title, specs)
+
+    # Endpoint handlers. Each returns the JSON body Notion would send back.
+
+    def _paginate(
+        self, items: List[Any], start_cursor: Optional[str], page_size: Optional[int]
+    ) -> Dict[str, Any]:
+        size = min(int(page_size or self.page_size), self.page_size)
+        start = int(start_cursor or 0)
+        chunk = items[start : start + size]
+        end = start + len(chunk)
+        has_more = end < len(items)
+        return {
+            "object": "list",
+            "results": chunk,
+            "has_more": has_more,
+            "next_cursor": str(end) if has_more else None,
+        }
+
+    def search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        wanted = (body.get("filter") or {}).get("value")
+        if wanted == "page":
+            items = list(self.pages.values())
+        elif wanted in ("database", "data_source"):
+            items = list(self.databases.values())
+        else:
+            items = list(self.pages.values()) + list(self.databases.values())
+        return self._paginate(items, body.get("start_cursor"), body.get("page_size"))
+
+    def _matches(self, row: Dict[str, Any], condition: Dict[str, Any]) -> bool:
+        """Evaluate the subset of database filters the client sends."""
+        if "and" in condition:
+            return all(self._matches(row, part) for part in condition["and"])
+        if "or" in condition:
+            return any(self._matches(row, part) for part in condition["or"])
+
+        if "timestamp" in condition:
+            value = row.get(condition["timestamp"])
+            test = condition[condition["timestamp"]]
+        else:
+            prop = row["properties"].get(condition["property"], {})
+            value = (prop.get("date") or {}).get("start")
+            test = condition.get("date", {})
+
+        if value is None:
+            return bool(test.get("is_empty"))
+        for op, operand in test.items():
+            operand = str(operand)
+            if op == "after" and not value > operand:
+                return False
+            if op == "on_or_after" and not value >= operand:
+                return False
+            if op == "before" and not value < operand:
+                return False
+            if op == "on_or_before" and not value <= operand:
+                return False
+            if op == "equals" and not value.startswith(operand):
+                return False
+        return True
+
+    def query_database(
+        self, database_id: str, body: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        if database_id not in self.databases:
+            return None
+        rows = [
+            page
+            for page in self.pages.values()
+            if page["parent"].get("database_id") == database_id
+        ]
+        if body.get("filter"):
+            rows = [row for row in rows if self._matches(row, body["filter"])]
+        for sort in reversed(body.get("sorts") or []):
+            if "timestamp" in sort:
+                key = lambda row, name=sort["timestamp"]: row.get(name) or ""
+            else:
+                key = lambda row, name=sort["property"]: (
+                    (row["properties"].get(name, {}).get("date") or {}).get("start")
+                    or ""
+                )
+            rows.sort(key=key, reverse=sort.get("direction") == "descending")
+        return self._paginate(rows, body.get("start_cursor"), body.get("page_size"))
+
+    def retrieve_page(self, page_id: str) -> Optional[Dict[str, Any]]:
+        return self.pages.get(page_id)
+
+    def list_children(
+        self, block_id: str, start_cursor: Optional[str], page_size: Optional[int]
+    ) -> Optional[Dict[str, Any]]:
+        if block_id not in self.children:
+            return None
+        items = [self.blocks[child_id] for child_id in self.children[block_id]]
+        return self._paginate(items, start_cursor, page_size)
+
+    def handle(
+        self, method: str, path: str, query: Dict[str, str], body: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Route an API request to a handler and return (status, body)."""
+        parts = [part for part in path.split("/") if part]
+        if parts and parts[0] == "v1":
+            parts = parts[1:]
+
+        result = None
+        if method == "POST" and parts == ["search"]:
+            result = self.search(body)
+        elif method == "GET" and len(parts) == 2 and parts[0] == "pages":
+            result = self.retrieve_page(parts[1])
+        elif (
+            method == "GET"
+            and len(parts) == 3
+            and parts[0] == "blocks"
+            and parts[2] == "children"
+        ):
+            result = self.list_children(
+                parts[1], query.get("start_cursor"), query.get("page_size")
+            )
+        elif (
+            method == "POST"
+            and len(parts) == 3
+            and parts[0] == "databases"
+            and parts[2] == "query"
+        ):
+            result = self.query_database(parts[1], body)
+
+        if result is None:
+            return 404, {
+                "object": "error",
+                "status": 404,
+                "code": "object_not_found",
+                "message": f"Could not find {path}",
+            }
+        return 200, result
+
+
+RATE_LIMITED_ERROR = {
+    "object": "error",
+    "status": 429,
+    "code": "rate_limited",
+    "message": "You have been rate limited.",
+}
+
+
+class Cassette:
+    """Recorded API exchanges, replayed through the same ``handle`` as a workspace.
+
+    A cassette is a JSON-lines file written by ``RecordingTransport``: one
+    ``{"method", "path", "query", "body", "status", "response"}`` record per
+    request. Identical requests are answered in recorded order (the last
+    answer repeats); requests that were never recorded get a 404.
+
+    It can stand in for a ``FakeNotionWorkspace`` wherever one is accepted
+    (transports, ``FakeNotionServer``, ``WorkspaceSDKClient``), so recorded
+    responses get the same latency and 429 injection as synthetic ones.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._responses: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        self._served: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        with open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    key = self.key(
+                        record["method"],
+                        record["path"],
+                        record.get("query") or {},
+                        record.get("body") or {},
+                    )
+                    self._responses.setdefault(key, []).append(
+                        (record["status"], record["response"])
+                    )
+
+    @staticmethod
+    def key(method: str, path: str, query: Dict[str, Any], body: Dict[str, Any]) -> str:
+        path = "/" + "/".join(part for part in path.split("/") if part)
+        if not path.startswith("/v1/"):
+            path = "/v1" + path
+        return json.dumps([method, path, query, body], sort_keys=True)
+
+    def handle(
+        self, method: str, path: str, query: Dict[str, str], body: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any]]:
+        key = self.key(method, path, query, body)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                return 404, {
+                    "object": "error",
+                    "status": 404,
+                    "code": "object_not_found",
+                    "message": f"No recorded response for {method} {path}",
+                }
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            return responses[min(index, len(responses) - 1)]
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """httpx transport that forwards to ``inner`` and records every exchange.
+
+    Wrap the transport of a client talking to the real API to capture a
+    cassette for ``Cassette``. Successful and error responses are recorded,
+    except 429s, which replay injects on its own; credentials are never
+    written.
+    """
+
+    def __init__(self, path: str, inner: Optional[httpx.BaseTransport] = None):
+        self.path = path
+        self.inner = inner or httpx.HTTPTransport()
+        self._lock = threading.Lock()
+        self._file = open(path, "a")
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        content = request.read()
+        response = self.inner.handle_request(request)
+        response.read()
+        if response.status_code != 429:
+            record = {
+                "method": request.method,
+                "path": request.url.path,
+                "query": dict(request.url.params),
+                "body": json.loads(content) if content else {},
+                "status": response.status_code,
+                "response": response.json(),
+            }
+            with self._lock:
+                self._file.write(json.dumps(record) + "\n")
+                self._file.flush()
+        return response
+
+    def close(self):
+        self.inner.close()
+        self._file.close()
+
+
+class _RateLimitInjector:
+    """Answer every n-th call with a 429, as the fakes' rate_limit_every option."""
+
+    def __init__(self, rate_limit_every: int = 0, retry_after: float = 0.0):
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self._counter = itertools.count(1)
+        self.calls = 0
+        self.rate_limited = 0
+
+    def next_call_limited(self) -> bool:
+        call = next(self._counter)
+        self.calls = call
+        if self.rate_limit_every and call % self.rate_limit_every == 0:
+            self.rate_limited += 1
+            return True
+        return False
+
+
+class _FakeTransportMixin:
+    """Call counting, latency settings and 429 injection shared by the transports."""
+
+    def __init__(
+        self,
+        workspace: FakeNotionWorkspace,
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+        retry_after: float = 0.0,
+    ):
+        """
+        Args:
+            workspace: Workspace that answers the requests.
+            latency: Seconds each call takes.
+            rate_limit_every: When > 0, every n-th call is answered with a 429.
+            retry_after: Value of the Retry-After header sent with injected 429s.
+        """
+        self.workspace = workspace
+        self.latency = latency
+        self._injector = _RateLimitInjector(rate_limit_every, retry_after)
+
+    @property
+    def calls(self) -> int:
+        return self._injector.calls
+
+    @property
+    def rate_limited(self) -> int:
+        return self._injector.rate_limited
+
+    def _respond(self, request: httpx.Request, content: bytes) -> httpx.Response:
+        if self._injector.next_call_limited():
+            return httpx.Response(
+                429,
+                headers={"Retry-After": str(self._injector.retry_after)},
+                json=RATE_LIMITED_ERROR,
+            )
+        body = json.loads(content) if content else {}
+        status, payload = self.workspace.handle(
+            request.method, request.url.path, dict(request.url.params), body
+        )
+        return httpx.Response(status, json=payload)
+
+
+class FakeNotionTransport(_FakeTransportMixin, httpx.BaseTransport):
+    """httpx transport that serves requests from a ``FakeNotionWorkspace``."""
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(request, request.read())
+
+
+class AsyncFakeNotionTransport(_FakeTransportMixin, httpx.AsyncBaseTransport):
+    """Async counterpart of ``FakeNotionTransport``; latency does not block the loop."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(request, await request.aread())
+
+
+class WorkspaceSDKClient:
+    """Stand-in for ``notion_client.Client`` that answers from a workspace directly.
+
+    Covers the endpoints ``NotionClient`` uses, without any HTTP round trip,
+    so reads run at memory speed. Missing objects raise ``APIResponseError``
+    like the real client.
+    """
+
+    def __init__(self, workspace: FakeNotionWorkspace):
+        self.workspace = workspace
+        self.pages = SimpleNamespace(retrieve=self._retrieve_page)
+        self.blocks = SimpleNamespace(
+            children=SimpleNamespace(list=self._list_children)
+        )
+
+    def request(
+        self,
+        path: str,
+        method: str,
+        query: Optional[Dict[str, Any]] = None,
+        body: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        status, payload = self.workspace.handle(method, path, query or {}, body or {})
+        if status != 200:
+            raise APIResponseError(
+                httpx.Response(status, json=payload),
+                payload["message"],
+                APIErrorCode(payload["code"]),
+            )
+        return payload
+
+    def search(self, **kwargs) -> Dict[str, Any]:
+        body = {key: value for key, value in kwargs.items() if value is not None}
+        return self.request("search", "POST", body=body)
+
+    def _retrieve_page(self, page_id: str, **kwargs) -> Dict[str, Any]:
+        return self.request(f"pages/{page_id}", "GET")
+
+    def _list_children(self, block_id: str, **kwargs) -> Dict[str, Any]:
+        query = {key: value for key, value in kwargs.items() if value is not None}
+        return self.request(f"blocks/{block_id}/children", "GET", query=query)
+
+    def close(self):
+        pass
+
+
+class _FakeRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections open between requests
+    # Headers and body are written separately; without TCP_NODELAY a kept-alive
+    # connection stalls on Nagle's algorithm and delayed ACKs
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _serve(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        content = self.rfile.read(length) if length else b""
+        url = urlsplit(self.path)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        with self.server.lock:
+            self.server.requests += 1
+            limited = self.server.injector.next_call_limited()
+        if limited:
+            status, payload = 429, RATE_LIMITED_ERROR
+        else:
+            status, payload = self.server.workspace.handle(
+                self.command,
+                url.path,
+                dict(parse_qsl(url.query)),
+                json.loads(content) if content else {},
+            )
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        if limited:
+            self.send_header("Retry-After", str(self.server.injector.retry_after))
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _serve
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeNotionServer(ThreadingHTTPServer):
+    """Local HTTP server that answers API requests from a ``FakeNotionWorkspace``.
+
+    Unlike the in-process transports, requests go over real TCP sockets, so
+    connection setup and reuse can be measured: ``connections`` counts the
+    connections accepted and ``requests`` the requests served. Latency and
+    429 injection work as on ``FakeNotionTransport``, and a ``Cassette`` can
+    be served in place of a workspace.
+
+    Usage::
+
+        with FakeNotionServer(workspace) as server:
+            client = Client(auth="fake-token", base_url=server.url)
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        workspace: FakeNotionWorkspace,
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+        retry_after: float = 0.0,
+    ):
+        super().__init__(("127.0.0.1", 0), _FakeRequestHandler)
+        self.workspace = workspace
+        self.latency = latency
+        self.injector = _RateLimitInjector(rate_limit_every, retry_after)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def rate_limited(self) -> int:
+        return self.injector.rate_limited
+
+    def reset_counters(self):
+        with self.lock:
+            self.connections = 0
+            self.requests = 0
+            self.injector.rate_limited = 0
+
+    def __enter__(self) -> "FakeNotionServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+def fake_notion_client(
+    workspace: FakeNotionWorkspace, **transport_options
+) -> Tuple[Client, FakeNotionTransport]:
+    """Build an SDK client wired to the fake workspace."""
+    transport = FakeNotionTransport(workspace, **transport_options)
+    client = Client(auth="fake-token", client=httpx.Client(transport=transport))
+    return client, transport
+
+
+def fake_async_notion_client(
+    workspace: FakeNotionWorkspace, **transport_options
+) -> Tuple[AsyncClient, AsyncFakeNotionTransport]:
+    """Build an async SDK client wired to the fake workspace."""
+    transport = AsyncFakeNotionTransport(workspace, **transport_options)
+    client = AsyncClient(
+        auth="fake-token", client=httpx.AsyncClient(transport=transport)
+    )
+    return client, transport
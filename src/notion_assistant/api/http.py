@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+from notion_client import Client
+
+
+@dataclass
+class HttpOptions:
+    """Connection pool and timeout settings for the Notion HTTP client.
+
+    Pool sizes left as None are sized to the client's worker pool, so every
+    concurrent tree-walk request can reuse a kept-alive connection.
+    """
+
+    max_connections: Optional[int] = None
+    max_keepalive_connections: Optional[int] = None
+    keepalive_expiry: float = 30.0  # seconds an idle connection is kept open
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 10.0  # wait for a free connection from the pool
+    http2: bool = False  # needs the optional h2 package (httpx[http2])
+
+    def limits(self, pool_size: int) -> httpx.Limits:
+        max_connections = self.max_connections or pool_size
+        max_keepalive = self.max_keepalive_connections
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=(
+                max_connections if max_keepalive is None else max_keepalive
+            ),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+
+def build_http_client(
+    options: Optional[HttpOptions] = None, pool_size: int = 8
+) -> httpx.Client:
+    """Create a pooled, keep-alive ``httpx.Client`` from ``options``."""
+    options = options or HttpOptions()
+    http2 = options.http2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            print("HTTP/2 requested but the h2 package is missing; using HTTP/1.1")
+            http2 = False
+
+    return httpx.Client(
+        limits=options.limits(pool_size),
+        timeout=options.timeout(),
+        http2=http2,
+    )
+
+
+def build_sdk_client(
+    auth: str,
+    http_client: httpx.Client,
+    base_url: Optional[str] = None,
+) -> Client:
+    """Wrap ``http_client`` in a ``notion_client.Client``.
+
+    The SDK overwrites the HTTP client's timeout with its single
+    ``timeout_ms`` value, so the per-phase timeout is restored afterwards.
+    """
+    timeout = http_client.timeout
+    options = {"auth": auth}
+    if base_url:
+        options["base_url"] = base_url
+    client = Client(client=http_client, **options)
+    http_client.timeout = timeout
+    return client
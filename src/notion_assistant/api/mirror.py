@@ -0,0 +1,130 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id TEXT PRIMARY KEY,
+    last_edited_time TEXT,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    id TEXT PRIMARY KEY,
+    parent_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    last_edited_time TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blocks_by_parent ON blocks (parent_id, position);
+"""
+
+# Every block below a root, found by walking the parent_id index
+SUBTREE_QUERY = """
+WITH RECURSIVE subtree(id) AS (
+    SELECT id FROM blocks WHERE parent_id = ?
+    UNION ALL
+    SELECT blocks.id FROM blocks JOIN subtree ON blocks.parent_id = subtree.id
+)
+"""
+
+
+class NotionMirror:
+    """Local SQLite copy of Notion pages and their block trees.
+
+    Pages and blocks are stored with their raw API payloads, keyed by id, with
+    each block's parent id and position. A page row is only written once its
+    whole block tree has been stored, so a page found in the mirror is complete.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def has_page(self, page_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM pages WHERE id = ?", (page_id,)
+            ).fetchone()
+        return row is not None
+
+    def page_ids(self) -> List[str]:
+        """Ids of every fully mirrored page."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM pages ORDER BY id").fetchall()
+        return [row[0] for row in rows]
+
+    def clear_page(self, page_id: str):
+        """Drop a page and every block below it."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                SUBTREE_QUERY
+                + "DELETE FROM blocks WHERE id IN (SELECT id FROM subtree)",
+                (page_id,),
+            )
+            self._conn.execute("DELETE FROM pages WHERE id = ?", (page_id,))
+
+    def write_page(self, page: Dict):
+        """Store a page object, marking its block tree as complete."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (id, last_edited_time, payload) "
+                "VALUES (?, ?, ?)",
+                (page["id"], page.get("last_edited_time"), json.dumps(page)),
+            )
+
+    def write_children(self, parent_id: str, blocks: List[Dict]):
+        """Store the direct children of a page or block, in order."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM blocks WHERE parent_id = ?", (parent_id,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO blocks "
+                "(id, parent_id, position, last_edited_time, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        block["id"],
+                        parent_id,
+                        position,
+                        block.get("last_edited_time"),
+                        json.dumps(block),
+                    )
+                    for position, block in enumerate(blocks)
+                ],
+            )
+
+    def read_page(self, page_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM pages WHERE id = ?", (page_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def read_children(self, page_id: str) -> Dict[str, List[Dict]]:
+        """Return every block under a page, grouped by parent id and in order."""
+        with self._lock:
+            rows = self._conn.execute(
+                SUBTREE_QUERY
+                + (
+                    "SELECT blocks.parent_id, blocks.payload FROM blocks "
+                    "JOIN subtree ON blocks.id = subtree.id "
+                    "ORDER BY blocks.parent_id, blocks.position"
+                ),
+                (page_id,),
+            ).fetchall()
+
+        children: Dict[str, List[Dict]] = {}
+        for parent_id, payload in rows:
+            children.setdefault(parent_id, []).append(json.loads(payload))
+        return children
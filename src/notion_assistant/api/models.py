@@ -1,5 +1,6 @@
-from typing import List, Optional, Union
-from pydantic import BaseModel, Field
+import threading
+from typing import Any, Callable, Dict, List, Optional, Union
+from pydantic import BaseModel, Field, field_serializer
 
 
 class RichText(BaseModel):
@@ -21,8 +22,98 @@ class NotionBlock(BaseModel):
     content: BlockContent
     has_children: bool = False
     children: Optional[List["NotionBlock"]] = None
+    last_edited_time: Optional[str] = None
+
+    @field_serializer("children", mode="wrap")
+    def _serialize_children(self, children, handler):
+        # The serializer reads list storage directly, so load lazy lists first
+        if isinstance(children, LazyChildren):
+            children._load()
+        return handler(children)
+
+
+class LazyChildren(list):
+    """A block's child list that is fetched on first use.
+
+    Assigned to ``NotionBlock.children`` by lazy loading. Any read (len,
+    iteration, indexing, comparison, dumping) calls ``loader`` once and
+    fills the list with its result.
+    """
+
+    def __init__(self, loader: Callable[[], List["NotionBlock"]]):
+        super().__init__()
+        self._loader = loader
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loader is None
+
+    def _load(self):
+        with self._lock:
+            if self._loader is not None:
+                list.extend(self, self._loader())
+                self._loader = None
+
+    def __eq__(self, other):
+        # list.__eq__ reads the other list's storage directly
+        for value in (self, other):
+            if isinstance(value, LazyChildren):
+                value._load()
+        return list.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __reduce_ex__(self, protocol):
+        # Copies and pickles get a plain, fully loaded list
+        self._load()
+        return list, (list(self),)
+
+
+def _loading(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        if self._loader is not None:
+            self._load()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in (
+    "__len__",
+    "__iter__",
+    "__reversed__",
+    "__getitem__",
+    "__contains__",
+    "__repr__",
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__add__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "index",
+    "count",
+    "sort",
+    "reverse",
+    "copy",
+):
+    setattr(LazyChildren, _name, _loading(_name))
 
 
 class PageContent(BaseModel):
     title: str
     blocks: List[NotionBlock]
+    id: Optional[str] = None
+    last_edited_time: Optional[str] = None
+    properties: Dict[str, Any] = Field(default_factory=dict)  # database row values
+    archived: bool = False  # archived or in the trash
@@ -0,0 +1,197 @@
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+from notion_client.errors import (
+    APIErrorCode,
+    APIResponseError,
+    HTTPResponseError,
+    RequestTimeoutError,
+)
+
+# Notion's documented average limit is three requests per second per integration
+NOTION_REQUESTS_PER_SECOND = 3.0
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class RateLimiterStats:
+    """Snapshot of a limiter's counters."""
+
+    requests: int = 0  # API calls attempted, including retries
+    throttled: int = 0  # calls that had to wait for a token
+    rate_limited: int = 0  # 429 responses received
+    retried: int = 0  # calls re-sent after a retryable failure
+    failed: int = 0  # calls that gave up after exhausting retries
+
+
+class RateLimiter:
+    """Token-bucket pacing plus retry with backoff for Notion API calls.
+
+    Every call first reserves a token; callers sleep until their token is due,
+    so any number of threads or tasks sharing one limiter stay under ``rate``
+    requests per second. Rate-limited (429) and transient 5xx/timeout failures
+    are retried with jittered exponential backoff, and a ``Retry-After`` header
+    pauses the whole bucket, not just the failing caller.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = NOTION_REQUESTS_PER_SECOND,
+        burst: int = 3,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+    ):
+        """
+        Args:
+            rate: Sustained requests per second, or None to disable pacing.
+            burst: Number of requests that may be sent back-to-back.
+            max_retries: Retries per call before the error is raised.
+            base_delay: First backoff delay in seconds (doubles per attempt).
+            max_delay: Upper bound for a single backoff delay.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._stats = RateLimiterStats()
+
+    def stats(self) -> RateLimiterStats:
+        """Return a copy of the current counters."""
+        with self._lock:
+            return RateLimiterStats(**vars(self._stats))
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        with self._lock:
+            self._stats.requests += 1
+            now = time.monotonic()
+            if self.rate is None:
+                wait = max(0.0, self._updated - now)
+            else:
+                if now > self._updated:
+                    self._tokens = min(
+                        self.burst, self._tokens + (now - self._updated) * self.rate
+                    )
+                    self._updated = now
+                self._tokens -= 1
+                wait = max(0.0, self._updated - now) + max(0.0, -self._tokens) / (
+                    self.rate
+                )
+            if wait > 0:
+                self._stats.throttled += 1
+            return wait
+
+    def _pause(self, seconds: float):
+        """Hold back every caller for ``seconds`` (used for Retry-After)."""
+        with self._lock:
+            resume = time.monotonic() + seconds
+            if resume > self._updated:
+                self._updated = resume
+                self._tokens = min(self._tokens, 0.0)
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        headers = getattr(error, "headers", None)
+        value = headers.get("retry-after") if headers is not None else None
+        try:
+            return max(0.0, float(value)) if value is not None else None
+        except ValueError:
+            return None
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Return the delay before retrying ``error``, or None if it is not retryable."""
+        if isinstance(error, APIResponseError) and (
+            error.code == APIErrorCode.RateLimited or error.status == 429
+        ):
+            with self._lock:
+                self._stats.rate_limited += 1
+        elif isinstance(error, HTTPResponseError):
+            if error.status not in RETRYABLE_STATUSES:
+                return None
+        elif not isinstance(error, (RequestTimeoutError, httpx.TransportError)):
+            return None
+
+        if attempt >= self.max_retries:
+            with self._lock:
+                self._stats.failed += 1
+            return None
+
+        retry_after = self._retry_after(error)
+        if retry_after is not None:
+            self._pause(retry_after)
+            return retry_after
+
+        backoff = min(self.max_delay, self.base_delay * 2**attempt)
+        return random.uniform(backoff / 2, backoff)
+
+    def _record_retry(self):
+        with self._lock:
+            self._stats.retried += 1
+
+    def call(self, endpoint: Callable[..., Any], **kwargs) -> Any:
+        """Call ``endpoint(**kwargs)`` with pacing and retries."""
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                return endpoint(**kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            self._record_retry()
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(
+        self, endpoint: Callable[..., Awaitable[Any]], **kwargs
+    ) -> Any:
+        """Await ``endpoint(**kwargs)`` with pacing and retries."""
+        attempt = 0
+        while True:
+            await self.acquire_async()
+            try:
+                return await endpoint(**kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            self._record_retry()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter shared by every Notion client."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
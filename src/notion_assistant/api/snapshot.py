@@ -0,0 +1,204 @@
+"""
+Workspace snapshots: the raw API objects of a whole workspace in one file.
+
+A snapshot is JSON Lines, one record per line, compressed with zstd
+(``.zst``, needs the optional ``zstandard`` package) or gzip (``.gz``);
+any other suffix is written uncompressed. Records are written as they are
+fetched and read back line by line, so exports never hold the workspace.
+
+    {"kind": "snapshot", "version": 1, "exported_at": "..."}
+    {"kind": "database", "object": {...raw database...}}
+    {"kind": "page", "object": {...raw page or database row...}}
+    {"kind": "children", "parent_id": "...", "blocks": [...raw blocks...]}
+
+Usage:
+    python -m notion_assistant.api.snapshot export workspace.jsonl.zst
+    python -m notion_assistant.api.snapshot info workspace.jsonl.zst
+"""
+
+from typing import Any, Dict, IO, Iterator, List, Tuple
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import argparse
+import gzip
+import io
+import json
+import os
+import time
+from .client import NotionClient
+from .fake import FakeNotionWorkspace, WorkspaceSDKClient
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip is used instead
+    zstandard = None
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class SnapshotStats:
+    pages: int = 0  # pages and database rows
+    databases: int = 0
+    blocks: int = 0
+    bytes: int = 0  # size of the snapshot file
+    seconds: float = 0.0
+
+
+def default_snapshot_suffix() -> str:
+    return ".jsonl.zst" if zstandard is not None else ".jsonl.gz"
+
+
+def open_snapshot(path: str, mode: str = "r") -> IO[str]:
+    """Open a snapshot for text reading ("r") or writing ("w") by its suffix."""
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError("zstd snapshots need the zstandard package")
+        if mode == "w":
+            stream = zstandard.ZstdCompressor(level=10).stream_writer(open(path, "wb"))
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    return open(path, mode, encoding="utf-8")
+
+
+def _write(f: IO[str], record: Dict[str, Any]):
+    f.write(json.dumps(record, separators=(",", ":")))
+    f.write("\n")
+
+
+def _raw_tree(client: NotionClient, page_id: str) -> Iterator[Tuple[str, List[Dict]]]:
+    """Yield ``(parent_id, raw children)`` for a page's whole block tree.
+
+    Each level of the tree is fetched concurrently on the client's pool.
+    """
+    executor = client._get_executor()
+    level = [page_id]
+    while level:
+        next_level = []
+        for parent_id, blocks in zip(
+            level, executor.map(client._list_raw_children, level)
+        ):
+            yield parent_id, blocks
+            next_level.extend(b["id"] for b in blocks if b.get("has_children"))
+        level = next_level
+
+
+def export_snapshot(client: NotionClient, path: str) -> SnapshotStats:
+    """Stream every shared database, page and block tree into ``path``."""
+    stats = SnapshotStats()
+    start = time.perf_counter()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = path + ".tmp" + os.path.splitext(path)[1]
+    with open_snapshot(tmp_path, "w") as f:
+        _write(
+            f,
+            {
+                "kind": "snapshot",
+                "version": SNAPSHOT_VERSION,
+                "exported_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+        for database in client._iter_search("database"):
+            _write(f, {"kind": "database", "object": database})
+            stats.databases += 1
+
+        for page in client._iter_search("page"):
+            _write(f, {"kind": "page", "object": page})
+            stats.pages += 1
+            for parent_id, blocks in _raw_tree(client, page["id"]):
+                _write(
+                    f, {"kind": "children", "parent_id": parent_id, "blocks": blocks}
+                )
+                stats.blocks += len(blocks)
+
+    # Only complete snapshots appear under the final name
+    os.replace(tmp_path, path)
+    stats.bytes = os.path.getsize(path)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def iter_snapshot(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a snapshot one at a time."""
+    with open_snapshot(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_snapshot(path: str) -> FakeNotionWorkspace:
+    """Load a snapshot into an in-memory workspace."""
+    workspace = FakeNotionWorkspace()
+    for record in iter_snapshot(path):
+        kind = record["kind"]
+        if kind == "snapshot":
+            if record.get("version", 0) > SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported snapshot version {record['version']}")
+        elif kind == "database":
+            workspace.databases[record["object"]["id"]] = record["object"]
+        elif kind == "page":
+            workspace.pages[record["object"]["id"]] = record["object"]
+            workspace.children.setdefault(record["object"]["id"], [])
+        elif kind == "children":
+            workspace.add_raw_children(record["parent_id"], record["blocks"])
+    return workspace
+
+
+class OfflineNotionClient(NotionClient):
+    """``NotionClient`` served from a snapshot instead of the live API.
+
+    Every method works as on ``NotionClient`` (including filters, lazy and
+    depth-limited loading and the mirror), but requests are answered from
+    memory without pacing, so pipelines replay at disk speed.
+    """
+
+    def __init__(self, snapshot: str, **kwargs):
+        """
+        Args:
+            snapshot: Path of a snapshot written by ``export_snapshot``.
+            **kwargs: Passed on to ``NotionClient`` (e.g. max_workers, mirror).
+        """
+        self.snapshot_path = snapshot
+        self.workspace = load_snapshot(snapshot)
+        super().__init__(client=WorkspaceSDKClient(self.workspace), **kwargs)
+
+    def _request(self, endpoint, **kwargs) -> Any:
+        return endpoint(**kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("command", choices=["export", "info"])
+    parser.add_argument("path", nargs="?", help="snapshot file")
+    args = parser.parse_args()
+    path = args.path or "notion_snapshot" + default_snapshot_suffix()
+
+    if args.command == "export":
+        client = NotionClient()
+        try:
+            stats = client.export_snapshot(path)
+        finally:
+            client.close()
+        print(
+            f"Exported {stats.pages} pages, {stats.databases} databases and "
+            f"{stats.blocks} blocks to {path} "
+            f"({stats.bytes / 1024:.0f} KiB in {stats.seconds:.1f}s)"
+        )
+    else:
+        start = time.perf_counter()
+        workspace = load_snapshot(path)
+        print(
+            f"{path}: {len(workspace.pages)} pages, "
+            f"{len(workspace.databases)} databases, {len(workspace.blocks)} blocks "
+            f"(loaded in {time.perf_counter() - start:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,86 @@
-from notion_assistant.api.client import NotionClient
-from notion_assistant.memory.processor import LogEntryProcessor
 from notion_assistant.memory.manager import MemoryManager
 from notion_assistant.memory.insights import InsightGenerator
 from notion_assistant.memory.conversation import ConversationManager
+from notion_assistant.memory.sync import IncrementalSync
+from notion_assistant.memory.enrich import EntryEnricher
+from notion_assistant.memory.rebuild import RebuildPipeline
+from dotenv import load_dotenv
+import os
 import sys
 import time
 import threading
 from typing import Optional, Callable
 
 
+def make_enricher() -> Optional[EntryEnricher]:
+    """LLM enrichment of new entries, if ENRICH_ENTRIES is set (e.g. in .env)."""
+    load_dotenv()
+    if os.getenv("ENRICH_ENTRIES", "").lower() not in ("1", "true", "yes"):
+        return None
+    return EntryEnricher(
+        max_concurrency=int(os.getenv("ENRICH_CONCURRENCY", "4")),
+    )
+
+
+def report_enrichment(enricher: Optional[EntryEnricher]):
+    if enricher:
+        enricher.close()
+        stats = enricher.stats
+        print(
+            f"Enrichment: {stats.analyzed} analyzed, {stats.cached} cached, "
+            f"{stats.failed} failed"
+        )
+
+
 def rebuild_database():
-    """Rebuild the entire database from Notion."""
-    client = NotionClient()
-    processor = LogEntryProcessor()
-    memory_manager = MemoryManager()
+    """Rebuild the entire database from every shared Notion page and database."""
+    enricher = make_enricher()
 
-    # Clear existing collection
-    memory_manager.clear_collection()
+    def report(title, count):
+        print(f"- {title}: {count} entries")
 
-    # List shared pages
-    print("\nShared Pages:")
-    pages = client.list_shared_pages()
-    for page in pages:
-        print(f"- {page.title} ({page.type})")
-        print(f"  URL: {page.url}")
-        print(f"  ID: {page.id}\n")
+    print("\nRebuilding from Notion...")
+    with RebuildPipeline(enricher=enricher) as pipeline:
+        stats = pipeline.run(on_page=report)
+
+    print(
+        f"\nStored {stats.entries} entries from {stats.pages} pages "
+        f"({stats.databases} databases, {stats.skipped} skipped, "
+        f"{stats.failed} failed) in {stats.seconds:.1f}s"
+    )
+    print(
+        f"Embedded {stats.embedded} new or changed entries, "
+        f"removed {stats.deleted} stale entries"
+    )
+    print(
+        f"Throughput: {stats.pages_per_second:.2f} pages/s, "
+        f"{stats.entries_per_second:.2f} entries/s"
+    )
+    cache = pipeline.memory_manager.embedding_cache.stats
+    print(
+        f"Embedding cache: {cache.hits} hits, {cache.misses} misses "
+        f"({cache.hit_rate:.0%} hit rate)"
+    )
+    report_enrichment(enricher)
 
-    # Process first page if available
-    if pages:
-        print("\nProcessing first page...")
-        first_page = pages[0]
-        page_content = client.get_page_content(first_page.id)
 
-        if page_content:
-            # Process page into log entries
-            entries = processor.process_page(page_content)
-            print(f"\nFound {len(entries)} log entries")
+def sync_database():
+    """Incrementally sync the database with changes made in Notion."""
+    print("\nSyncing with Notion...")
+    enricher = make_enricher()
+    with IncrementalSync(enricher=enricher) as sync:
+        stats = sync.run()
 
-            # Store entries in memory
-            for entry in entries:
-                entry_id = memory_manager.store_entry(entry)
-                print(f"\nStored entry from {entry.date.strftime('%Y-%m-%d')}")
-                print(f"Text preview: {entry.raw_text[:200]}...")
+    print(
+        f"\nChecked {stats.pages_seen} pages "
+        f"({stats.pages_skipped} unchanged, {stats.pages_deleted} removed, "
+        f"{stats.pages_excluded} excluded)"
+    )
+    print(
+        f"Entries: {stats.entries_added} added, {stats.entries_updated} updated, "
+        f"{stats.entries_unchanged} unchanged, {stats.entries_deleted} deleted"
+    )
+    report_enrichment(enricher)
 
 
 def search_database(query: str, top_k: int = 3):
@@ -188,27 +227,51 @@ def display_thinking_animation(should_continue: Callable[[], bool]):
     sys.stdout.flush()
 
 
+def report_model_load(memory_manager: MemoryManager) -> bool:
+    """Print how the embedding model was loaded; False until it has been."""
+    load = memory_manager.model_load
+    if load is None:
+        return False
+    source = {"path": "local path", "staged": "staged copy", "hub": "hub"}
+    print(
+        f"\nEmbedding model {load.model_name} ({load.backend}) loaded from "
+        f"{source[load.source]} in {load.seconds:.2f}s"
+    )
+    return True
+
+
 def main():
+    load_dotenv()
     try:
+        # Load the embedding model while the user picks an action; every
+        # MemoryManager after that shares it (and its Chroma client)
+        memory_manager = MemoryManager()
+        memory_manager.preload_model()
+        model_reported = False
         while True:
+            if not model_reported:
+                model_reported = report_model_load(memory_manager)
             print("\nhi, i'm ben!\n---")
             print("1. rebuild database from notion")
-            print("2. search existing database")
-            print("3. generate new insights")
-            print("4. view latest insights")
-            print("5. chat with me")
-            print("6. manage memory entries")
-            print("7. bye!")
+            print("2. sync changes from notion")
+            print("3. search existing database")
+            print("4. generate new insights")
+            print("5. view latest insights")
+            print("6. chat with me")
+            print("7. manage memory entries")
+            print("8. bye!")
 
-            choice = input("\nenter your choice (1-7): ")
+            choice = input("\nenter your choice (1-8): ")
 
             if choice == "1":
                 rebuild_database()
             elif choice == "2":
+                sync_database()
+            elif choice == "3":
                 query = input("\nenter your search query: ")
                 top_k = int(input("how many results do you want? (default 3): ") or "3")
                 search_database(query, top_k)
-            elif choice == "3":
+            elif choice == "4":
                 recent_count = int(
                     input("\nhow many recent entries to analyze? (default 20): ")
                     or "20"
@@ -217,13 +280,13 @@ def main():
                     input("window size for analysis? (default 7): ") or "7"
                 )
                 generate_insights(recent_count, window_size)
-            elif choice == "4":
-                view_latest_insights()
             elif choice == "5":
-                chat_with_ben()
+                view_latest_insights()
             elif choice == "6":
-                manage_memory_entries()
+                chat_with_ben()
             elif choice == "7":
+                manage_memory_entries()
+            elif choice == "8":
                 print("\ngoodbye!")
                 break
             else:
@@ -0,0 +1,85 @@
+from typing import Any, List, Optional, Tuple
+import re
+
+
+class TextChunker:
+    """Split entry text into overlapping chunks that fit the embedding model.
+
+    ``all-MiniLM-L6-v2`` only reads the first 256 word pieces of its input,
+    so longer entries are cut into windows of at most ``max_tokens`` tokens
+    (including the two the model adds). Windows end at a line break (each
+    Notion block is a line) when one falls in their second half, or else
+    between words, and consecutive windows share up to ``overlap`` tokens,
+    again starting at a line or word boundary where possible. Tokens are
+    counted with the model's tokenizer when there is one and as
+    whitespace-separated words otherwise.
+    """
+
+    def __init__(
+        self, tokenizer: Optional[Any] = None, max_tokens: int = 256, overlap: int = 32
+    ):
+        self.tokenizer = tokenizer
+        # Leave room for the [CLS] and [SEP] tokens the model adds
+        self.budget = max(8, max_tokens - 2)
+        self.overlap = max(0, min(overlap, self.budget // 2))
+
+    @classmethod
+    def for_model(cls, model: Any, overlap: int = 32) -> "TextChunker":
+        """Chunker sized for a SentenceTransformer (or anything like it)."""
+        return cls(
+            tokenizer=getattr(model, "tokenizer", None),
+            max_tokens=getattr(model, "max_seq_length", None) or 256,
+            overlap=overlap,
+        )
+
+    def _spans(self, text: str) -> List[Tuple[int, int]]:
+        """Character span of every token in ``text``."""
+        if self.tokenizer is None:
+            return [match.span() for match in re.finditer(r"\S+", text)]
+        encoded = self.tokenizer(
+            text,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            verbose=False,
+        )
+        return [tuple(span) for span in encoded["offset_mapping"]]
+
+    def count_tokens(self, text: str) -> int:
+        return len(self._spans(text))
+
+    def split(self, text: str) -> List[str]:
+        """Split ``text`` into chunks; short texts come back as one chunk."""
+        spans = self._spans(text)
+        if len(spans) <= self.budget:
+            return [text]
+
+        # Token i starts a line / a word (rather than continuing one)
+        line_starts = [True] + [
+            "\n" in text[spans[i - 1][1] : spans[i][0]] for i in range(1, len(spans))
+        ]
+        word_starts = [True] + [
+            spans[i][0] > spans[i - 1][1] for i in range(1, len(spans))
+        ]
+
+        def boundary(candidates) -> Optional[int]:
+            """First line start among the candidates, else first word start."""
+            for starts in (line_starts, word_starts):
+                for i in candidates:
+                    if starts[i]:
+                        return i
+            return None
+
+        chunks = []
+        start = 0
+        while True:
+            end = min(start + self.budget, len(spans))
+            if end < len(spans):
+                # Latest boundary in the window's second half
+                end = boundary(range(end, start + self.budget // 2, -1)) or end
+            chunks.append(text[spans[start][0] : spans[end - 1][1]])
+            if end == len(spans):
+                return chunks
+
+            # Earliest boundary within the overlap
+            low = max(end - self.overlap, start + 1)
+            start = boundary(range(low, end)) or end
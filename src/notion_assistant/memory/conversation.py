@@ -308,10 +308,14 @@ class ConversationManager:
             context += "relevant log entries:\n"
             for i, result in enumerate(memory_results, 1):
                 context += f"entry {i} ({result.entry.date.strftime('%Y-%m-%d')}):\n"
-                # Limit text length to avoid token overload
-                preview = result.entry.raw_text[:500]
-                if len(result.entry.raw_text) > 500:
-                    preview += "..."
+                if result.chunks:
+                    # Only the parts of the entry that matched the query
+                    preview = "\n...\n".join(result.chunks)
+                else:
+                    # Limit text length to avoid token overload
+                    preview = result.entry.raw_text[:500]
+                    if len(result.entry.raw_text) > 500:
+                        preview += "..."
                 context += f"{preview}\n\n"
 
         # Add insights if available and not an error
@@ -0,0 +1,95 @@
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+import hashlib
+import uuid
+from notion_assistant.api.models import NotionBlock
+from .models import LogEntry
+
+# Namespace for the uuid5 ids of stored entries
+ENTRY_ID_NAMESPACE = uuid.UUID("6f1c2a4e-8d3b-5e7f-9a0b-1c2d3e4f5a6b")
+
+
+def entry_key(entry: LogEntry) -> str:
+    """Entries are identified by their date-heading block."""
+    return entry.blocks[0].id
+
+
+def entry_content_hash(entry: LogEntry) -> str:
+    """Hash what an entry says: its date and every block's type, text and state.
+
+    Block ids and edit times are left out, so touching a block without
+    changing its content (or undoing an edit) keeps the hash. Entries without
+    blocks (added by hand) are hashed by their text.
+    """
+    digest = hashlib.sha256(entry.date.isoformat().encode())
+
+    def visit(block: NotionBlock, depth: int):
+        text = "".join(rt.plain_text for rt in block.content.rich_text)
+        digest.update(f"\n{depth}:{block.type}:{block.content.checked}:".encode())
+        digest.update(text.encode())
+        for child in block.children or []:
+            visit(child, depth + 1)
+
+    for block in entry.blocks:
+        visit(block, 0)
+    if not entry.blocks:
+        digest.update(f"\n{entry.raw_text or ''}".encode())
+    return digest.hexdigest()
+
+
+def entry_id(entry: LogEntry, content_hash: Optional[str] = None) -> str:
+    """Deterministic Chroma id of an entry.
+
+    Entries read from Notion are named by their page and date heading, so
+    re-ingesting a page (edited or not) lands on the same ids. Entries
+    without a heading are named by their content hash instead.
+    """
+    if entry.blocks:
+        name = f"{entry.page_id or ''}/{entry_key(entry)}"
+    else:
+        name = f"{entry.page_id or ''}/{content_hash or entry_content_hash(entry)}"
+    return str(uuid.uuid5(ENTRY_ID_NAMESPACE, name))
+
+
+@dataclass
+class EntryDiff:
+    """Operations that bring a page's stored entries up to date.
+
+    Entries are keyed by ``entry_key``; stored records (from ``SyncState``)
+    are ``{"hash": ..., "entry_id": ...}`` dicts.
+
+    - added: (key, hash, entry) for entries to store
+    - updated: (key, hash, entry, entry_id) for stored entries to overwrite
+    - unchanged: key -> record for entries to leave alone
+    - deleted: ids of stored entries that are gone
+    """
+
+    added: List[Tuple[str, str, LogEntry]] = field(default_factory=list)
+    updated: List[Tuple[str, str, LogEntry, str]] = field(default_factory=list)
+    unchanged: Dict[str, Dict] = field(default_factory=dict)
+    deleted: List[str] = field(default_factory=list)
+
+
+def diff_entries(previous: Dict[str, Dict], entries: List[LogEntry]) -> EntryDiff:
+    """Compare freshly processed entries with the records of the last ingest."""
+    diff = EntryDiff()
+    seen = set()
+
+    for entry in entries:
+        key = entry_key(entry)
+        if key in seen:
+            # The same heading can't head two entries; keep the first
+            continue
+        seen.add(key)
+
+        content_hash = entry_content_hash(entry)
+        old = previous.get(key)
+        if old is None:
+            diff.added.append((key, content_hash, entry))
+        elif old.get("hash") == content_hash:
+            diff.unchanged[key] = old
+        else:
+            diff.updated.append((key, content_hash, entry, old["entry_id"]))
+
+    diff.deleted = [old["entry_id"] for key, old in previous.items() if key not in seen]
+    return diff
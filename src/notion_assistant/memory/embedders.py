@@ -0,0 +1,189 @@
+"""
+Embedding backends: what turns texts into vectors for ``MemoryManager``.
+
+- ``torch``: the SentenceTransformer itself, in full precision.
+- ``onnx-int8``: the same model exported to ONNX with int8 weights and run
+  by ONNX Runtime (needs the optional ``onnx`` and ``onnxruntime``
+  packages). It is exported once, next to the staged models in the data
+  directory, and afterwards loads without PyTorch touching the model.
+
+Both produce vectors of the same size and nearly the same direction, so
+entries embedded by one can be searched with the other;
+``benchmarks/bench_embedders.py`` measures how closely they agree.
+"""
+
+from typing import Any, List, Protocol, Sequence, Union
+import json
+import os
+import shutil
+import numpy as np
+
+try:
+    import onnxruntime
+except ImportError:  # optional: only the torch backend is available
+    onnxruntime = None
+
+BACKENDS = ("torch", "onnx-int8")
+DEFAULT_BACKEND = "torch"
+
+
+class Embedder(Protocol):
+    """The part of the SentenceTransformer interface the memory layer uses."""
+
+    tokenizer: Any
+    max_seq_length: int
+
+    def encode(
+        self, sentences: Union[str, Sequence[str]], batch_size: int = 32, **kwargs
+    ) -> np.ndarray: ...
+
+
+class OnnxEmbedder:
+    """A SentenceTransformer exported to ONNX with int8 weights.
+
+    Only the transformer runs in ONNX Runtime; pooling and normalization are
+    done here with numpy, as configured by the exported model.
+    """
+
+    MODEL_FILE = "model_int8.onnx"
+    CONFIG_FILE = "embedder.json"
+    INPUT_NAMES = ("input_ids", "attention_mask", "token_type_ids")
+
+    def __init__(self, path: str, threads: int = 0):
+        """
+        Args:
+            path: Directory written by ``export``.
+            threads: ONNX Runtime intra-op threads (0 uses every core).
+        """
+        if onnxruntime is None:
+            raise ImportError("the onnx-int8 backend needs the onnxruntime package")
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(path, self.CONFIG_FILE)) as f:
+            self.config = json.load(f)
+        self.max_seq_length = self.config["max_seq_length"]
+        self.tokenizer = AutoTokenizer.from_pretrained(path, local_files_only=True)
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(path, self.MODEL_FILE),
+            options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    @classmethod
+    def exists(cls, path: str) -> bool:
+        return os.path.isfile(os.path.join(path, cls.CONFIG_FILE))
+
+    @classmethod
+    def export(cls, model: Any, path: str, **kwargs) -> "OnnxEmbedder":
+        """Export and quantize a SentenceTransformer into ``path``."""
+        import torch
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        pooling = next((m for m in model if type(m).__name__ == "Pooling"), None)
+        # Older sentence-transformers only have get_pooling_mode_str
+        pooling_mode = getattr(pooling, "pooling_mode", None) or (
+            pooling.get_pooling_mode_str() if pooling is not None else "mean"
+        )
+        config = {
+            "max_seq_length": model.max_seq_length,
+            "pooling": pooling_mode,
+            "normalize": any(type(m).__name__ == "Normalize" for m in model),
+        }
+        if config["pooling"] not in ("mean", "cls"):
+            raise ValueError(f"Unsupported pooling mode {config['pooling']}")
+
+        class TokenEmbeddings(torch.nn.Module):
+            def __init__(self, transformer):
+                super().__init__()
+                self.transformer = transformer
+
+            def forward(self, input_ids, attention_mask, token_type_ids):
+                return self.transformer(
+                    input_ids=input_ids,
+                    attention_mask=attention_mask,
+                    token_type_ids=token_type_ids,
+                ).last_hidden_state
+
+        # Write next to the target and rename, so a failed export isn't used
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        sample = model.tokenizer(
+            ["an example sentence", "another"], padding=True, return_tensors="pt"
+        )
+        if "token_type_ids" not in sample:
+            sample["token_type_ids"] = torch.zeros_like(sample["input_ids"])
+        axes = {0: "batch", 1: "tokens"}
+        fp32_path = os.path.join(tmp_path, "model.onnx")
+        torch.onnx.export(
+            TokenEmbeddings(model[0].auto_model).eval(),
+            tuple(sample[name] for name in cls.INPUT_NAMES),
+            fp32_path,
+            input_names=list(cls.INPUT_NAMES),
+            output_names=["token_embeddings"],
+            dynamic_axes={
+                name: axes for name in cls.INPUT_NAMES + ("token_embeddings",)
+            },
+            opset_version=17,
+            dynamo=False,
+        )
+        quantize_dynamic(
+            fp32_path,
+            os.path.join(tmp_path, cls.MODEL_FILE),
+            weight_type=QuantType.QInt8,
+        )
+        os.remove(fp32_path)
+        model.tokenizer.save_pretrained(tmp_path)
+        with open(os.path.join(tmp_path, cls.CONFIG_FILE), "w") as f:
+            json.dump(config, f)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        return cls(path, **kwargs)
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np",
+        )
+        if "token_type_ids" not in encoded:
+            encoded["token_type_ids"] = np.zeros_like(encoded["input_ids"])
+        feeds = {
+            name: encoded[name].astype(np.int64)
+            for name in self.INPUT_NAMES
+            if name in self.input_names
+        }
+        tokens = self.session.run(None, feeds)[0]
+        if self.config["pooling"] == "cls":
+            vectors = tokens[:, 0]
+        else:
+            mask = encoded["attention_mask"][..., None].astype(tokens.dtype)
+            vectors = (tokens * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.config["normalize"]:
+            vectors = vectors / np.maximum(
+                np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12
+            )
+        return vectors.astype(np.float32)
+
+    def encode(
+        self, sentences: Union[str, Sequence[str]], batch_size: int = 32, **kwargs
+    ) -> np.ndarray:
+        """Embed texts like ``SentenceTransformer.encode``."""
+        if isinstance(sentences, str):
+            return self.encode([sentences], batch_size)[0]
+        # Batch texts of similar length together to pad less
+        order = sorted(range(len(sentences)), key=lambda i: -len(sentences[i]))
+        vectors = np.empty((len(sentences), 0), np.float32)
+        for start in range(0, len(order), batch_size):
+            batch = order[start : start + batch_size]
+            encoded = self._encode_batch([sentences[i] for i in batch])
+            if vectors.shape[1] == 0:
+                vectors = np.empty((len(sentences), encoded.shape[1]), np.float32)
+            vectors[batch] = encoded
+        return vectors
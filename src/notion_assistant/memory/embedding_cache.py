@@ -0,0 +1,174 @@
+from typing import Dict, List, Optional, Sequence
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+
+CACHE_FILENAME = "embeddings.sqlite"
+
+# SQLite limits the number of ? parameters per statement
+_QUERY_CHUNK = 500
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # vectors dropped from disk to stay under the cap
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class EmbeddingCache:
+    """Content-addressed store of embeddings, keyed by model and text hash.
+
+    Lookups go through an in-process LRU of ``memory_items`` vectors, then a
+    SQLite file holding up to ``max_items`` float32 vectors. When the file
+    grows past its cap, the least recently used tenth is evicted. Vectors
+    from different models never mix, since the model name is part of the key.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        model_name: str,
+        memory_items: int = 4096,
+        max_items: int = 100_000,
+    ):
+        """
+        Args:
+            path: SQLite file, or None for a memory-only cache.
+            model_name: Name of the model the vectors come from.
+            memory_items: Vectors kept in the in-process LRU.
+            max_items: Vectors kept on disk.
+        """
+        self.path = path
+        self.model_name = model_name
+        self.memory_items = memory_items
+        self.max_items = max_items
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_last_used "
+                "ON embeddings (last_used)"
+            )
+            self._db.commit()
+            self._disk_items = self._db.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()[0]
+
+    def key(self, text: str) -> str:
+        return f"{self.model_name}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Cached vectors for ``texts``, with None for each miss."""
+        keys = [self.key(text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+
+            missing = list(dict.fromkeys(k for k in keys if k not in found))
+            if self._db is not None and missing:
+                from_disk = {}
+                for start in range(0, len(missing), _QUERY_CHUNK):
+                    chunk = missing[start : start + _QUERY_CHUNK]
+                    rows = self._db.execute(
+                        "SELECT key, vector FROM embeddings WHERE key IN "
+                        f"({','.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                    for key, blob in rows:
+                        from_disk[key] = np.frombuffer(blob, dtype=np.float32)
+                if from_disk:
+                    now = time.time()
+                    self._db.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                        [(now, key) for key in from_disk],
+                    )
+                    self._db.commit()
+                for key, vector in from_disk.items():
+                    self._remember(key, vector)
+                found.update(from_disk)
+                disk_keys = set(from_disk)
+            else:
+                disk_keys = set()
+
+            for key in keys:
+                if key in disk_keys:
+                    self.stats.disk_hits += 1
+                    disk_keys.discard(key)  # later repeats were served from memory
+                elif key in found:
+                    self.stats.memory_hits += 1
+                else:
+                    self.stats.misses += 1
+        return [found.get(key) for key in keys]
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[np.ndarray]):
+        """Store freshly computed vectors for ``texts``."""
+        items = {
+            self.key(text): np.asarray(vector, dtype=np.float32)
+            for text, vector in zip(texts, vectors)
+        }
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+            if self._db is None or not items:
+                return
+
+            now = time.time()
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_used) "
+                "VALUES (?, ?, ?)",
+                [(key, vector.tobytes(), now) for key, vector in items.items()],
+            )
+            self._disk_items += self._db.total_changes - before
+            if self._disk_items > self.max_items:
+                # Evict down to 90% of the cap so eviction isn't run per write
+                excess = self._disk_items - int(self.max_items * 0.9)
+                self._db.execute(
+                    "DELETE FROM embeddings WHERE key IN (SELECT key FROM "
+                    "embeddings ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                self._disk_items -= excess
+                self.stats.evictions += excess
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
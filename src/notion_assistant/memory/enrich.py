@@ -0,0 +1,126 @@
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import json
+import os
+import threading
+from .diff import entry_content_hash
+from .llm import OllamaClient
+from .models import LogEntry
+
+CACHE_FILENAME = "enrichment_cache.json"
+
+
+@dataclass
+class EnrichStats:
+    analyzed: int = 0  # entries sent to the LLM
+    cached: int = 0  # entries answered from the cache
+    failed: int = 0  # entries whose analysis failed (left at the defaults)
+
+
+class EntryEnricher:
+    """Fill in the summary and importance of log entries with the LLM.
+
+    ``OllamaClient.analyze_entry`` calls run on a pool shared by every
+    ``enrich`` call, so at most ``max_concurrency`` are in flight however
+    many pages are being processed at once. Results are cached by model and
+    entry content hash in a JSON file next to the collection, so an entry is
+    only analyzed again after its content changes.
+    """
+
+    def __init__(
+        self,
+        llm: Optional[OllamaClient] = None,
+        cache_path: Optional[str] = None,
+        data_dir: Optional[str] = None,
+        max_concurrency: int = 4,
+    ):
+        """
+        Args:
+            llm: Client used for the analysis.
+            cache_path: Cache file. Defaults to ``enrichment_cache.json`` in
+                ``data_dir``.
+            data_dir: Data directory (defaults to ~/notion_assistant_data).
+            max_concurrency: Upper bound on concurrent analyze_entry calls.
+        """
+        self.llm = llm or OllamaClient()
+        data_dir = os.path.expanduser(data_dir or "~/notion_assistant_data")
+        self.cache_path = cache_path or os.path.join(data_dir, CACHE_FILENAME)
+        self.cache: Dict[str, Dict] = {}
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, "r") as f:
+                self.cache = json.load(f)
+        self.stats = EnrichStats()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrency), thread_name_prefix="ollama-enrich"
+        )
+
+    def _key(self, entry: LogEntry) -> str:
+        # Another model may judge the same text differently
+        return f"{getattr(self.llm, 'model', '')}:{entry_content_hash(entry)}"
+
+    def _analyze(self, key: str, entry: LogEntry) -> Optional[Dict]:
+        try:
+            summary, importance = self.llm.analyze_entry(
+                entry.raw_text or "", entry.date.strftime("%Y-%m-%d")
+            )
+        except Exception as e:
+            print(f"Error analyzing entry from {entry.date:%Y-%m-%d}: {e}")
+            return None
+        result = {"summary": summary, "importance": importance}
+        with self._lock:
+            self.cache[key] = result
+        return result
+
+    def enrich(self, entries: List[LogEntry]) -> List[LogEntry]:
+        """Set ``summary`` and ``importance`` on each entry, in place.
+
+        Blocks until every entry is done; safe to call from several threads.
+        Entries whose analysis fails keep their current values.
+        """
+        pending = {}  # key -> entries with that content
+        for entry in entries:
+            key = self._key(entry)
+            with self._lock:
+                cached = self.cache.get(key)
+            if cached is not None:
+                entry.summary = cached["summary"]
+                entry.importance = cached["importance"]
+                self._count("cached")
+            else:
+                pending.setdefault(key, []).append(entry)
+
+        futures = {
+            key: self._executor.submit(self._analyze, key, same[0])
+            for key, same in pending.items()
+        }
+        for key, future in futures.items():
+            result = future.result()
+            for entry in pending[key]:
+                if result is None:
+                    self._count("failed")
+                    continue
+                entry.summary = result["summary"]
+                entry.importance = result["importance"]
+                self._count("analyzed")
+        return entries
+
+    def _count(self, field: str):
+        with self._lock:
+            setattr(self.stats, field, getattr(self.stats, field) + 1)
+
+    def save(self):
+        """Write the cache file."""
+        with self._lock:
+            cache = dict(self.cache)
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def close(self):
+        """Save the cache and stop the worker threads."""
+        self.save()
+        self._executor.shutdown(wait=True)
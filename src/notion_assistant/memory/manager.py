@@ -1,10 +1,15 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
-import chromadb
 from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
+import numpy as np
+from .chunking import TextChunker
+from .diff import entry_content_hash, entry_id, entry_key
+from .embedders import DEFAULT_BACKEND, Embedder
+from .embedding_cache import CACHE_FILENAME
+from .resources import DEFAULT_EMBEDDING_MODEL, ResourceRegistry, ModelLoad
+from .resources import env_flag, model_key
+from .resources import registry as default_registry
 from .models import LogEntry, MemoryEntry, SearchResult
-import uuid
 import math
 import os
 import shutil
@@ -12,81 +17,215 @@ from pathlib import Path
 
 
 class MemoryManager:
-    def __init__(self, collection_name: str = "notion_logs"):
+    def __init__(
+        self,
+        collection_name: str = "notion_logs",
+        data_dir: Optional[str] = None,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        cache_embeddings: bool = True,
+        registry: Optional[ResourceRegistry] = None,
+        model_path: Optional[str] = None,
+        offline: Optional[bool] = None,
+        backend: Optional[str] = None,
+    ):
+        """
+        Args:
+            collection_name: Chroma collection of the entries.
+            data_dir: Data directory (defaults to ~/notion_assistant_data).
+            model_name: Embedding model; loaded from the copy staged in
+                ``data_dir`` if there is one, else from the hub.
+            cache_embeddings: Keep embeddings in a cache file in ``data_dir``.
+            registry: Where shared models and clients come from.
+            model_path: Local model directory to load instead (defaults to
+                EMBEDDING_MODEL_PATH).
+            offline: Never reach for the hub; fail if the model isn't on disk
+                (defaults to EMBEDDING_OFFLINE).
+            backend: How texts are embedded, "torch" or "onnx-int8"
+                (defaults to EMBEDDING_BACKEND, else "torch"); see embedders.
+        """
         # Create data directory in user's home folder
-        self.data_dir = os.path.expanduser("~/notion_assistant_data")
+        self.data_dir = os.path.expanduser(data_dir or "~/notion_assistant_data")
         os.makedirs(self.data_dir, exist_ok=True)
 
-        # Initialize Chroma client with new configuration
-        self.client = chromadb.PersistentClient(path=self.data_dir)
+        # The Chroma client and model are shared by every manager in the
+        # process; the model is only loaded when something is embedded
+        self.registry = registry or default_registry
+        self.client = self.registry.chroma_client(self.data_dir)
 
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
             name=collection_name, metadata={"hnsw:space": "cosine"}
         )
+        # Entries are searched through their chunks, stored alongside
+        self.chunks = self.client.get_or_create_collection(
+            name=f"{collection_name}_chunks", metadata={"hnsw:space": "cosine"}
+        )
 
-        # Initialize sentence transformer
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+        self.model_name = model_name
+        self.model_path = model_path or os.getenv("EMBEDDING_MODEL_PATH") or None
+        self.offline = env_flag("EMBEDDING_OFFLINE") if offline is None else offline
+        self.backend = backend or os.getenv("EMBEDDING_BACKEND") or DEFAULT_BACKEND
+        # Fail now on unknown backends (or, offline, models not on disk)
+        # rather than on the first search
+        self.registry.locate(model_name, **self._model_location())
+        self._chunker: Optional[TextChunker] = None
+        # Largest write Chroma accepts in one call
+        self.max_batch_size = self.client.get_max_batch_size()
+        # Every text is embedded once per model and backend (their vectors
+        # differ slightly); later calls read the cache
+        cache_key = model_key(model_name, self.model_path)
+        if self.backend != DEFAULT_BACKEND:
+            cache_key = f"{cache_key}@{self.backend}"
+        self.embedding_cache = self.registry.embedding_cache(
+            os.path.join(self.data_dir, CACHE_FILENAME) if cache_embeddings else None,
+            cache_key,
+        )
 
         # Recency bias parameters
         self.lambda_decay = 0.1  # Decay rate for recency bias
         self.recency_weight = 0.2  # Weight for recency in final score
+        # Weight for the LLM-judged importance (see EntryEnricher)
+        self.importance_weight = 0.1
+
+    @property
+    def model(self) -> Embedder:
+        """The shared embedding model, loaded on first use."""
+        return self.registry.model(self.model_name, **self._model_location())
+
+    @property
+    def model_load(self) -> Optional[ModelLoad]:
+        """Where the model was loaded from and how long it took, once loaded."""
+        return self.registry.model_load(self.model_name, **self._model_location())
+
+    def _model_location(self) -> dict:
+        return {
+            "data_dir": self.data_dir,
+            "model_path": self.model_path,
+            "offline": self.offline,
+            "backend": self.backend,
+        }
+
+    def preload_model(self):
+        """Start loading the model in the background."""
+        return self.registry.preload(self.model_name, **self._model_location())
+
+    @property
+    def chunker(self) -> TextChunker:
+        if self._chunker is None:
+            self._chunker = TextChunker.for_model(self.model)
+        return self._chunker
+
+    @chunker.setter
+    def chunker(self, chunker: TextChunker):
+        self._chunker = chunker
 
     def clear_collection(self):
-        """Clear all entries from the collection."""
+        """Clear all entries (and their chunks) from the collection."""
+        collection_name = self.collection.name
+        chunks_name = self.chunks.name
         try:
-            # Store collection name before deleting objects
-            collection_name = (
-                self.collection.name if hasattr(self, "collection") else "notion_logs"
-            )
-
-            # Close any existing connections
-            if hasattr(self, "client"):
-                del self.client
-            if hasattr(self, "collection"):
-                del self.collection
-
-            # Delete the directory to ensure complete cleanup
-            if os.path.exists(self.data_dir):
-                # First try to remove all files
-                for root, dirs, files in os.walk(self.data_dir, topdown=False):
-                    for name in files:
-                        try:
-                            os.chmod(os.path.join(root, name), 0o666)
-                            os.remove(os.path.join(root, name))
-                        except Exception:
-                            pass
-                    for name in dirs:
-                        try:
-                            os.chmod(os.path.join(root, name), 0o777)
-                            os.rmdir(os.path.join(root, name))
-                        except Exception:
-                            pass
-                try:
-                    os.rmdir(self.data_dir)
-                except Exception:
-                    pass
-
-            # Recreate the directory with proper permissions
-            os.makedirs(self.data_dir, mode=0o777, exist_ok=True)
-
-            # Reinitialize the client and collection
-            self.client = chromadb.PersistentClient(path=self.data_dir)
-            self.collection = self.client.create_collection(
-                name=collection_name, metadata={"hnsw:space": "cosine"}
-            )
+            # Drop and recreate through the client; removing the files under
+            # a live PersistentClient leaves it with a read-only database
+            self.client.delete_collection(collection_name)
+            self.client.delete_collection(chunks_name)
             print("Collection cleared successfully")
         except Exception as e:
             print(f"Error clearing collection: {e}")
-            # If there's an error, try to reinitialize anyway
-            self.client = chromadb.PersistentClient(path=self.data_dir)
-            self.collection = self.client.get_or_create_collection(
-                name=collection_name, metadata={"hnsw:space": "cosine"}
-            )
+        self.collection = self.client.get_or_create_collection(
+            name=collection_name, metadata={"hnsw:space": "cosine"}
+        )
+        self.chunks = self.client.get_or_create_collection(
+            name=chunks_name, metadata={"hnsw:space": "cosine"}
+        )
 
     def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text using sentence transformer."""
-        return self.model.encode(text).tolist()
+        return self._generate_embeddings([text])[0]
+
+    def _generate_embeddings(
+        self, texts: List[str], batch_size: int = 32
+    ) -> List[List[float]]:
+        """Embed many texts with batched forward passes.
+
+        Texts already in the embedding cache are not embedded again.
+        """
+        if not texts:
+            return []
+        vectors = self.embedding_cache.get_many(texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        if missing:
+            encoded = self.model.encode(missing, batch_size=batch_size)
+            self.embedding_cache.put_many(missing, encoded)
+            computed = dict(zip(missing, encoded))
+            vectors = [computed[t] if v is None else v for t, v in zip(texts, vectors)]
+        return [np.asarray(vector).tolist() for vector in vectors]
+
+    def _bulk(self, write, **columns):
+        """Call a Chroma write in slices no larger than the client accepts."""
+        ids = columns["ids"]
+        size = self.max_batch_size
+        for start in range(0, len(ids), size):
+            write(
+                **{
+                    name: values[start : start + size]
+                    for name, values in columns.items()
+                }
+            )
+
+    def _write_entries(self, items: List[Tuple[str, str, dict]], batch_size: int = 32):
+        """Upsert ``(entry_id, text, metadata)`` items together with their chunks.
+
+        The chunks of all items are embedded together, ``batch_size`` per
+        forward pass; the entry record gets the normalized mean of its chunk
+        embeddings. Each collection is written with one bulk call.
+        """
+        split = [self.chunker.split(text) for _, text, _ in items]
+        vectors = iter(
+            self._generate_embeddings(
+                [chunk for chunks in split for chunk in chunks], batch_size
+            )
+        )
+
+        ids, documents, metadatas, embeddings = [], [], [], []
+        chunk_ids, chunk_documents, chunk_metadatas, chunk_embeddings = [], [], [], []
+        for (entry_id, text, metadata), chunks in zip(items, split):
+            entry_vectors = [next(vectors) for _ in chunks]
+            for index, (chunk, vector) in enumerate(zip(chunks, entry_vectors)):
+                chunk_metadata = {
+                    "parent_id": entry_id,
+                    "chunk": index,
+                    "date": metadata["date"],
+                }
+                if "page_id" in metadata:
+                    chunk_metadata["page_id"] = metadata["page_id"]
+                chunk_ids.append(f"{entry_id}:{index}")
+                chunk_documents.append(chunk)
+                chunk_metadatas.append(chunk_metadata)
+                chunk_embeddings.append(vector)
+
+            mean = np.mean(entry_vectors, axis=0)
+            norm = np.linalg.norm(mean)
+            ids.append(entry_id)
+            documents.append(text)
+            metadatas.append({**metadata, "chunks": len(chunks)})
+            embeddings.append((mean / norm if norm else mean).tolist())
+
+        # A shorter new version leaves fewer chunks behind, so drop the old ones
+        self.chunks.delete(where={"parent_id": {"$in": ids}})
+        self._bulk(
+            self.chunks.add,
+            ids=chunk_ids,
+            embeddings=chunk_embeddings,
+            documents=chunk_documents,
+            metadatas=chunk_metadatas,
+        )
+        self._bulk(
+            self.collection.upsert,
+            ids=ids,
+            embeddings=embeddings,
+            documents=documents,
+            metadatas=metadatas,
+        )
 
     def _calculate_recency_score(self, entry_date: datetime) -> float:
         """Calculate recency score using exponential decay."""
@@ -94,32 +233,114 @@ class MemoryManager:
         return math.exp(-self.lambda_decay * days_old)
 
     def store_entry(self, entry: LogEntry) -> str:
-        """Store a log entry in Chroma with its embedding."""
-        # Generate embedding from raw text
-        embedding = self._generate_embedding(entry.raw_text or "")
-
-        # Generate unique ID
-        entry_id = str(uuid.uuid4())
-
-        # Prepare metadata
-        metadata = {"date": entry.date.isoformat()}
-
-        # Store in Chroma
-        self.collection.add(
-            embeddings=[embedding],
-            documents=[entry.raw_text or ""],
-            metadatas=[metadata],
-            ids=[entry_id],
+        """Store a log entry in Chroma with its embedding.
+
+        The id is deterministic (see ``entry_id``), so storing the same entry
+        again overwrites it instead of adding a duplicate.
+        """
+        return self.store_entries([entry])[0]
+
+    def store_entries(self, entries: List[LogEntry], batch_size: int = 64) -> List[str]:
+        """Store many log entries, embedding and writing them in batches.
+
+        Entries are handled ``batch_size`` at a time: their chunks are
+        embedded in batched forward passes and written with one bulk call
+        per collection, instead of one model call and one write per entry.
+        Every entry's ``id`` is set; the ids are returned in entry order.
+        """
+        ids = []
+        items = {}  # the same id twice in one write fails it; the last wins
+        for entry in entries:
+            content_hash = entry_content_hash(entry)
+            entry.id = entry_id(entry, content_hash)
+            ids.append(entry.id)
+            items[entry.id] = (
+                entry.id,
+                entry.raw_text or "",
+                self._entry_metadata(entry, content_hash),
+            )
+
+        items = list(items.values())
+        for start in range(0, len(items), batch_size):
+            self._write_entries(items[start : start + batch_size], batch_size)
+        return ids
+
+    def upsert_entries(self, entries: List[LogEntry], batch_size: int = 64) -> int:
+        """Store entries under their deterministic ids, skipping unchanged ones.
+
+        Only entries that are new or whose stored content hash differs are
+        embedded and written (through ``store_entries``). Every entry's
+        ``id`` is set. Returns the number of entries written.
+        """
+        pending = {}
+        for entry in entries:
+            content_hash = entry_content_hash(entry)
+            entry.id = entry_id(entry, content_hash)
+            # Duplicate ids would fail the whole write; keep the first
+            pending.setdefault(entry.id, (entry, content_hash))
+        if not pending:
+            return 0
+
+        stored = self.collection.get(ids=list(pending), include=["metadatas"])
+        enriched = {}
+        for stored_id, metadata in zip(stored["ids"], stored["metadatas"]):
+            metadata = metadata or {}
+            unchanged = metadata.get("content_hash") == pending[stored_id][1]
+            # Entries stored before chunking are written again to get chunks
+            if unchanged and metadata.get("chunks"):
+                entry, content_hash = pending.pop(stored_id)
+                summary = entry.summary
+                if summary is not None and summary != metadata.get("summary"):
+                    # Newly enriched: only the metadata changes
+                    enriched[stored_id] = {
+                        **metadata,
+                        **self._entry_metadata(entry, content_hash),
+                    }
+        if enriched:
+            self.collection.update(
+                ids=list(enriched), metadatas=list(enriched.values())
+            )
+        if not pending:
+            return 0
+
+        self.store_entries([entry for entry, _ in pending.values()], batch_size)
+        return len(pending)
+
+    def _entry_metadata(
+        self, entry: LogEntry, content_hash: Optional[str] = None
+    ) -> dict:
+        metadata = {
+            "date": entry.date.isoformat(),
+            "content_hash": content_hash or entry_content_hash(entry),
+        }
+        if entry.page_id:
+            metadata["page_id"] = entry.page_id
+        if entry.blocks:
+            metadata["entry_key"] = entry_key(entry)
+        if entry.summary is not None:
+            metadata["summary"] = entry.summary
+            metadata["importance"] = entry.importance
+        return metadata
+
+    def _score(self, similarity: float, entry_date: datetime, metadata: dict) -> float:
+        """Final score: similarity plus recency and importance bonuses."""
+        recency_score = self._calculate_recency_score(entry_date)
+        importance = metadata.get("importance", 0.5)
+        return (
+            similarity
+            + self.recency_weight * recency_score
+            + self.importance_weight * importance
         )
 
-        return entry_id
+    def replace_entry(self, entry_id: str, entry: LogEntry):
+        """Overwrite a stored entry's text, embedding and metadata, keeping its ID."""
+        self._write_entries(
+            [(entry_id, entry.raw_text or "", self._entry_metadata(entry))]
+        )
 
     def update_entry(self, entry_id: str, new_text: str) -> bool:
         """Update an existing entry with new text."""
         try:
-            # Generate new embedding
-            new_embedding = self._generate_embedding(new_text)
-
             # Get current metadata (we need to preserve the date)
             current_data = self.collection.get(ids=[entry_id])
 
@@ -128,13 +349,8 @@ class MemoryManager:
 
             metadata = current_data["metadatas"][0]
 
-            # Update the entry
-            self.collection.update(
-                ids=[entry_id],
-                embeddings=[new_embedding],
-                documents=[new_text],
-                metadatas=[metadata],
-            )
+            # Update the entry and re-chunk it
+            self._write_entries([(entry_id, new_text, metadata)])
 
             return True
         except Exception as e:
@@ -170,11 +386,53 @@ class MemoryManager:
 
             # Delete the entry
             self.collection.delete(ids=[entry_id])
+            self.chunks.delete(where={"parent_id": entry_id})
             return True
         except Exception as e:
             print(f"Error deleting entry {entry_id}: {e}")
             return False
 
+    def delete_entries(self, entry_ids: List[str]):
+        """Delete several entries by ID; unknown IDs are ignored."""
+        if entry_ids:
+            self.collection.delete(ids=list(entry_ids))
+            self.chunks.delete(where={"parent_id": {"$in": list(entry_ids)}})
+
+    def delete_page_entries(self, page_id: str):
+        """Delete every entry stored from a Notion page."""
+        self.collection.delete(where={"page_id": page_id})
+        self.chunks.delete(where={"page_id": page_id})
+
+    def page_records(self, page_id: str) -> Dict[str, Dict]:
+        """Stored entries of a page as ``{entry_key: {"hash", "entry_id"}}``.
+
+        These are the records ``diff_entries`` compares against; entries
+        stored before content hashes were recorded have no hash and so
+        compare as changed.
+        """
+        stored = self.collection.get(where={"page_id": page_id}, include=["metadatas"])
+        records = {}
+        for stored_id, metadata in zip(stored["ids"], stored["metadatas"]):
+            key = (metadata or {}).get("entry_key") or stored_id
+            records[key] = {
+                "hash": (metadata or {}).get("content_hash"),
+                "entry_id": stored_id,
+            }
+        return records
+
+    def get_entry_ids(self) -> List[str]:
+        """Ids of every stored entry."""
+        return self.collection.get(include=[])["ids"]
+
+    def get_page_ids(self) -> Set[str]:
+        """Ids of every Notion page that has stored entries."""
+        stored = self.collection.get(include=["metadatas"])
+        return {
+            metadata["page_id"]
+            for metadata in stored["metadatas"]
+            if metadata and metadata.get("page_id")
+        }
+
     def get_all_entries(self, limit: int = 100) -> List[LogEntry]:
         """Get all entries in the collection, up to a limit."""
         try:
@@ -196,6 +454,8 @@ class MemoryManager:
                     date=date,
                     blocks=[],  # We don't store blocks in Chroma
                     raw_text=raw_text,
+                    summary=metadata.get("summary"),
+                    importance=metadata.get("importance", 0.5),
                 )
                 entries.append(entry)
 
@@ -206,11 +466,81 @@ class MemoryManager:
             print(f"Error retrieving entries: {e}")
             return []
 
-    def search(self, query: str, top_k: int = 5) -> List[SearchResult]:
-        """Search for entries using query and apply recency bias."""
+    def search(
+        self, query: str, top_k: int = 5, chunks_per_entry: int = 2
+    ) -> List[SearchResult]:
+        """Search for entries using query and apply recency bias.
+
+        Chunks are searched and merged back into their entries: an entry
+        scores by its best chunk, and up to ``chunks_per_entry`` of its
+        matching chunks come back on the result (``SearchResult.chunks``).
+        """
         # Generate query embedding
         query_embedding = self._generate_embedding(query)
 
+        chunk_count = self.chunks.count()
+        if not chunk_count:
+            # Entries stored before chunking have no chunks to search
+            return self._search_entries(query_embedding, top_k)
+
+        # Several chunks of one entry can match, so look past top_k chunks
+        results = self.chunks.query(
+            query_embeddings=[query_embedding],
+            n_results=min(chunk_count, top_k * 4),
+        )
+
+        # Matching chunks per entry, best first; entries in order of best chunk
+        hits: Dict[str, List[Tuple[float, int, str]]] = {}
+        for i in range(len(results["ids"][0])):
+            metadata = results["metadatas"][0][i]
+            hits.setdefault(metadata["parent_id"], []).append(
+                (
+                    results["distances"][0][i],
+                    metadata.get("chunk", 0),
+                    results["documents"][0][i],
+                )
+            )
+        parent_ids = list(hits)[:top_k]
+        if not parent_ids:
+            return []
+        parents = self.collection.get(ids=parent_ids)
+
+        search_results = []
+        for entry_id, raw_text, metadata in zip(
+            parents["ids"], parents["documents"], parents["metadatas"]
+        ):
+            matched = hits[entry_id][:chunks_per_entry]
+
+            # Normalize the best chunk's cosine distance to a 0-1 similarity
+            entry_date = datetime.fromisoformat(metadata["date"])
+            normalized_similarity = 1 - (matched[0][0] / 2)
+            final_score = self._score(normalized_similarity, entry_date, metadata)
+
+            search_results.append(
+                SearchResult(
+                    entry=LogEntry(
+                        date=entry_date,
+                        blocks=[],  # We don't store blocks in Chroma
+                        raw_text=raw_text,
+                        id=entry_id,
+                        summary=metadata.get("summary"),
+                        importance=metadata.get("importance", 0.5),
+                    ),
+                    similarity_score=normalized_similarity,
+                    final_score=final_score,
+                    # Matching chunks in reading order
+                    chunks=[text for _, _, text in sorted(matched, key=lambda m: m[1])],
+                )
+            )
+
+        # Sort by final score
+        search_results.sort(key=lambda x: x.final_score, reverse=True)
+        return search_results
+
+    def _search_entries(
+        self, query_embedding: List[float], top_k: int
+    ) -> List[SearchResult]:
+        """Search whole entries (used while no chunks are stored)."""
         # Search in Chroma
         results = self.collection.query(
             query_embeddings=[query_embedding], n_results=top_k
@@ -223,15 +553,13 @@ class MemoryManager:
             similarity_score = results["distances"][0][i]
             metadata = results["metadatas"][0][i]
 
-            # Calculate recency score
             entry_date = datetime.fromisoformat(metadata["date"])
-            recency_score = self._calculate_recency_score(entry_date)
 
             # Calculate final score (normalize similarity score to 0-1 range)
             normalized_similarity = 1 - (
                 similarity_score / 2
             )  # Convert L2 distance to similarity
-            final_score = normalized_similarity + self.recency_weight * recency_score
+            final_score = self._score(normalized_similarity, entry_date, metadata)
 
             # Create search result
             search_results.append(
@@ -241,6 +569,8 @@ class MemoryManager:
                         blocks=[],  # We don't store blocks in Chroma
                         raw_text=results["documents"][0][i],
                         id=entry_id,  # Include the entry ID
+                        summary=metadata.get("summary"),
+                        importance=metadata.get("importance", 0.5),
                     ),
                     similarity_score=normalized_similarity,
                     final_score=final_score,
@@ -11,6 +11,7 @@ class LogEntry(BaseModel):
     summary: Optional[str] = None
     importance: float = 0.5  # Default importance score
     id: Optional[str] = None  # Add ID field
+    page_id: Optional[str] = None  # Notion page the entry was read from
 
 
 class MemoryEntry(BaseModel):
@@ -23,3 +24,4 @@ class SearchResult(BaseModel):
     entry: LogEntry
     similarity_score: float
     final_score: float  # After applying recency bias
+    chunks: List[str] = []  # Matching chunks of the entry, in reading order
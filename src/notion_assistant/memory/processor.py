@@ -1,20 +1,48 @@
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+import os
 import re
 from notion_assistant.api.models import NotionBlock, PageContent
 from notion_assistant.memory.models import LogEntry
 
+# A top-level block as sent to worker processes: its type and its text, or
+# None when it has no rich text. Far cheaper to pickle than NotionBlock.
+BlockRow = Tuple[str, Optional[str]]
+# An entry found in a page: blocks[start:end], its date and raw text
+EntrySpan = Tuple[int, int, datetime, str]
+
+HEADING_TYPES = ("heading_1", "heading_2", "heading_3")
+
+
+def _block_row(block: NotionBlock) -> BlockRow:
+    rich_text = block.content.rich_text
+    return block.type, "".join(rt.plain_text for rt in rich_text) if rich_text else None
+
+
+def _page_spans(
+    processor: "LogEntryProcessor", rows: List[BlockRow]
+) -> List[EntrySpan]:
+    # Module level so worker processes can unpickle it
+    return processor._entry_spans(rows)
+
 
 class LogEntryProcessor:
     def __init__(self):
         # Regex patterns for date headings
+        # Full dates come first so "2024-03-28" is not read as "24-03"
         self.date_patterns = [
+            r"(\d{4}-\d{2}-\d{2})",  # 2024-03-28
             r"(\d{1,2}/\d{1,2})",  # 3/28
             r"(\d{1,2}-\d{1,2})",  # 3-28
-            r"(\d{4}-\d{2}-\d{2})",  # 2024-03-28
             r"(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})",  # 28 Mar 2024
         ]
 
+        # Block types whose children never become part of a log entry: child
+        # pages and databases are ingested as pages of their own
+        self.skip_block_types = ("child_page", "child_database")
+
         # Month mapping for text dates
         self.month_map = {
             "jan": 1,
@@ -33,7 +61,7 @@ class LogEntryProcessor:
 
     def _is_date_heading(self, block: NotionBlock) -> bool:
         """Check if a block is a date heading."""
-        if block.type not in ["heading_1", "heading_2", "heading_3"]:
+        if block.type not in HEADING_TYPES:
             return False
 
         text = "".join(rt.plain_text for rt in block.content.rich_text)
@@ -75,22 +103,23 @@ class LogEntryProcessor:
                 )
         return "\n".join(text_parts)
 
-    def process_page(self, page_content: PageContent) -> List[LogEntry]:
-        """Process a page's blocks into log entries."""
-        entries = []
+    def process_stream(self, blocks: Iterable[NotionBlock]) -> Iterator[LogEntry]:
+        """Turn a stream of top-level blocks into log entries.
+
+        Each entry is yielded as soon as the next date heading (or the end of
+        the stream) closes it, so only one entry's blocks are held at a time.
+        """
         current_blocks = []
         current_date = None
 
-        for block in page_content.blocks:
+        for block in blocks:
             if self._is_date_heading(block):
-                # Save previous entry if exists
+                # Emit previous entry if exists
                 if current_blocks and current_date:
-                    entries.append(
-                        LogEntry(
-                            date=current_date,
-                            blocks=current_blocks,
-                            raw_text=self._get_raw_text(current_blocks),
-                        )
+                    yield LogEntry(
+                        date=current_date,
+                        blocks=current_blocks,
+                        raw_text=self._get_raw_text(current_blocks),
                     )
 
                 # Start new entry
@@ -100,14 +129,76 @@ class LogEntryProcessor:
             elif current_date:
                 current_blocks.append(block)
 
-        # Add final entry
+        # Emit final entry
         if current_blocks and current_date:
-            entries.append(
-                LogEntry(
-                    date=current_date,
-                    blocks=current_blocks,
-                    raw_text=self._get_raw_text(current_blocks),
-                )
+            yield LogEntry(
+                date=current_date,
+                blocks=current_blocks,
+                raw_text=self._get_raw_text(current_blocks),
             )
 
-        return entries
+    def process_page(self, page_content: PageContent) -> List[LogEntry]:
+        """Process a page's blocks into log entries."""
+        return list(self.process_stream(page_content.blocks))
+
+    def _entry_spans(self, rows: List[BlockRow]) -> List[EntrySpan]:
+        """Find the entries in a page's block rows, as ``process_stream`` does."""
+        spans = []
+        start = None
+        current_date = None
+        for i, (block_type, text) in enumerate(rows):
+            if block_type in HEADING_TYPES and any(
+                re.search(pattern, text or "") for pattern in self.date_patterns
+            ):
+                if current_date:
+                    spans.append((start, i, current_date, self._join(rows, start, i)))
+                start = i
+                current_date = self._parse_date(text)
+        if current_date:
+            spans.append(
+                (start, len(rows), current_date, self._join(rows, start, len(rows)))
+            )
+        return spans
+
+    def _join(self, rows: List[BlockRow], start: int, end: int) -> str:
+        return "\n".join(text for _, text in rows[start:end] if text is not None)
+
+    def process_pages(
+        self,
+        pages: Sequence[PageContent],
+        workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+    ) -> List[List[LogEntry]]:
+        """Process many pages, fanned out over a pool of worker processes.
+
+        Returns one list of entries per page, in the order of ``pages`` (the
+        same entries ``process_page`` produces). Workers only receive each
+        block's type and text and send back where each entry starts and ends,
+        so little crosses process boundaries; the entries are assembled here.
+        Pages are dispatched ``chunksize`` at a time; small batches, or a
+        single worker, are processed in this process.
+
+        Args:
+            pages: Pages to process.
+            workers: Worker processes (defaults to the CPU count).
+            chunksize: Pages per dispatched task (defaults to about four
+                tasks per worker).
+        """
+        workers = workers or os.cpu_count() or 1
+        chunksize = chunksize or max(1, len(pages) // (workers * 4))
+        if workers == 1 or len(pages) <= chunksize:
+            return [self.process_page(page) for page in pages]
+
+        rows = ([_block_row(block) for block in page.blocks] for page in pages)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            page_spans = list(
+                executor.map(partial(_page_spans, self), rows, chunksize=chunksize)
+            )
+
+        return [
+            [
+                LogEntry(date=date, blocks=page.blocks[start:end], raw_text=raw_text)
+                for start, end, date, raw_text in spans
+            ]
+            for page, spans in zip(pages, page_spans)
+        ]
@@ -0,0 +1,238 @@
+from typing import Callable, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import os
+import queue
+import threading
+import time
+from notion_assistant.api.client import NotionClient, NotionClientOwner, NotionPage
+from .enrich import EntryEnricher
+from .manager import MemoryManager
+from .models import LogEntry
+from .processor import LogEntryProcessor
+from .selector import PageSelector, normalize_id
+from .sync import STATE_FILENAME
+
+
+@dataclass
+class RebuildStats:
+    pages: int = 0  # pages and database rows processed
+    databases: int = 0
+    entries: int = 0
+    embedded: int = 0  # entries that were new or changed
+    deleted: int = 0  # stored entries no longer produced by any page
+    skipped: int = 0  # pages and databases left out by the selector
+    failed: int = 0  # pages and databases that could not be fetched
+    seconds: float = 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+    @property
+    def entries_per_second(self) -> float:
+        return self.entries / self.seconds if self.seconds else 0.0
+
+
+class _Cancelled(Exception):
+    """The rebuild stopped while a worker was waiting to hand over entries."""
+
+
+class RebuildPipeline(NotionClientOwner):
+    """Rebuild the memory collection from every shared page and database.
+
+    Pages, and the rows of each database, are fetched concurrently on a pool
+    of ``page_workers`` threads (each page's block tree is in turn walked on
+    the client's own pool). Blocks are streamed into log entries as they
+    arrive (see ``iter_page_blocks`` and ``process_stream``), enriched with
+    summaries and importance if an ``enricher`` is given, and handed over
+    ``batch_size`` at a time through a bounded queue. They are stored from
+    the calling thread, so the embedding model and Chroma are only used from
+    one thread, and embedding starts before long pages are fully fetched.
+    Entries are stored ``batch_size`` at a time across pages, so embedding
+    and Chroma writes run in bulk even when pages are short.
+    """
+
+    def __init__(
+        self,
+        client: Optional[NotionClient] = None,
+        processor: Optional[LogEntryProcessor] = None,
+        memory_manager: Optional[MemoryManager] = None,
+        selector: Optional[PageSelector] = None,
+        page_workers: int = 4,
+        enricher: Optional[EntryEnricher] = None,
+        batch_size: int = 64,
+    ):
+        self._init_client(client)
+        self.processor = processor or LogEntryProcessor()
+        self.memory_manager = memory_manager or MemoryManager()
+        self.selector = selector or PageSelector.from_env()
+        self.page_workers = max(1, page_workers)
+        self.enricher = enricher
+        self.batch_size = max(1, batch_size)
+
+    def _page_rows(self, page: NotionPage) -> Iterator[Tuple[str, str]]:
+        yield page.id, page.title
+
+    def _database_rows(self, database: NotionPage) -> Iterator[Tuple[str, str]]:
+        # Row blocks are streamed like any other page's
+        for row in self.client.query_database(database.id, include_blocks=False):
+            yield row.id, row.title
+
+    def _work(self, stats: RebuildStats) -> Iterator[Tuple[Callable, NotionPage]]:
+        """Yield a row source for every selected database and page."""
+        rebuilt, excluded = set(), set()
+        for database in self.client.iter_shared_databases():
+            if self.selector.selects(database):
+                rebuilt.add(normalize_id(database.id))
+                yield self._database_rows, database
+            else:
+                excluded.add(normalize_id(database.id))
+                stats.skipped += 1
+
+        # Rows of a database also show up as pages in search results; they
+        # are rebuilt with their database, and left out with it
+        for page in self.client.iter_shared_pages():
+            parent_id = normalize_id(page.parent_id or "")
+            if parent_id in rebuilt:
+                continue
+            if parent_id in excluded or not self.selector.selects(page):
+                stats.skipped += 1
+            else:
+                yield self._page_rows, page
+
+    def _produce(
+        self,
+        rows: Callable,
+        page: NotionPage,
+        results: queue.Queue,
+        cancelled: threading.Event,
+    ):
+        """Stream the entries of a page or database into ``results``.
+
+        Puts ``("entries", page, entries)`` per batch, ``("page", page,
+        (title, count))`` after each page or row, then ``("done", page,
+        None)``, or ``("failed", page, error)`` if fetching failed.
+        """
+
+        def put(item):
+            while True:
+                try:
+                    results.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    if cancelled.is_set():
+                        raise _Cancelled()
+
+        def emit(entries):
+            if self.enricher:
+                self.enricher.enrich(entries)
+            put(("entries", page, entries))
+
+        try:
+            for row_id, title in rows(page):
+                blocks = self.client.iter_page_blocks(
+                    row_id, skip_types=self.processor.skip_block_types
+                )
+                count, batch = 0, []
+                for entry in self.processor.process_stream(blocks):
+                    entry.page_id = row_id
+                    batch.append(entry)
+                    if len(batch) >= self.batch_size:
+                        emit(batch)
+                        count, batch = count + len(batch), []
+                if batch:
+                    emit(batch)
+                    count += len(batch)
+                put(("page", page, (title, count)))
+            put(("done", page, None))
+        except _Cancelled:
+            return
+        except Exception as e:
+            put(("failed", page, e))
+
+    def run(self, on_page: Optional[Callable[[str, int], None]] = None) -> RebuildStats:
+        """Store entries from every selected page and drop all others.
+
+        Entries have deterministic ids, so the collection is updated in
+        place: unchanged entries are not embedded again, and stored entries
+        that no page produced are deleted afterwards (unless a fetch failed,
+        in which case they are kept). ``on_page`` is called with the title
+        and entry count of each page once its entries are stored.
+        """
+        stored_ids = set(self.memory_manager.get_entry_ids())
+        seen_ids = set()
+        # Without its state, incremental sync diffs against the content
+        # hashes stored in Chroma, which the rebuild keeps current
+        state_path = os.path.join(self.memory_manager.data_dir, STATE_FILENAME)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
+        stats = RebuildStats()
+        start = time.perf_counter()
+        buffered: List[LogEntry] = []
+        finished: List[Tuple[str, int]] = []  # pages whose entries are buffered
+
+        def flush():
+            stats.embedded += self.memory_manager.upsert_entries(
+                buffered, batch_size=self.batch_size
+            )
+            seen_ids.update(entry.id for entry in buffered)
+            if on_page:
+                for title, count in finished:
+                    on_page(title, count)
+            buffered.clear()
+            finished.clear()
+
+        # Bounded, so workers wait rather than pile up entries while the
+        # calling thread embeds
+        results = queue.Queue(maxsize=2 * self.page_workers)
+        cancelled = threading.Event()
+        with ThreadPoolExecutor(
+            max_workers=self.page_workers, thread_name_prefix="notion-rebuild"
+        ) as executor:
+            try:
+                work = self._work(stats)
+                in_flight = 0
+                exhausted = False
+                while True:
+                    while not exhausted and in_flight < 2 * self.page_workers:
+                        try:
+                            rows, page = next(work)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        executor.submit(self._produce, rows, page, results, cancelled)
+                        in_flight += 1
+                    if not in_flight:
+                        break
+
+                    kind, page, payload = results.get()
+                    if kind == "entries":
+                        buffered.extend(payload)
+                        stats.entries += len(payload)
+                    elif kind == "page":
+                        finished.append(payload)
+                        stats.pages += 1
+                    elif kind == "done":
+                        in_flight -= 1
+                        if page.type == "database":
+                            stats.databases += 1
+                    else:
+                        in_flight -= 1
+                        print(f"Error fetching {page.type} {page.title}: {payload}")
+                        stats.failed += 1
+                    if len(buffered) >= self.batch_size:
+                        flush()
+            finally:
+                # Let waiting workers give up if storing failed
+                cancelled.set()
+        flush()
+
+        if not stats.failed:
+            stale = stored_ids - seen_ids
+            self.memory_manager.delete_entries(list(stale))
+            stats.deleted = len(stale)
+
+        stats.seconds = time.perf_counter() - start
+        return stats
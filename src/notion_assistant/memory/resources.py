@@ -0,0 +1,310 @@
+"""
+Expensive objects shared by every ``MemoryManager``: embedding models, Chroma
+clients and embedding caches.
+
+A model name such as ``all-MiniLM-L6-v2`` is resolved through the Hugging
+Face hub, which on hosts without network access means timeouts before the
+first search. Stage the model once into the data directory (on a host with
+network access, or copy the directory over) and it is loaded from disk:
+
+    python -m notion_assistant.memory.resources stage [--model all-MiniLM-L6-v2]
+    python -m notion_assistant.memory.resources check
+
+``check`` loads the staged model in strict offline mode and reports how long
+that took. Pass ``--backend onnx-int8`` to both to export and use the
+quantized ONNX model (see ``embedders``) instead.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass
+import argparse
+import hashlib
+import os
+import shutil
+import threading
+import time
+import chromadb
+from sentence_transformers import SentenceTransformer
+from .embedders import BACKENDS, DEFAULT_BACKEND, Embedder, OnnxEmbedder
+from .embedding_cache import EmbeddingCache
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_DATA_DIR = "~/notion_assistant_data"
+
+# Staged models live in <data_dir>/models/<model name>
+MODELS_DIRNAME = "models"
+
+
+@dataclass
+class ModelLoad:
+    """Where an embedding model was loaded from, and how long it took."""
+
+    model_name: str
+    source: str  # "path", "staged" or "hub"
+    location: str
+    seconds: float
+    backend: str = DEFAULT_BACKEND
+
+
+def env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+def staged_model_path(data_dir: str, model_name: str) -> str:
+    """Where ``model_name`` is staged in ``data_dir``."""
+    return os.path.join(
+        os.path.expanduser(data_dir), MODELS_DIRNAME, model_name.replace("/", "__")
+    )
+
+
+def _is_model_dir(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, "modules.json"))
+
+
+def model_key(model_name: str, model_path: Optional[str] = None) -> str:
+    """Name that tells apart models loaded from different places.
+
+    Hub and staged copies of a model share its name. A model loaded from a
+    local directory is named after the directory and a hash of its path, so
+    two directories holding different weights never share exports or cached
+    embeddings.
+    """
+    if not model_path and _is_model_dir(model_name):
+        model_path = model_name
+    if not model_path:
+        return model_name
+    path = os.path.realpath(os.path.expanduser(model_path))
+    digest = hashlib.sha1(path.encode()).hexdigest()[:12]
+    return f"{os.path.basename(path)}-{digest}"
+
+
+def exported_model_path(
+    data_dir: Optional[str],
+    model_name: str,
+    backend: str,
+    model_path: Optional[str] = None,
+) -> str:
+    """Where the model is kept once exported for ``backend``."""
+    staged = staged_model_path(
+        data_dir or DEFAULT_DATA_DIR, model_key(model_name, model_path)
+    )
+    return f"{staged}.{backend}"
+
+
+def resolve_model(
+    model_name: str,
+    data_dir: Optional[str] = None,
+    model_path: Optional[str] = None,
+    offline: bool = False,
+) -> Tuple[str, str]:
+    """Find a model: an explicit local path, a staged copy, then the hub.
+
+    Returns ``(source, location)``. In offline mode a model that is not on
+    disk raises ``FileNotFoundError`` instead of reaching for the hub.
+    """
+    if model_path:
+        model_path = os.path.expanduser(model_path)
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(f"Embedding model path {model_path} not found")
+        return "path", model_path
+    if _is_model_dir(model_name):
+        return "path", model_name
+    if data_dir:
+        staged = staged_model_path(data_dir, model_name)
+        if _is_model_dir(staged):
+            return "staged", staged
+    if offline:
+        raise FileNotFoundError(
+            f"Embedding model {model_name} is not staged in "
+            f"{os.path.expanduser(data_dir or DEFAULT_DATA_DIR)}; run "
+            "`python -m notion_assistant.memory.resources stage` where the "
+            "hub is reachable, or set EMBEDDING_MODEL_PATH"
+        )
+    return "hub", model_name
+
+
+class ResourceRegistry:
+    """Expensive objects shared by every ``MemoryManager`` in the process.
+
+    Embedding models are loaded lazily, once per location and backend, on
+    first use. Models for another backend than ``torch`` are exported from
+    the torch model the first time, into the data directory.
+    Chroma clients and embedding caches are opened once per data directory.
+    The first menu action pays for loading; later ones reuse what is loaded.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # One per model, held while it loads so other resources stay available
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._models: Dict[str, Embedder] = {}
+        self._clients: Dict[str, Any] = {}
+        self._caches: Dict[Tuple[str, str], EmbeddingCache] = {}
+        self.loads: Dict[str, ModelLoad] = {}  # keyed like _models
+
+    def locate(
+        self,
+        model_name: str,
+        data_dir: Optional[str] = None,
+        model_path: Optional[str] = None,
+        offline: bool = False,
+        backend: str = DEFAULT_BACKEND,
+    ) -> Tuple[str, str, str]:
+        """``(key, source, location)`` of a model for ``backend``."""
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend {backend}")
+        if backend != DEFAULT_BACKEND:
+            exported = exported_model_path(data_dir, model_name, backend, model_path)
+            if OnnxEmbedder.exists(exported):
+                return exported, "staged", exported
+            # Not exported yet: the torch model is loaded to export it
+            source, location = resolve_model(model_name, data_dir, model_path, offline)
+            return exported, source, location
+        source, location = resolve_model(model_name, data_dir, model_path, offline)
+        return location, source, location
+
+    def model(
+        self,
+        model_name: str,
+        data_dir: Optional[str] = None,
+        model_path: Optional[str] = None,
+        offline: bool = False,
+        backend: str = DEFAULT_BACKEND,
+    ) -> Embedder:
+        """The embedding model, loaded on first call (see ``resolve_model``)."""
+        key, source, location = self.locate(
+            model_name, data_dir, model_path, offline, backend
+        )
+        with self._lock:
+            if key in self._models:
+                return self._models[key]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            with self._lock:
+                if key in self._models:  # loaded while we waited
+                    return self._models[key]
+            start = time.perf_counter()
+            if backend == DEFAULT_BACKEND:
+                # Models on disk never need the hub
+                model = SentenceTransformer(location, local_files_only=source != "hub")
+            elif location == key:
+                model = OnnxEmbedder(location)
+            else:
+                torch_model = self.model(
+                    model_name, data_dir, model_path, offline, DEFAULT_BACKEND
+                )
+                model = OnnxEmbedder.export(torch_model, key)
+            with self._lock:
+                self._models[key] = model
+                self.loads[key] = ModelLoad(
+                    model_name, source, location, time.perf_counter() - start, backend
+                )
+            return model
+
+    def model_load(self, model_name: str, **where) -> Optional[ModelLoad]:
+        """How the model was loaded, or None if it isn't loaded (yet)."""
+        try:
+            key, _, _ = self.locate(model_name, **where)
+        except FileNotFoundError:
+            return None
+        return self.loads.get(key)
+
+    def preload(self, model_name: str, **where) -> threading.Thread:
+        """Start loading a model in the background; ``model`` waits for it."""
+
+        def load():
+            try:
+                self.model(model_name, **where)
+            except Exception as e:
+                # Reported again by whichever action needs the model
+                print(f"\nError loading embedding model: {e}")
+
+        thread = threading.Thread(target=load, daemon=True, name="model-preload")
+        thread.start()
+        return thread
+
+    def chroma_client(self, data_dir: str):
+        """The persistent Chroma client of a data directory."""
+        key = os.path.realpath(data_dir)
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = chromadb.PersistentClient(path=data_dir)
+            return self._clients[key]
+
+    def embedding_cache(self, path: Optional[str], model_name: str) -> EmbeddingCache:
+        """The embedding cache stored at ``path`` (memory-only when None)."""
+        if path is None:
+            return EmbeddingCache(None, model_name)
+        key = (os.path.realpath(path), model_name)
+        with self._lock:
+            if key not in self._caches:
+                self._caches[key] = EmbeddingCache(path, model_name)
+            return self._caches[key]
+
+    def clear(self):
+        """Drop every shared resource (closing the embedding caches)."""
+        with self._lock:
+            for cache in self._caches.values():
+                cache.close()
+            self._models.clear()
+            self._load_locks.clear()
+            self._clients.clear()
+            self._caches.clear()
+            self.loads.clear()
+
+
+# The registry MemoryManagers use unless given their own
+registry = ResourceRegistry()
+
+
+def stage_model(
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    data_dir: str = DEFAULT_DATA_DIR,
+    backend: str = DEFAULT_BACKEND,
+) -> str:
+    """Save ``model_name`` into ``data_dir`` so it loads without the hub.
+
+    Does nothing if the model is already staged. Returns the staged path.
+    """
+    path = staged_model_path(data_dir, model_name)
+    if not _is_model_dir(path):
+        # Save next to the target and rename, so a failed save isn't picked up
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        SentenceTransformer(model_name).save(tmp_path)
+        os.replace(tmp_path, path)
+    if backend == DEFAULT_BACKEND:
+        return path
+    registry.model(model_name, data_dir=data_dir, backend=backend)
+    return exported_model_path(data_dir, model_name, backend)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("command", choices=["stage", "check"])
+    parser.add_argument("--model", default=DEFAULT_EMBEDDING_MODEL)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND)
+    args = parser.parse_args()
+    where = {"data_dir": args.data_dir, "offline": True, "backend": args.backend}
+
+    if args.command == "stage":
+        start = time.perf_counter()
+        path = stage_model(args.model, args.data_dir, args.backend)
+        print(f"Staged {args.model} in {path} ({time.perf_counter() - start:.1f}s)")
+    else:
+        try:
+            registry.model(args.model, **where)
+        except FileNotFoundError as e:
+            raise SystemExit(str(e))
+        load = registry.model_load(args.model, **where)
+        print(
+            f"Loaded {args.model} offline from {load.location} "
+            f"in {load.seconds:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
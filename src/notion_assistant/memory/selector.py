@@ -0,0 +1,59 @@
+from typing import Iterable, List, Optional
+from dotenv import load_dotenv
+import os
+from notion_assistant.api.client import NotionPage
+
+
+def normalize_id(notion_id: str) -> str:
+    return notion_id.replace("-", "").lower()
+
+
+def parse_page_list(value: Optional[str]) -> List[str]:
+    """Split a comma-separated list of page ids or titles (e.g. from .env)."""
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+class PageSelector:
+    """Include/exclude rules for pages and databases, by id or title.
+
+    Ids match with or without dashes and titles match case-insensitively.
+    With an include list only the listed pages are selected; the exclude list
+    always wins. Database rows are selected with their database.
+    """
+
+    def __init__(
+        self,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+    ):
+        self.include = {self._key(item) for item in include or []}
+        self.exclude = {self._key(item) for item in exclude or []}
+
+    @classmethod
+    def from_env(cls) -> "PageSelector":
+        """Rules from NOTION_REBUILD_INCLUDE and NOTION_REBUILD_EXCLUDE (or .env)."""
+        load_dotenv()
+        return cls(
+            include=parse_page_list(os.getenv("NOTION_REBUILD_INCLUDE")),
+            exclude=parse_page_list(os.getenv("NOTION_REBUILD_EXCLUDE")),
+        )
+
+    @property
+    def active(self) -> bool:
+        """Whether any page can be left out."""
+        return bool(self.include or self.exclude)
+
+    def _key(self, value: str) -> str:
+        return value.strip().lower()
+
+    def _keys(self, page: NotionPage) -> set:
+        return {self._key(page.title), self._key(page.id), normalize_id(page.id)}
+
+    def selects(self, page: NotionPage, database: Optional[NotionPage] = None) -> bool:
+        """Whether ``page`` is selected; a row of ``database`` goes with it."""
+        if database is not None:
+            return self.selects(database)
+        keys = self._keys(page)
+        if keys & self.exclude:
+            return False
+        return not self.include or bool(keys & self.include)
@@ -0,0 +1,301 @@
+from typing import Dict, Optional, Set
+from dataclasses import dataclass
+import json
+import os
+from notion_assistant.api.client import (
+    NotionClient,
+    NotionClientOwner,
+    NotionPage,
+    edited_since_filter,
+)
+from .diff import diff_entries
+from .enrich import EntryEnricher
+from .manager import MemoryManager
+from .processor import LogEntryProcessor
+from .selector import PageSelector, normalize_id
+
+STATE_FILENAME = "sync_state.json"
+
+
+class SyncState:
+    """Per-page sync bookkeeping persisted as JSON in the data directory.
+
+    For every page it records the page's ``last_edited_time`` and, for each
+    log entry stored from it, the entry's content hash and Chroma id.
+    Entries are keyed by the id of their date-heading block. For every
+    database it records the latest ``last_edited_time`` of its synced rows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pages: Dict[str, Dict] = {}
+        self.databases: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                data = json.load(f)
+            self.pages = data.get("pages", {})
+            self.databases = data.get("databases", {})
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"pages": self.pages, "databases": self.databases}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class SyncStats:
+    pages_seen: int = 0
+    pages_skipped: int = 0
+    pages_deleted: int = 0
+    pages_excluded: int = 0  # left out by the selector
+    entries_added: int = 0
+    entries_updated: int = 0
+    entries_unchanged: int = 0
+    entries_deleted: int = 0
+
+
+class IncrementalSync(NotionClientOwner):
+    """Bring the memory collection up to date with only the changes in Notion.
+
+    Pages whose ``last_edited_time`` matches the previous run are skipped
+    without fetching their blocks, and only database rows edited since the
+    previous run are requested from Notion. Changed pages are diffed entry
+    by entry against the last ingest (see ``diff_entries``): only new
+    entries and entries whose content hash changed are embedded, changed
+    entries are updated in place, entries that disappeared are removed, and
+    pages no longer shared with the integration, or no longer selected by
+    the ``selector`` (by default the rebuild's include/exclude lists), are
+    dropped. With an ``enricher``, new and changed entries get an LLM
+    summary and importance first.
+    """
+
+    def __init__(
+        self,
+        client: Optional[NotionClient] = None,
+        processor: Optional[LogEntryProcessor] = None,
+        memory_manager: Optional[MemoryManager] = None,
+        state_path: Optional[str] = None,
+        enricher: Optional[EntryEnricher] = None,
+        selector: Optional[PageSelector] = None,
+    ):
+        self._init_client(client)
+        self.processor = processor or LogEntryProcessor()
+        self.memory_manager = memory_manager or MemoryManager()
+        self.state_path = state_path or os.path.join(
+            self.memory_manager.data_dir, STATE_FILENAME
+        )
+        self.enricher = enricher
+        self.selector = selector or PageSelector.from_env()
+        self._databases: Optional[Dict[str, NotionPage]] = None
+
+    def _list_databases(self):
+        self._databases = {
+            normalize_id(database.id): database
+            for database in self.client.iter_shared_databases()
+        }
+
+    def _selects(self, page: NotionPage) -> bool:
+        """Apply the selector, judging database rows by their database."""
+        if not self.selector.active:
+            return True
+        database = None
+        if page.parent_id:
+            if self._databases is None:
+                self._list_databases()
+            database = self._databases.get(normalize_id(page.parent_id))
+        return self.selector.selects(page, database)
+
+    def sync_page(
+        self,
+        page_id: str,
+        state: SyncState,
+        stats: SyncStats,
+        page: Optional[NotionPage] = None,
+    ) -> bool:
+        """Re-process one page and apply the entry diff to the collection.
+
+        Pages in the trash, and pages the selector leaves out, have their
+        entries removed instead.
+        ``page`` saves looking the page up when the caller already has it.
+        Returns False if the page could not be fetched (its state is kept).
+        """
+        if self.selector.active:
+            if page is None:
+                page = self.client.get_page(page_id)
+                if page is None:
+                    return False
+                if page.parent_id and normalize_id(page.parent_id) not in (
+                    self._databases or {}
+                ):
+                    self._databases = None  # maybe shared since they were listed
+            if not self._selects(page):
+                stats.pages_excluded += 1
+                self._drop_page(page_id, state, stats)
+                return True
+        if page is not None and page.archived:
+            self._drop_page(page_id, state, stats)
+            return True
+
+        # The whole tree is fetched again: an edit bumps the last_edited_time
+        # of the block and the page but not of the blocks above it, so an
+        # unchanged block can still have changed children
+        content = self.client.get_page_content(
+            page_id, skip_types=self.processor.skip_block_types
+        )
+        if content is None:
+            return False
+        if content.archived:
+            self._drop_page(page_id, state, stats)
+            return True
+
+        record = state.pages.get(page_id)
+        if record is None:
+            # Entries stored outside of sync (e.g. by a rebuild) carry their
+            # content hashes in Chroma, so unchanged ones are kept as they are
+            previous = self.memory_manager.page_records(page_id)
+        else:
+            previous = record.get("entries", {})
+
+        entries = self.processor.process_page(content)
+        for entry in entries:
+            entry.page_id = page_id
+        diff = diff_entries(previous, entries)
+        if self.enricher:
+            # Unchanged entries were enriched when they were stored
+            self.enricher.enrich(
+                [entry for _, _, entry in diff.added]
+                + [entry for _, _, entry, _ in diff.updated]
+            )
+
+        current = dict(diff.unchanged)
+        for key, content_hash, entry in diff.added:
+            entry_id = self.memory_manager.store_entry(entry)
+            current[key] = {"hash": content_hash, "entry_id": entry_id}
+        for key, content_hash, entry, entry_id in diff.updated:
+            self.memory_manager.replace_entry(entry_id, entry)
+            current[key] = {"hash": content_hash, "entry_id": entry_id}
+        self.memory_manager.delete_entries(diff.deleted)
+
+        stats.entries_added += len(diff.added)
+        stats.entries_updated += len(diff.updated)
+        stats.entries_unchanged += len(diff.unchanged)
+        stats.entries_deleted += len(diff.deleted)
+
+        state.pages[page_id] = {
+            "last_edited_time": content.last_edited_time,
+            "entries": current,
+        }
+        return True
+
+    def remove_page(self, page_id: str, state: SyncState, stats: SyncStats):
+        """Delete every stored entry of a page that is gone from the workspace."""
+        record = state.pages.pop(page_id, None)
+        if record is None:
+            # Entries stored outside of sync (e.g. by a rebuild) are found by page
+            stats.entries_deleted += len(self.memory_manager.page_records(page_id))
+            self.memory_manager.delete_page_entries(page_id)
+        else:
+            entry_ids = [old["entry_id"] for old in record.get("entries", {}).values()]
+            self.memory_manager.delete_entries(entry_ids)
+            stats.entries_deleted += len(entry_ids)
+        stats.pages_deleted += 1
+
+    def _unchanged(self, page_id: str, edited: Optional[str], state: SyncState):
+        record = state.pages.get(page_id)
+        return bool(record and edited and record.get("last_edited_time") == edited)
+
+    def _sync_rows(
+        self, database: NotionPage, state: SyncState, stats: SyncStats
+    ) -> Set[str]:
+        """Sync the rows of a database edited since its last sync.
+
+        The filter is applied by Notion, so unchanged rows aren't transferred.
+        Returns the ids of the rows that were checked.
+        """
+        since = state.databases.get(database.id)
+        rows = self.client.query_database(
+            database.id,
+            filter=edited_since_filter(since) if since else None,
+            include_blocks=False,
+        )
+        checked, latest, failed = set(), since, False
+        for row in rows:
+            checked.add(row.id)
+            if self._unchanged(row.id, row.last_edited_time, state):
+                stats.pages_skipped += 1
+                continue
+            page = NotionPage(
+                id=row.id,
+                title=row.title,
+                url="",
+                type="page",
+                last_edited_time=row.last_edited_time,
+                parent_id=database.id,
+                archived=row.archived,
+            )
+            if self.sync_page(row.id, state, stats, page):
+                state.save()
+            else:
+                failed = True
+            if row.last_edited_time and row.last_edited_time > (latest or ""):
+                latest = row.last_edited_time
+        # A row that failed is asked for again next time
+        if latest and not failed:
+            state.databases[database.id] = latest
+        return checked
+
+    def _drop_page(self, page_id: str, state: SyncState, stats: SyncStats):
+        """Remove a page's entries, if any were stored."""
+        if page_id in state.pages or self.memory_manager.page_records(page_id):
+            self.remove_page(page_id, state, stats)
+
+    def run(self) -> SyncStats:
+        """Sync every shared page and persist the new state."""
+        state = SyncState(self.state_path)
+        stats = SyncStats()
+
+        seen = set()
+        self._list_databases()
+        queried, checked = set(), set()
+        for key, database in self._databases.items():
+            if self.selector.selects(database):
+                checked |= self._sync_rows(database, state, stats)
+                queried.add(key)
+            else:
+                # Synced from scratch if it is selected again
+                state.databases.pop(database.id, None)
+
+        for page in self.client.iter_shared_pages():
+            if page.archived:
+                continue  # removed below
+            if not self._selects(page):
+                stats.pages_excluded += 1
+                continue
+            seen.add(page.id)
+            stats.pages_seen += 1
+
+            if page.parent_id and normalize_id(page.parent_id) in queried:
+                # Synced with its database above, or not edited since
+                if page.id not in checked:
+                    stats.pages_skipped += 1
+                continue
+            if self._unchanged(page.id, page.last_edited_time, state):
+                stats.pages_skipped += 1
+                continue
+
+            self.sync_page(page.id, state, stats, page)
+            state.save()
+
+        # Rows the query returned exist even if search doesn't list them yet
+        seen |= checked
+        # Enumeration finished without errors, so anything unseen was deleted
+        # or left out, including pages only a rebuild stored and the state
+        # never recorded
+        stored = set(state.pages) | self.memory_manager.get_page_ids()
+        for page_id in sorted(stored - seen):
+            self.remove_page(page_id, state, stats)
+
+        state.save()
+        return stats
@@ -0,0 +1,26 @@
+"""
+Run the Notion webhook listener.
+
+Usage:
+    python -m notion_assistant.webhooks [--host 127.0.0.1] [--port 8000] [--delay 2]
+"""
+
+import argparse
+import uvicorn
+from .listener import create_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--delay", type=float, default=2.0, help="seconds of quiet before re-indexing"
+    )
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(delay=args.delay), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+from typing import Callable, Dict, Optional
+from dataclasses import dataclass
+import threading
+import time
+
+
+@dataclass
+class _PendingPage:
+    due: float
+    first_seen: float
+    deleted: bool
+
+
+class PageDebouncer:
+    """Collapse bursts of change events into one callback per page.
+
+    ``submit(page_id)`` (re)starts a quiet period of ``delay`` seconds for the
+    page; the callback runs once no event for that page arrived during it, or
+    at the latest ``max_delay`` seconds after the burst's first event. The
+    callback is called as ``callback(page_id, deleted)`` from a single worker
+    thread, one page at a time.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[str, bool], None],
+        delay: float = 2.0,
+        max_delay: float = 30.0,
+    ):
+        self.callback = callback
+        self.delay = delay
+        self.max_delay = max(delay, max_delay)
+        self.events = 0  # events submitted
+        self.runs = 0  # callbacks made
+
+        self._pending: Dict[str, _PendingPage] = {}
+        self._running = 0
+        self._flushing = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="webhook-debounce", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, page_id: str, deleted: bool = False):
+        """Record a change to ``page_id``; deletion wins until the page is handled."""
+        now = time.monotonic()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("debouncer is closed")
+            self.events += 1
+            pending = self._pending.get(page_id)
+            if pending is None:
+                self._pending[page_id] = _PendingPage(now + self.delay, now, deleted)
+            else:
+                pending.due = min(now + self.delay, pending.first_seen + self.max_delay)
+                pending.deleted = pending.deleted or deleted
+            self._condition.notify_all()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending) + self._running
+
+    def _next_batch(self) -> Optional[Dict[str, _PendingPage]]:
+        """Wait for pages whose quiet period is over; None once closed and drained."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                force = self._flushing or self._closed
+                due = {
+                    page_id: pending
+                    for page_id, pending in self._pending.items()
+                    if force or pending.due <= now
+                }
+                if due:
+                    for page_id in due:
+                        del self._pending[page_id]
+                    self._running += len(due)
+                    return due
+                if self._closed:
+                    return None
+
+                timeout = None
+                if self._pending:
+                    timeout = min(p.due for p in self._pending.values()) - now
+                self._condition.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            for page_id, pending in batch.items():
+                try:
+                    self.callback(page_id, pending.deleted)
+                except Exception as e:
+                    print(f"Error handling change to page {page_id}: {e}")
+                with self._condition:
+                    self._running -= 1
+                    self.runs += 1
+                    self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Handle every pending page now and wait until done.
+
+        Returns False if ``timeout`` passed first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flushing = True
+            self._condition.notify_all()
+            try:
+                while self._pending or self._running:
+                    remaining = None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return False
+                    self._condition.wait(remaining)
+                return True
+            finally:
+                self._flushing = False
+
+    def close(self):
+        """Handle the remaining pages and stop the worker thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
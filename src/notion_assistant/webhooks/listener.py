@@ -0,0 +1,135 @@
+from typing import Any, Dict, Optional, Tuple
+from contextlib import asynccontextmanager
+import hashlib
+import hmac
+import json
+import os
+import threading
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException, Request
+from notion_assistant.memory.sync import IncrementalSync, SyncState, SyncStats
+from .debounce import PageDebouncer
+
+SIGNATURE_HEADER = "X-Notion-Signature"
+
+
+def page_for_event(event: Dict[str, Any]) -> Optional[Tuple[str, bool]]:
+    """Return ``(page_id, deleted)`` for the page an event touches, if any.
+
+    Every page event names the page as its entity. Block edits arrive as
+    ``page.content_updated`` with the changed blocks in
+    ``data.updated_blocks``; the whole page is re-diffed, so which blocks
+    changed doesn't matter. Comment, database and other events are ignored.
+    """
+    entity = event.get("entity") or {}
+    if entity.get("type") == "page" and entity.get("id"):
+        return entity["id"], event.get("type") == "page.deleted"
+    return None
+
+
+def sign_payload(payload: bytes, verification_token: str) -> str:
+    """Compute the X-Notion-Signature value Notion sends with ``payload``."""
+    digest = hmac.new(verification_token.encode(), payload, hashlib.sha256)
+    return f"sha256={digest.hexdigest()}"
+
+
+class WebhookIndexer:
+    """Re-index single pages through ``IncrementalSync``.
+
+    Reuses the incremental sync's per-entry diff, so a page change only
+    re-embeds the log entries whose content changed, and pages the sync's
+    selector leaves out are not indexed (or are removed if they were). The
+    sync state is saved after every page, so webhook updates and menu syncs
+    share it.
+    """
+
+    def __init__(self, sync: Optional[IncrementalSync] = None):
+        self._owns_sync = sync is None
+        self.sync = sync or IncrementalSync()
+        self.stats = SyncStats()
+        self._lock = threading.Lock()
+
+    def handle(self, page_id: str, deleted: bool = False):
+        with self._lock:
+            state = SyncState(self.sync.state_path)
+            if deleted:
+                self.sync.remove_page(page_id, state, self.stats)
+            elif not self.sync.sync_page(page_id, state, self.stats):
+                return
+            state.save()
+
+    def close(self):
+        """Close the sync (and its Notion client) if created here."""
+        if self._owns_sync:
+            self.sync.close()
+
+
+def create_app(
+    indexer: Optional[WebhookIndexer] = None,
+    delay: float = 2.0,
+    max_delay: float = 30.0,
+    verification_token: Optional[str] = None,
+) -> FastAPI:
+    """Build the webhook service.
+
+    Args:
+        indexer: Re-indexes changed pages. Defaults to one over the default
+            Notion client and memory collection.
+        delay: Seconds of quiet after a page's last event before re-indexing.
+        max_delay: Upper bound on how long a busy page's re-index is put off.
+        verification_token: Token used to check ``X-Notion-Signature``.
+            Defaults to NOTION_WEBHOOK_TOKEN; unsigned events are accepted
+            when neither is set.
+    """
+    load_dotenv()
+    verification_token = verification_token or os.getenv("NOTION_WEBHOOK_TOKEN")
+    owns_indexer = indexer is None
+    indexer = indexer or WebhookIndexer()
+    debouncer = PageDebouncer(indexer.handle, delay=delay, max_delay=max_delay)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        debouncer.close()
+        if owns_indexer:
+            indexer.close()
+
+    app = FastAPI(title="ben webhooks", lifespan=lifespan)
+    app.state.indexer = indexer
+    app.state.debouncer = debouncer
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "pending_pages": debouncer.pending()}
+
+    @app.post("/webhooks/notion")
+    async def receive(request: Request):
+        payload = await request.body()
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid JSON")
+
+        # Once a token is configured, nothing unsigned gets further (not
+        # even into the logs as a verification token)
+        if verification_token:
+            expected = sign_payload(payload, verification_token)
+            received = request.headers.get(SIGNATURE_HEADER, "")
+            if not hmac.compare_digest(expected, received):
+                raise HTTPException(status_code=401, detail="invalid signature")
+
+        # Sent once when the subscription is created; it must be pasted into
+        # the integration settings (and NOTION_WEBHOOK_TOKEN) to verify it
+        if "verification_token" in event:
+            print(f"Notion webhook verification token: {event['verification_token']}")
+            return {"status": "verification received"}
+
+        target = page_for_event(event)
+        if target is None:
+            return {"status": "ignored"}
+
+        page_id, deleted = target
+        debouncer.submit(page_id, deleted=deleted)
+        return {"status": "queued", "page_id": page_id}
+
+    return app
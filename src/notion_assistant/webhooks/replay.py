@@ -0,0 +1,134 @@
+"""
+Replay recorded Notion webhook events against the listener.
+
+Events are read from a JSON-lines file (one webhook payload per line) and
+posted to a running listener or, in tests, straight into the FastAPI app.
+
+Usage:
+    python -m notion_assistant.webhooks.replay events.jsonl \
+        [--url http://127.0.0.1:8000] [--speed 1.0] [--token TOKEN]
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Union
+from datetime import datetime, timezone
+import argparse
+import json
+import time
+import uuid
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from .listener import SIGNATURE_HEADER, sign_payload
+
+WEBHOOK_PATH = "/webhooks/notion"
+
+
+def page_event(
+    page_id: str,
+    event_type: str = "page.content_updated",
+    timestamp: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build a page event shaped like the ones Notion sends."""
+    return {
+        "id": str(uuid.uuid4()),
+        "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
+        "type": event_type,
+        "entity": {"id": page_id, "type": "page"},
+        "data": {},
+    }
+
+
+def blocks_updated_event(
+    page_id: str, block_ids: List[str], timestamp: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the ``page.content_updated`` event Notion sends for block edits."""
+    event = page_event(page_id, "page.content_updated", timestamp)
+    event["data"] = {
+        "updated_blocks": [{"id": block_id, "type": "block"} for block_id in block_ids]
+    }
+    return event
+
+
+def comment_event(
+    comment_id: str, page_id: str, timestamp: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build a ``comment.created`` event for a comment on ``page_id``."""
+    event = page_event(page_id, "comment.created", timestamp)
+    event["entity"] = {"id": comment_id, "type": "comment"}
+    event["data"] = {"page_id": page_id}
+    return event
+
+
+def load_events(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _parse_timestamp(event: Dict[str, Any]) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(
+            event["timestamp"].replace("Z", "+00:00")
+        ).timestamp()
+    except (KeyError, ValueError, AttributeError):
+        return None
+
+
+class EventReplayer:
+    """Post webhook events to a listener URL or directly into an app."""
+
+    def __init__(
+        self, target: Union[str, FastAPI], verification_token: Optional[str] = None
+    ):
+        if isinstance(target, FastAPI):
+            self.http = TestClient(target)
+        else:
+            self.http = httpx.Client(base_url=target)
+        self.verification_token = verification_token
+
+    def close(self):
+        self.http.close()
+
+    def send(self, event: Dict[str, Any]) -> httpx.Response:
+        payload = json.dumps(event).encode()
+        headers = {"Content-Type": "application/json"}
+        if self.verification_token:
+            headers[SIGNATURE_HEADER] = sign_payload(payload, self.verification_token)
+        return self.http.post(WEBHOOK_PATH, content=payload, headers=headers)
+
+    def replay(
+        self, events: Iterable[Dict[str, Any]], speed: float = 0.0
+    ) -> List[httpx.Response]:
+        """Send events in order.
+
+        With ``speed`` > 0, the gaps between event timestamps are reproduced,
+        divided by ``speed``; with 0 events are sent back-to-back.
+        """
+        responses = []
+        previous = None
+        for event in events:
+            timestamp = _parse_timestamp(event)
+            if speed > 0 and previous is not None and timestamp is not None:
+                time.sleep(max(0.0, timestamp - previous) / speed)
+            previous = timestamp if timestamp is not None else previous
+            responses.append(self.send(event))
+        return responses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("events", help="JSON-lines file of webhook payloads")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--speed", type=float, default=0.0)
+    parser.add_argument("--token", default=None, help="verification token to sign with")
+    args = parser.parse_args()
+
+    replayer = EventReplayer(args.url, verification_token=args.token)
+    try:
+        for response in replayer.replay(load_events(args.events), speed=args.speed):
+            print(response.status_code, response.json())
+    finally:
+        replayer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,18 @@ Common test fixtures for the Notion Assistant project.
 """
 
 import pytest
+import hashlib
+import httpx
+import numpy as np
 from datetime import datetime
 from unittest.mock import MagicMock, patch
+from notion_client import Client
 from notion_assistant.api.client import NotionClient
+from notion_assistant.api.fake import FakeNotionWorkspace, block, fake_notion_client
+from notion_assistant.api.ratelimit import RateLimiter
 from notion_assistant.memory.processor import LogEntryProcessor
 from notion_assistant.memory.manager import MemoryManager
+from notion_assistant.memory.resources import ResourceRegistry
 from notion_assistant.memory.llm import OllamaClient
 
 
@@ -20,6 +27,18 @@ class MockChromaCollection:
     def add(self, embeddings, documents, metadatas, ids):
         pass
 
+    def upsert(self, embeddings, documents, metadatas, ids):
+        pass
+
+    def get(self, ids=None, where=None, limit=None, include=None):
+        return {"ids": [], "documents": [], "metadatas": []}
+
+    def delete(self, ids=None, where=None):
+        pass
+
+    def count(self):
+        return 0
+
     def query(self, query_embeddings, n_results):
         return {
             "ids": [["1", "2"]],
@@ -46,48 +65,29 @@ class MockChromaClient:
     def get_or_create_collection(self, name, metadata):
         return MockChromaCollection()
 
+    def get_max_batch_size(self):
+        return 5461
+
 
 class MockSentenceTransformer:
-    def encode(self, text):
-        return [0.1] * 384  # Return a fixed-size embedding
-
-
-class MockNotionClient:
-    def list_shared_pages(self):
-        return [
-            MagicMock(
-                id="test-page-id",
-                title="Test Page",
-                type="page",
-                url="https://notion.so/test-page",
-            )
-        ]
+    def encode(self, text, **kwargs):
+        if isinstance(text, str):
+            return np.full(384, 0.1)  # Return a fixed-size embedding
+        return np.full((len(text), 384), 0.1)
 
-    def get_page_content(self, page_id):
-        return {
-            "results": [
-                {
-                    "id": "1",
-                    "type": "heading_1",
-                    "content": {"rich_text": [{"plain_text": "2024-03-28"}]},
-                    "has_children": False,
-                },
-                {
-                    "id": "2",
-                    "type": "paragraph",
-                    "content": {
-                        "rich_text": [{"plain_text": "Sample log entry for testing."}]
-                    },
-                    "has_children": False,
-                },
-            ]
-        }
 
-    def parse_blocks(self, content):
-        return [
-            MagicMock(type="heading_1", content="2024-03-28"),
-            MagicMock(type="paragraph", content="Sample log entry for testing."),
-        ]
+class HashingSentenceTransformer:
+    """Deterministic stand-in encoder: equal texts get equal unit vectors."""
+
+    def encode(self, text, **kwargs):
+        def embed(value):
+            seed = int.from_bytes(hashlib.sha256(value.encode()).digest()[:4], "big")
+            vector = np.random.default_rng(seed).standard_normal(384)
+            return (vector / np.linalg.norm(vector)).astype(np.float32)
+
+        if isinstance(text, str):
+            return embed(text)
+        return np.stack([embed(value) for value in text])
 
 
 @pytest.fixture
@@ -97,12 +97,46 @@ def mock_llm():
 
 
 @pytest.fixture
-def notion_client():
-    """Fixture providing a NotionClient instance."""
-    with patch(
-        "notion_assistant.api.client.NotionClient", return_value=MockNotionClient()
-    ):
-        return NotionClient()
+def fake_workspace():
+    """Fixture providing a fake Notion workspace with one journal page."""
+    workspace = FakeNotionWorkspace()
+    workspace.add_page(
+        "Test Page",
+        [
+            block("heading_1", "2024-03-28"),
+            block("paragraph", "Sample log entry for testing."),
+        ],
+        page_id="test-page-id",
+    )
+    return workspace
+
+
+@pytest.fixture
+def fake_client():
+    """Fixture providing a factory of NotionClients served by fake workspaces.
+
+    ``fake_client(workspace, **opts)`` passes ``opts`` on to NotionClient,
+    without rate limiting unless a ``rate_limiter`` is given. Pass a
+    ``FakeNotionTransport`` as ``transport`` to count or shape the API calls.
+    """
+
+    def make(workspace, transport=None, **options):
+        if transport is None:
+            sdk_client, _ = fake_notion_client(workspace)
+        else:
+            sdk_client = Client(
+                auth="fake-token", client=httpx.Client(transport=transport)
+            )
+        options.setdefault("rate_limiter", RateLimiter(rate=None))
+        return NotionClient(client=sdk_client, **options)
+
+    return make
+
+
+@pytest.fixture
+def notion_client(fake_client, fake_workspace):
+    """Fixture providing a NotionClient served by the fake workspace."""
+    return fake_client(fake_workspace)
 
 
 @pytest.fixture
@@ -113,16 +147,21 @@ def log_processor(mock_llm):
 
 
 @pytest.fixture
-def memory_manager():
+def memory_manager(tmp_path):
     """Fixture providing a MemoryManager instance."""
     with patch(
-        "notion_assistant.memory.manager.chromadb.PersistentClient",
+        "notion_assistant.memory.resources.chromadb.PersistentClient",
         return_value=MockChromaClient(),
     ), patch(
-        "notion_assistant.memory.manager.SentenceTransformer",
+        "notion_assistant.memory.resources.SentenceTransformer",
         return_value=MockSentenceTransformer(),
     ):
-        return MemoryManager()
+        # A temp data dir keeps the embedding cache out of the real one
+        manager = MemoryManager(
+            data_dir=str(tmp_path / "data"), registry=ResourceRegistry()
+        )
+        manager.model  # loaded while the patch is active
+        return manager
 
 
 @pytest.fixture
@@ -147,3 +186,15 @@ def sample_page_content():
             },
         ],
     }
+
+
+@pytest.fixture
+def local_memory_manager(tmp_path):
+    """Fixture providing a MemoryManager on a real Chroma store in a temp dir."""
+    registry = ResourceRegistry()
+    with patch(
+        "notion_assistant.memory.resources.SentenceTransformer",
+        return_value=HashingSentenceTransformer(),
+    ):
+        yield MemoryManager(data_dir=str(tmp_path / "data"), registry=registry)
+    registry.clear()
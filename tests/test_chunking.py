@@ -0,0 +1,55 @@
+"""
+Tests for chunking long log entries.
+"""
+
+from datetime import datetime
+from notion_assistant.memory.chunking import TextChunker
+from notion_assistant.memory.models import LogEntry
+
+
+def _long_entry_text():
+    lines = ["2024-03-28"]
+    lines += [f"morning note {i} about the garden and the weather" for i in range(6)]
+    lines.append("the migration finally shipped after lunch")
+    lines += [f"evening note {i} about dinner and a long walk" for i in range(6)]
+    return "\n".join(lines)
+
+
+def test_chunks_fit_the_budget_and_overlap():
+    """Test that chunks respect the token budget, overlap and line breaks."""
+    chunker = TextChunker(max_tokens=22, overlap=6)
+    text = _long_entry_text()
+    chunks = chunker.split(text)
+
+    assert len(chunks) > 1
+    assert all(chunker.count_tokens(chunk) <= 20 for chunk in chunks)
+    # Every line is in some chunk, and neighbours share text
+    for line in text.split("\n"):
+        assert any(line in chunk for chunk in chunks)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert previous.split("\n")[-1] in chunk or chunk.split()[0] in previous
+    # Short texts stay whole
+    assert chunker.split("2024-03-28\nshort") == ["2024-03-28\nshort"]
+
+
+def test_search_returns_matching_chunks(local_memory_manager):
+    """Test that search matches chunks and merges them back into entries."""
+    local_memory_manager.chunker = TextChunker(max_tokens=22, overlap=0)
+    text = _long_entry_text()
+    entry = LogEntry(date=datetime(2024, 3, 28), blocks=[], raw_text=text)
+    entry_id = local_memory_manager.store_entry(entry)
+    local_memory_manager.store_entry(
+        LogEntry(date=datetime(2024, 3, 27), blocks=[], raw_text="a short day")
+    )
+
+    chunks = local_memory_manager.chunker.split(text)
+    target = next(chunk for chunk in chunks if "migration" in chunk)
+    results = local_memory_manager.search(target, top_k=2, chunks_per_entry=1)
+
+    assert results[0].entry.id == entry_id
+    assert results[0].entry.raw_text == text
+    assert results[0].chunks == [target]
+    assert local_memory_manager.chunks.count() == len(chunks) + 1
+
+    local_memory_manager.delete_entry(entry_id)
+    assert local_memory_manager.chunks.count() == 1
@@ -0,0 +1,99 @@
+"""
+Tests for the embedding backends.
+"""
+
+import os
+import numpy as np
+import pytest
+from notion_assistant.memory.manager import MemoryManager
+from notion_assistant.memory.resources import ResourceRegistry, exported_model_path
+
+
+@pytest.fixture
+def tiny_model(tmp_path):
+    """A small random BERT sentence transformer, saved to disk."""
+    from sentence_transformers import SentenceTransformer
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    words = "the a log entry garden code review walk dinner plan idea".split()
+    vocab = tmp_path / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words))
+    path = str(tmp_path / "tiny")
+    BertTokenizerFast(vocab_file=str(vocab)).save_pretrained(path)
+    config = BertConfig(
+        vocab_size=len(words) + 5,
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        max_position_embeddings=64,
+    )
+    BertModel(config).save_pretrained(path)
+    return SentenceTransformer(path, local_files_only=True)
+
+
+def test_onnx_int8_export_matches_torch(tiny_model, tmp_path):
+    """Test that the quantized export embeds like the torch model."""
+    pytest.importorskip("onnx")
+    from notion_assistant.memory.embedders import OnnxEmbedder
+
+    path = str(tmp_path / "tiny.onnx-int8")
+    exported = OnnxEmbedder.export(tiny_model, path)
+    assert OnnxEmbedder.exists(path)
+
+    texts = ["the garden", "a log entry about code review and a walk", "idea"]
+    expected = tiny_model.encode(texts)
+    for embedder in (exported, OnnxEmbedder(path)):
+        vectors = embedder.encode(texts, batch_size=2)
+        assert vectors.shape == expected.shape
+        cosine = np.sum(vectors * expected, axis=1) / (
+            np.linalg.norm(vectors, axis=1) * np.linalg.norm(expected, axis=1)
+        )
+        assert cosine.min() > 0.99
+    assert embedder.encode("idea").shape == (32,)
+
+
+def test_backend_selection(tmp_path):
+    """Test that backends are validated and keep separate embedding caches."""
+    registry = ResourceRegistry()
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        MemoryManager(
+            data_dir=str(tmp_path / "data"), registry=registry, backend="tensorrt"
+        )
+
+    torch_manager = MemoryManager(data_dir=str(tmp_path / "data"), registry=registry)
+    onnx_manager = MemoryManager(
+        data_dir=str(tmp_path / "data"), registry=registry, backend="onnx-int8"
+    )
+    assert torch_manager.backend == "torch"
+    assert torch_manager.embedding_cache is not onnx_manager.embedding_cache
+    registry.clear()
+
+
+def test_models_from_different_paths_are_kept_apart(tmp_path):
+    """Test that exports and caches are keyed by where the model is loaded from."""
+    registry = ResourceRegistry()
+    data_dir = str(tmp_path / "data")
+    paths = [str(tmp_path / "a" / "model"), str(tmp_path / "b" / "model")]
+    for path in paths:
+        os.makedirs(path)
+
+    managers = [
+        MemoryManager(data_dir=data_dir, registry=registry, model_path=path)
+        for path in paths
+    ]
+    assert managers[0].embedding_cache is not managers[1].embedding_cache
+    again = MemoryManager(data_dir=data_dir, registry=registry, model_path=paths[0])
+    assert again.embedding_cache is managers[0].embedding_cache
+
+    exported = {
+        registry.locate(
+            "all-MiniLM-L6-v2", data_dir, path, offline=True, backend="onnx-int8"
+        )[0]
+        for path in paths
+    }
+    assert len(exported) == 2
+    assert (
+        exported_model_path(data_dir, "all-MiniLM-L6-v2", "onnx-int8") not in exported
+    )
+    registry.clear()
@@ -0,0 +1,57 @@
+"""
+Tests for the persistent embedding cache.
+"""
+
+import numpy as np
+from datetime import datetime
+from notion_assistant.memory.embedding_cache import EmbeddingCache
+from notion_assistant.memory.models import LogEntry
+
+
+def _vector(i):
+    return np.full(4, i, dtype=np.float32)
+
+
+def test_cache_tiers_persist_and_evict(tmp_path):
+    """Test LRU and disk hits, persistence, eviction and per-model keys."""
+    path = str(tmp_path / "embeddings.sqlite")
+    cache = EmbeddingCache(path, "model-a", memory_items=2, max_items=10)
+    texts = [f"text {i}" for i in range(12)]
+
+    assert cache.get_many(texts[:3]) == [None, None, None]
+    cache.put_many(texts, [_vector(i) for i in range(12)])
+    assert cache.stats.evictions == 3  # 12 > 10, evicted down to 9
+
+    hits = cache.get_many(["text 11", "text 11", "text 5"])
+    assert [v[0] for v in hits] == [11, 11, 5]
+    assert (cache.stats.memory_hits, cache.stats.disk_hits) == (2, 1)
+    cache.close()
+
+    # Another process (a fresh cache) reads the file; other models miss
+    cache = EmbeddingCache(path, "model-a")
+    assert cache.get_many(["text 0"]) == [None]  # evicted as least recent
+    assert cache.get_many(["text 7"])[0][0] == 7
+    assert EmbeddingCache(path, "model-b").get_many(["text 7"]) == [None]
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_manager_embeds_each_text_once(local_memory_manager):
+    """Test that repeated texts and queries go through the cache."""
+    calls = []
+    encode = local_memory_manager.model.encode
+
+    def counting_encode(texts, **kwargs):
+        calls.extend(texts)
+        return encode(texts, **kwargs)
+
+    local_memory_manager.model.encode = counting_encode
+    entry = LogEntry(date=datetime(2024, 3, 28), blocks=[], raw_text="same words")
+    entry_id = local_memory_manager.store_entry(entry)
+    local_memory_manager.update_entry(entry_id, "same words")
+    local_memory_manager.search("a query")
+    local_memory_manager.search("a query")
+
+    assert calls == ["same words", "a query"]
+    stats = local_memory_manager.embedding_cache.stats
+    assert (stats.hits, stats.misses) == (2, 2)
@@ -0,0 +1,91 @@
+"""
+Tests for LLM enrichment of log entries.
+"""
+
+import threading
+import time
+from datetime import datetime
+from notion_assistant.memory.enrich import EntryEnricher
+from notion_assistant.memory.models import LogEntry
+
+
+class SlowLLM:
+    """Stand-in for OllamaClient that records how many calls overlap."""
+
+    model = "test-model"
+
+    def __init__(self, fail_on=None):
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def analyze_entry(self, text, date):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+        if text == self.fail_on:
+            raise ConnectionError("ollama is down")
+        return f"summary of {text}", 0.9 if "launch" in text else 0.2
+
+
+def _entries(texts):
+    return [
+        LogEntry(date=datetime(2024, 3, day + 1), blocks=[], raw_text=text)
+        for day, text in enumerate(texts)
+    ]
+
+
+def test_enrichment_is_concurrent_bounded_and_cached(tmp_path):
+    """Test the concurrency limit and that cached entries are not re-analyzed."""
+    cache_path = str(tmp_path / "cache.json")
+    llm = SlowLLM(fail_on="broken")
+    enricher = EntryEnricher(llm, cache_path=cache_path, max_concurrency=3)
+    entries = _entries([f"day {i}" for i in range(9)] + ["broken"])
+    enricher.enrich(entries)
+    enricher.close()
+
+    assert llm.calls == 10
+    assert 1 < llm.max_active <= 3
+    assert entries[4].summary == "summary of day 4"
+    assert entries[-1].summary is None
+    assert (enricher.stats.analyzed, enricher.stats.failed) == (9, 1)
+
+    # A new enricher reads the cache; only the failed entry is retried
+    llm = SlowLLM()
+    enricher = EntryEnricher(llm, cache_path=cache_path)
+    entries = _entries([f"day {i}" for i in range(9)] + ["broken"])
+    enricher.enrich(entries)
+    assert llm.calls == 1
+    assert enricher.stats.cached == 9
+    assert entries[0].importance == 0.2
+
+
+def test_enriched_metadata_ranks_search(local_memory_manager, tmp_path):
+    """Test that summary and importance are stored and used for ranking."""
+    entries = _entries(["plain day", "the launch day"])
+    for entry in entries:
+        entry.date = datetime(2024, 3, 1)
+    local_memory_manager.upsert_entries(entries)
+
+    # Enriching unchanged entries only rewrites their metadata
+    enricher = EntryEnricher(SlowLLM(), cache_path=str(tmp_path / "cache.json"))
+    enricher.enrich(entries)
+    assert local_memory_manager.upsert_entries(entries) == 0
+
+    stored = {e.raw_text: e for e in local_memory_manager.get_all_entries()}
+    assert stored["the launch day"].summary == "summary of the launch day"
+    assert stored["the launch day"].importance == 0.9
+
+    results = local_memory_manager.search("plain day", top_k=2)
+    launch = next(r for r in results if r.entry.raw_text == "the launch day")
+    plain = next(r for r in results if r.entry.raw_text == "plain day")
+    assert launch.entry.importance == 0.9
+    assert launch.final_score - launch.similarity_score > (
+        plain.final_score - plain.similarity_score
+    )
@@ -6,6 +6,7 @@ import pytest
 from datetime import datetime
 from notion_assistant.memory.processor import LogEntryProcessor
 from notion_assistant.api.models import NotionBlock, BlockContent, RichText
+from notion_assistant.api.models import PageContent
 
 
 def test_process_page(log_processor, sample_page_content):
@@ -67,3 +68,73 @@ def test_summarize_chunk(log_processor):
     assert hasattr(entry, "importance")
     assert isinstance(entry.importance, float)
     assert 0 <= entry.importance <= 1
+
+
+def _text_block(block_id, block_type, text):
+    return NotionBlock(
+        id=block_id,
+        type=block_type,
+        content=BlockContent(rich_text=[RichText(plain_text=text)]),
+    )
+
+
+def test_process_stream_emits_entry_when_next_heading_arrives():
+    """Test that entries are emitted lazily, one date heading at a time."""
+    processor = LogEntryProcessor()
+    consumed = []
+
+    def blocks():
+        for block in [
+            _text_block("1", "heading_2", "3/27"),
+            _text_block("2", "paragraph", "first"),
+            _text_block("3", "heading_2", "3/28"),
+            _text_block("4", "paragraph", "second"),
+        ]:
+            consumed.append(block.id)
+            yield block
+
+    stream = processor.process_stream(blocks())
+    first = next(stream)
+    assert first.raw_text == "3/27\nfirst"
+    assert consumed == ["1", "2", "3"]
+
+    second = next(stream)
+    assert second.raw_text == "3/28\nsecond"
+    assert second.date == datetime(2024, 3, 28)
+
+
+def test_process_pages_matches_serial_order():
+    """Test that pooled processing returns process_page's entries, in page order."""
+
+    def block(block_id, block_type, text):
+        return {
+            "id": block_id,
+            "type": block_type,
+            "content": {"rich_text": [{"plain_text": text}] if text else []},
+        }
+
+    pages = [
+        PageContent.model_validate(
+            {
+                "title": f"Page {page}",
+                "id": str(page),
+                "blocks": [
+                    block(f"{page}-intro", "paragraph", "before any date"),
+                    block(f"{page}-a", "heading_2", f"2024-03-{page % 28 + 1:02d}"),
+                    block(f"{page}-b", "paragraph", f"page {page} first day"),
+                    block(f"{page}-c", "divider", None),
+                    block(f"{page}-d", "heading_3", f"{page % 12 + 1}/5"),
+                    block(f"{page}-e", "to_do", f"page {page} second day"),
+                ],
+            }
+        )
+        for page in range(40)
+    ]
+    processor = LogEntryProcessor()
+
+    expected = [processor.process_page(page) for page in pages]
+    result = processor.process_pages(pages, workers=2, chunksize=3)
+
+    assert result == expected
+    assert result[7][0].raw_text == "2024-03-08\npage 7 first day"
+    assert [len(entries) for entries in result] == [2] * 40
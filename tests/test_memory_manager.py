@@ -2,10 +2,14 @@
 Tests for the MemoryManager class.
 """
 
+import os
 import pytest
+import threading
 from datetime import datetime
+from unittest.mock import patch
 from notion_assistant.memory.manager import MemoryManager
 from notion_assistant.memory.models import LogEntry
+from notion_assistant.memory.resources import ResourceRegistry, staged_model_path
 
 
 def test_store_entry(memory_manager):
@@ -75,3 +79,113 @@ def test_recency_bias(memory_manager):
     assert len(results) == 2
     # Newer entry should have a higher final score
     assert results[0].final_score >= results[1].final_score
+
+
+def test_store_entries_batches(local_memory_manager):
+    """Test that store_entries embeds in batches and returns ids in order."""
+    calls = []
+    encode = local_memory_manager.model.encode
+
+    def counting_encode(texts, **kwargs):
+        calls.append(len(texts))
+        return encode(texts, **kwargs)
+
+    local_memory_manager.model.encode = counting_encode
+    entries = [
+        LogEntry(date=datetime(2024, 3, day), blocks=[], raw_text=f"day {day}")
+        for day in range(1, 11)
+    ]
+    ids = local_memory_manager.store_entries(entries, batch_size=4)
+
+    assert calls == [4, 4, 2]
+    assert ids == [entry.id for entry in entries]
+    assert ids[0] == local_memory_manager.store_entry(entries[0])
+    assert local_memory_manager.collection.count() == 10
+    stored = {e.id: e.raw_text for e in local_memory_manager.get_all_entries()}
+    assert stored[ids[6]] == "day 7"
+
+
+def test_managers_share_registry_resources(tmp_path):
+    """Test that managers share one lazily loaded model and Chroma client."""
+    registry = ResourceRegistry()
+    data_dir = str(tmp_path / "data")
+    with patch("notion_assistant.memory.resources.SentenceTransformer") as model_class:
+        first = MemoryManager(data_dir=data_dir, registry=registry)
+        second = MemoryManager(
+            collection_name="other_logs", data_dir=data_dir, registry=registry
+        )
+        assert model_class.call_count == 0  # nothing embedded yet
+        assert first.model is second.model
+        assert model_class.call_count == 1
+    assert first.client is second.client
+    assert first.embedding_cache is second.embedding_cache
+    registry.clear()
+
+
+def test_model_load_does_not_block_other_managers(tmp_path):
+    """Test that a manager can be created while the model loads elsewhere."""
+    registry = ResourceRegistry()
+    data_dir = str(tmp_path / "data")
+    loading, release = threading.Event(), threading.Event()
+
+    def slow_load(*args, **kwargs):
+        loading.set()
+        release.wait(10)
+        return object()
+
+    with patch(
+        "notion_assistant.memory.resources.SentenceTransformer", side_effect=slow_load
+    ):
+        first = MemoryManager(data_dir=data_dir, registry=registry)
+        preload = first.preload_model()
+        assert loading.wait(5)
+
+        created = []
+        second = threading.Thread(
+            target=lambda: created.append(
+                MemoryManager(
+                    collection_name="other_logs", data_dir=data_dir, registry=registry
+                )
+            )
+        )
+        second.start()
+        second.join(5)
+        loaded = first.model_load
+
+        release.set()
+        preload.join(5)
+        assert created and loaded is None
+        assert created[0].model is first.model
+    registry.clear()
+
+
+def test_staged_model_loads_offline(tmp_path):
+    """Test that a model staged in the data dir loads without the hub."""
+    data_dir = str(tmp_path / "data")
+    staged = staged_model_path(data_dir, "all-MiniLM-L6-v2")
+    os.makedirs(staged)
+    open(os.path.join(staged, "modules.json"), "w").write("[]")
+
+    registry = ResourceRegistry()
+    with patch("notion_assistant.memory.resources.SentenceTransformer") as model_class:
+        manager = MemoryManager(data_dir=data_dir, registry=registry, offline=True)
+        assert manager.model_load is None
+        manager.model
+    model_class.assert_called_once_with(staged, local_files_only=True)
+    assert manager.model_load.source == "staged"
+    registry.clear()
+
+
+def test_offline_without_local_model_fails_fast(tmp_path):
+    """Test that strict offline mode refuses to fall back to the hub."""
+    with pytest.raises(FileNotFoundError, match="not staged"):
+        MemoryManager(
+            data_dir=str(tmp_path / "data"), registry=ResourceRegistry(), offline=True
+        )
+    with pytest.raises(FileNotFoundError):
+        MemoryManager(
+            data_dir=str(tmp_path / "data"),
+            registry=ResourceRegistry(),
+            model_path=str(tmp_path / "missing"),
+            offline=True,
+        )
@@ -0,0 +1,55 @@
+"""
+Tests for the local SQLite mirror of the Notion block tree.
+"""
+
+from notion_assistant.api.fake import FakeNotionTransport, FakeNotionWorkspace, block
+from notion_assistant.api.mirror import NotionMirror
+
+
+def test_mirror_serves_identical_tree_without_api_calls(fake_client, tmp_path):
+    """Test that a mirrored page is rebuilt exactly and without hitting the API."""
+    workspace = FakeNotionWorkspace(page_size=3)
+    page_id = workspace.add_synthetic_journal(days=3, blocks_per_day=3, depth=3)
+    mirror = NotionMirror(str(tmp_path / "mirror.sqlite"))
+    transport = FakeNotionTransport(workspace)
+    client = fake_client(workspace, transport, mirror=mirror)
+
+    fetched = client.get_page_content(page_id)
+    calls = transport.calls
+    mirrored = client.get_page_content(page_id, from_mirror=True)
+
+    assert mirrored == fetched
+    assert transport.calls == calls
+    assert mirror.page_ids() == [page_id]
+
+
+def test_refetch_replaces_removed_blocks(fake_client, tmp_path):
+    """Test that re-fetching a page drops blocks deleted in Notion."""
+    workspace = FakeNotionWorkspace()
+    page_id = workspace.add_page(
+        "Page", [block("toggle", "t", children=[block("paragraph", "child")])]
+    )
+    mirror = NotionMirror(str(tmp_path / "mirror.sqlite"))
+    client = fake_client(workspace, mirror=mirror)
+    client.get_page_content(page_id)
+
+    workspace.remove_page(page_id)
+    workspace.add_page("Page", [block("paragraph", "only")], page_id=page_id)
+    client.get_page_content(page_id)
+
+    children = mirror.read_children(page_id)
+    assert sum(len(blocks) for blocks in children.values()) == 1
+
+
+def test_streamed_pages_write_top_level_blocks(fake_client, tmp_path):
+    """Test that streaming a page stores its top-level blocks in the mirror."""
+    workspace = FakeNotionWorkspace(page_size=2)
+    page_id = workspace.add_page(
+        "Page", [block("paragraph", text) for text in ("a", "b", "c")]
+    )
+    mirror = NotionMirror(str(tmp_path / "mirror.sqlite"))
+    client = fake_client(workspace, mirror=mirror)
+
+    streamed = [b.id for b in client.iter_page_blocks(page_id)]
+
+    assert [b["id"] for b in mirror.read_children(page_id)[page_id]] == streamed
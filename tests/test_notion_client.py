@@ -2,9 +2,26 @@
 Tests for the NotionClient class.
 """
 
+import httpx
 import pytest
 from datetime import datetime
-from notion_assistant.api.client import NotionClient
+from notion_client import Client
+from notion_assistant.api.async_client import AsyncNotionClient, BlockingNotionClient
+from notion_assistant.api.client import NotionClient, edited_since_filter
+from notion_assistant.api.fake import (
+    Cassette,
+    FakeNotionServer,
+    FakeNotionTransport,
+    FakeNotionWorkspace,
+    RecordingTransport,
+    block,
+    date_property,
+    fake_async_notion_client,
+    select_property,
+)
+from notion_assistant.api.http import HttpOptions, build_http_client, build_sdk_client
+from notion_assistant.api.models import PageContent
+from notion_assistant.api.ratelimit import RateLimiter
 
 
 def test_list_shared_pages(notion_client):
@@ -25,25 +42,258 @@ def test_get_page_content(notion_client):
     if pages:
         page_id = pages[0].id
         content = notion_client.get_page_content(page_id)
-        assert isinstance(content, dict)
-        assert "results" in content
-        assert isinstance(content["results"], list)
+        assert isinstance(content, PageContent)
+        assert content.title == pages[0].title
+        assert isinstance(content.blocks, list)
+        assert len(content.blocks) > 0
 
 
-def test_parse_blocks(notion_client, sample_page_content):
-    """Test parsing blocks from page content."""
-    blocks = notion_client.parse_blocks(sample_page_content)
+def test_parse_blocks(notion_client, fake_workspace):
+    """Test parsing blocks from raw API block objects."""
+    raw_blocks = [
+        fake_workspace.blocks[block_id]
+        for block_id in fake_workspace.children["test-page-id"]
+    ]
+    blocks = notion_client._parse_blocks(raw_blocks)
     assert isinstance(blocks, list)
     assert len(blocks) > 0
 
+    def text(block):
+        return "".join(rt.plain_text for rt in block.content.rich_text)
+
     # Check first block (heading)
     first_block = blocks[0]
     assert first_block.type == "heading_1"
-    assert isinstance(first_block.content, str)
-    assert first_block.content == "2024-03-28"
+    assert text(first_block) == "2024-03-28"
 
     # Check second block (paragraph)
     second_block = blocks[1]
     assert second_block.type == "paragraph"
-    assert isinstance(second_block.content, str)
-    assert "Sample log entry" in second_block.content
+    assert "Sample log entry" in text(second_block)
+
+
+def _flatten(blocks, depth=0):
+    for block in blocks:
+        yield depth, "".join(rt.plain_text for rt in block.content.rich_text)
+        yield from _flatten(block.children or [], depth + 1)
+
+
+def test_concurrent_tree_walk_preserves_order(fake_client):
+    """Test that concurrent child fetching keeps the original block order."""
+    workspace = FakeNotionWorkspace(page_size=3)
+    page_id = workspace.add_synthetic_journal(days=3, blocks_per_day=4, depth=3)
+
+    sequential = fake_client(workspace, max_workers=1)
+    concurrent = fake_client(workspace, max_workers=8)
+
+    expected = list(_flatten(sequential.get_page_content(page_id).blocks))
+    actual = list(_flatten(concurrent.get_page_content(page_id).blocks))
+    assert actual == expected
+    assert len(actual) == len(workspace.blocks)
+
+
+def test_async_client_matches_sync_client(fake_client):
+    """Test that the async client returns the same models as the sync client."""
+    workspace = FakeNotionWorkspace(page_size=4)
+    page_id = workspace.add_synthetic_journal(days=2, blocks_per_day=3, depth=2)
+
+    expected = fake_client(workspace)
+    blocking = BlockingNotionClient(
+        AsyncNotionClient(
+            client=fake_async_notion_client(workspace)[0],
+            max_concurrency=4,
+            rate_limiter=RateLimiter(rate=None),
+        )
+    )
+    try:
+        assert blocking.list_shared_pages() == expected.list_shared_pages()
+        assert blocking.get_page_content(page_id) == expected.get_page_content(page_id)
+    finally:
+        blocking.close()
+
+
+def test_iter_shared_pages_follows_next_cursor(fake_client):
+    """Test that page enumeration reads every search result page."""
+    workspace = FakeNotionWorkspace(page_size=2)
+    page_ids = [workspace.add_page(f"Page {i}") for i in range(5)]
+    transport = FakeNotionTransport(workspace)
+    client = fake_client(workspace, transport)
+
+    pages = client.iter_shared_pages()
+    assert next(pages).id == page_ids[0]
+    assert transport.calls == 1  # later result pages are fetched lazily
+    assert [page.id for page in pages] == page_ids[1:]
+    assert transport.calls == 3
+
+
+def test_iter_page_blocks_streams_resolved_blocks(fake_client):
+    """Test that top-level blocks are yielded with children before the page is done."""
+    workspace = FakeNotionWorkspace(page_size=5)
+    page_id = workspace.add_synthetic_journal(days=4, blocks_per_day=4, depth=2)
+    transport = FakeNotionTransport(workspace)
+    client = fake_client(workspace, transport, max_workers=4)
+
+    stream = client.iter_page_blocks(page_id)
+    first = next(stream)
+    calls_after_first = transport.calls
+    streamed = [first] + list(stream)
+
+    assert calls_after_first < transport.calls
+    assert streamed == client.get_page_content(page_id).blocks
+
+
+def test_query_database_pushes_down_filters(fake_client):
+    """Test that database rows are filtered, sorted and parsed with properties."""
+    workspace = FakeNotionWorkspace(page_size=2)
+    database_id = workspace.add_database("Daily log")
+    for day in range(1, 6):
+        workspace.add_database_row(
+            database_id,
+            f"Day {day}",
+            properties={
+                "Date": date_property(f"2024-03-0{day}"),
+                "Mood": select_property("good"),
+            },
+            blocks=[block("paragraph", f"entry {day}")],
+            last_edited_time=f"2024-03-0{day}T12:00:00.000Z",
+        )
+    client = fake_client(workspace)
+
+    rows = list(
+        client.query_database(
+            database_id,
+            filter=edited_since_filter("2024-03-02T23:59:59.000Z"),
+            sorts=[{"property": "Date", "direction": "descending"}],
+        )
+    )
+
+    assert [row.title for row in rows] == ["Day 5", "Day 4", "Day 3"]
+    assert rows[0].properties == {"Name": "Day 5", "Date": "2024-03-05", "Mood": "good"}
+    assert rows[0].blocks[0].content.rich_text[0].plain_text == "entry 5"
+
+
+def test_fast_parse_matches_validated_parse(fake_client):
+    """Test that fast parsing builds the same blocks, minus dropped annotations."""
+    workspace = FakeNotionWorkspace(page_size=4)
+    page_id = workspace.add_synthetic_journal(days=2, blocks_per_day=3, depth=2)
+
+    validated = fake_client(workspace)
+    annotated = fake_client(workspace, fast_parse=True, keep_annotations=True)
+    fast = fake_client(workspace, fast_parse=True)
+
+    expected = validated.get_page_content(page_id)
+    assert annotated.get_page_content(page_id) == expected
+
+    blocks = fast.get_page_content(page_id).blocks
+    assert list(_flatten(blocks)) == list(_flatten(expected.blocks))
+    assert all(
+        rt.annotations == {} for block in blocks for rt in block.content.rich_text
+    )
+
+
+def test_client_owns_pooled_http_client(monkeypatch):
+    """Test that a given httpx client is used, keeps its timeouts and is closed."""
+    monkeypatch.setenv("NOTION_TOKEN", "fake-token")
+    workspace = FakeNotionWorkspace()
+    page_id = workspace.add_page("Journal")
+    timeout = httpx.Timeout(connect=1.0, read=2.0, write=3.0, pool=4.0)
+    http_client = httpx.Client(
+        transport=FakeNotionTransport(workspace), timeout=timeout
+    )
+
+    client = NotionClient(http_client=http_client, rate_limiter=RateLimiter(rate=None))
+    assert [page.id for page in client.list_shared_pages()] == [page_id]
+    assert http_client.timeout == timeout
+
+    client.close()
+    assert http_client.is_closed
+
+
+def test_pooled_http_client_reuses_connections():
+    """Test that concurrent tree walks reuse kept-alive connections."""
+    workspace = FakeNotionWorkspace(page_size=5)
+    page_id = workspace.add_synthetic_journal(days=3, blocks_per_day=4, depth=2)
+
+    with FakeNotionServer(workspace) as server:
+        http_client = build_http_client(HttpOptions(), pool_size=4)
+        client = NotionClient(
+            client=build_sdk_client("fake-token", http_client, base_url=server.url),
+            max_workers=4,
+            rate_limiter=RateLimiter(rate=None),
+        )
+        content = client.get_page_content(page_id)
+        client.close()
+        http_client.close()
+
+    assert len(list(_flatten(content.blocks))) == len(workspace.blocks)
+    assert server.connections <= 4
+    assert server.requests > 4 * server.connections
+
+
+def test_child_loading_limits_reduce_api_calls(fake_client):
+    """Test max_depth, skip_types and lazy loading of block children."""
+    workspace = FakeNotionWorkspace()
+    page_id = workspace.add_synthetic_journal(days=3, blocks_per_day=3, depth=2)
+
+    def fetch(**options):
+        transport = FakeNotionTransport(workspace)
+        client = fake_client(workspace, transport)
+        return client.get_page_content(page_id, **options), transport
+
+    full, full_transport = fetch()
+
+    shallow, transport = fetch(max_depth=0)
+    assert transport.calls == 2  # the page and its top-level children
+    assert [b.id for b in shallow.blocks] == [b.id for b in full.blocks]
+    assert all(b.children is None for b in shallow.blocks)
+
+    skipped, transport = fetch(skip_types=["toggle"])
+    toggles = [b for b in skipped.blocks if b.type == "toggle"]
+    assert toggles and all(b.has_children and b.children is None for b in toggles)
+    assert transport.calls < full_transport.calls
+
+    lazy, transport = fetch(lazy=True)
+    assert transport.calls == 2
+    assert list(_flatten(lazy.blocks)) == list(_flatten(full.blocks))
+    assert transport.calls == full_transport.calls
+
+
+def test_recorded_responses_replay_offline(fake_client, tmp_path):
+    """Test that a recorded cassette answers the same reads as the source."""
+    workspace = FakeNotionWorkspace(page_size=3)
+    page_id = workspace.add_synthetic_journal(days=2, blocks_per_day=3, depth=2)
+    cassette_path = str(tmp_path / "cassette.jsonl")
+
+    recorder = RecordingTransport(cassette_path, inner=FakeNotionTransport(workspace))
+    recording = fake_client(workspace, recorder, max_workers=1)
+    expected = recording.get_page_content(page_id)
+    pages = recording.list_shared_pages()
+    recorder.close()
+
+    cassette = Cassette(cassette_path)
+    client = fake_client(cassette, FakeNotionTransport(cassette, latency=0.001))
+    assert client.get_page_content(page_id) == expected
+    assert client.list_shared_pages() == pages
+    assert client.get_page_content("never-recorded") is None
+
+
+def test_fake_server_injects_rate_limits():
+    """Test that injected 429s are retried so the fetch still completes."""
+    workspace = FakeNotionWorkspace(page_size=4)
+    page_id = workspace.add_synthetic_journal(days=2, blocks_per_day=3, depth=2)
+    limiter = RateLimiter(rate=None, base_delay=0.001)
+
+    with FakeNotionServer(workspace, rate_limit_every=4) as server:
+        http_client = build_http_client(pool_size=4)
+        client = NotionClient(
+            client=build_sdk_client("fake-token", http_client, base_url=server.url),
+            max_workers=4,
+            rate_limiter=limiter,
+        )
+        content = client.get_page_content(page_id)
+        client.close()
+        http_client.close()
+
+    assert len(list(_flatten(content.blocks))) == len(workspace.blocks)
+    assert server.rate_limited > 0
+    assert limiter.stats().rate_limited == server.rate_limited
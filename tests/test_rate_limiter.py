@@ -0,0 +1,67 @@
+"""
+Tests for the Notion API rate limiter.
+"""
+
+import time
+import pytest
+from notion_client.errors import APIResponseError
+from notion_assistant.api.fake import (
+    FakeNotionTransport,
+    FakeNotionWorkspace,
+    fake_notion_client,
+)
+from notion_assistant.api.ratelimit import RateLimiter, get_rate_limiter
+
+
+def test_shared_limiter_is_process_wide(fake_client):
+    """Test that clients share one limiter by default."""
+    workspace = FakeNotionWorkspace()
+    first = fake_client(workspace, rate_limiter=None)
+    second = fake_client(workspace, rate_limiter=None)
+    assert first.rate_limiter is second.rate_limiter is get_rate_limiter()
+
+
+def test_token_bucket_paces_requests():
+    """Test that requests beyond the burst are spread out at the configured rate."""
+    limiter = RateLimiter(rate=50.0, burst=1)
+    start = time.monotonic()
+    for _ in range(11):
+        limiter.acquire()
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.18
+    assert limiter.stats().throttled >= 9
+
+
+def test_rate_limited_calls_are_retried_without_losing_blocks(fake_client):
+    """Test that injected 429s are retried and the block tree stays complete."""
+    workspace = FakeNotionWorkspace(page_size=5)
+    page_id = workspace.add_synthetic_journal(days=3, blocks_per_day=3, depth=2)
+    transport = FakeNotionTransport(workspace, rate_limit_every=3)
+    limiter = RateLimiter(rate=None, base_delay=0.001)
+    client = fake_client(workspace, transport, rate_limiter=limiter)
+
+    content = client.get_page_content(page_id)
+
+    assert content is not None
+    assert transport.rate_limited > 0
+    stats = limiter.stats()
+    assert stats.rate_limited == transport.rate_limited
+    assert stats.retried == transport.rate_limited
+
+    def count(blocks):
+        return sum(1 + count(block.children or []) for block in blocks)
+
+    assert count(content.blocks) == len(workspace.blocks)
+
+
+def test_exhausted_retries_raise():
+    """Test that a call still failing after max_retries raises."""
+    workspace = FakeNotionWorkspace()
+    sdk_client, _ = fake_notion_client(workspace, rate_limit_every=1)
+    limiter = RateLimiter(rate=None, max_retries=2, base_delay=0.001)
+
+    with pytest.raises(APIResponseError):
+        limiter.call(sdk_client.search, filter={"property": "object", "value": "page"})
+    assert limiter.stats().retried == 2
+    assert limiter.stats().failed == 1
@@ -0,0 +1,144 @@
+"""
+Tests for the multi-page rebuild pipeline.
+"""
+
+from unittest.mock import MagicMock, patch
+from notion_assistant.api.fake import FakeNotionWorkspace, block
+from notion_assistant.memory.rebuild import PageSelector, RebuildPipeline
+
+
+def _workspace():
+    workspace = FakeNotionWorkspace(page_size=2)
+    workspace.add_page(
+        "Journal",
+        [
+            block("heading_2", "2024-03-27"),
+            block("paragraph", "journal day one"),
+            block("heading_2", "2024-03-28"),
+            block("paragraph", "journal day two"),
+        ],
+    )
+    workspace.add_page(
+        "Work log", [block("heading_2", "2024-03-28"), block("paragraph", "shipped")]
+    )
+    database_id = workspace.add_database("Daily log")
+    for day in (1, 2, 3):
+        workspace.add_database_row(
+            database_id,
+            f"Day {day}",
+            blocks=[
+                block("heading_2", f"2024-04-0{day}"),
+                block("paragraph", f"row {day}"),
+            ],
+        )
+    return workspace
+
+
+def test_rebuild_covers_every_page_and_database(fake_client, local_memory_manager):
+    """Test that all pages and database rows are stored, rows only once."""
+    pipeline = RebuildPipeline(
+        fake_client(_workspace()), memory_manager=local_memory_manager, page_workers=3
+    )
+    stats = pipeline.run()
+
+    assert stats.pages == 5
+    assert stats.databases == 1
+    assert stats.entries == 6
+    assert stats.failed == 0
+    assert stats.entries_per_second > 0
+    texts = {e.raw_text for e in local_memory_manager.get_all_entries()}
+    assert "2024-03-28\nshipped" in texts
+    assert "2024-04-02\nrow 2" in texts
+    assert len(texts) == 6
+
+
+def test_rebuild_honors_include_and_exclude(fake_client, local_memory_manager):
+    """Test that the selector limits which pages and databases are rebuilt."""
+    workspace = _workspace()
+    selector = PageSelector(include=["journal", "daily log"], exclude=["Daily log"])
+    stats = RebuildPipeline(
+        fake_client(workspace), memory_manager=local_memory_manager, selector=selector
+    ).run()
+
+    assert stats.pages == 1
+    assert stats.databases == 0
+    assert stats.entries == 2
+    # The excluded database's rows are not rebuilt as stand-alone pages either
+    assert stats.skipped == 5
+
+
+def test_rebuild_skips_rows_of_excluded_databases(fake_client, local_memory_manager):
+    """Test that excluding a database also leaves out its rows."""
+    workspace = _workspace()
+    database_id = workspace.add_database("Private log")
+    workspace.add_database_row(
+        database_id,
+        "Secret day",
+        blocks=[block("heading_2", "2024-03-01"), block("paragraph", "secret")],
+    )
+    selector = PageSelector(exclude=["Private log"])
+    stats = RebuildPipeline(
+        fake_client(workspace), memory_manager=local_memory_manager, selector=selector
+    ).run()
+
+    texts = {e.raw_text for e in local_memory_manager.get_all_entries()}
+    assert "2024-03-01\nsecret" not in texts
+    assert len(texts) == 6
+    assert stats.skipped == 2  # the database and its row
+
+
+def test_rebuild_streams_long_pages_in_batches(fake_client, local_memory_manager):
+    """Test that a long page is stored in batches as its blocks stream in."""
+    workspace = FakeNotionWorkspace(page_size=4)
+    blocks = []
+    for day in range(1, 21):
+        blocks += [block("heading_2", f"2024-05-{day:02d}"), block("paragraph", "x")]
+    workspace.add_page("Long log", blocks)
+    reported = []
+    pipeline = RebuildPipeline(
+        fake_client(workspace), memory_manager=local_memory_manager, batch_size=3
+    )
+    stats = pipeline.run(on_page=lambda title, count: reported.append((title, count)))
+
+    assert stats.entries == stats.embedded == 20
+    assert reported == [("Long log", 20)]
+    assert len(local_memory_manager.get_entry_ids()) == 20
+
+
+def test_rebuild_is_idempotent(fake_client, local_memory_manager):
+    """Test that re-ingesting unchanged pages embeds nothing and drops stale ids."""
+    workspace = _workspace()
+    first = RebuildPipeline(
+        fake_client(workspace), memory_manager=local_memory_manager
+    ).run()
+    assert first.embedded == 6
+    ids = set(local_memory_manager.get_entry_ids())
+
+    second = RebuildPipeline(
+        fake_client(workspace), memory_manager=local_memory_manager
+    ).run()
+    assert second.entries == 6
+    assert second.embedded == 0
+    assert second.deleted == 0
+    assert set(local_memory_manager.get_entry_ids()) == ids
+
+    selector = PageSelector(exclude=["Work log"])
+    third = RebuildPipeline(
+        fake_client(workspace), memory_manager=local_memory_manager, selector=selector
+    ).run()
+    assert third.embedded == 0
+    assert third.deleted == 1
+    assert len(local_memory_manager.get_entry_ids()) == 5
+
+
+def test_pipeline_closes_only_clients_it_created(local_memory_manager):
+    """Test that a pipeline closes its own Notion client, not a caller's."""
+    with patch("notion_assistant.api.client.NotionClient") as client_class:
+        with RebuildPipeline(memory_manager=local_memory_manager):
+            pass
+    client_class.return_value.close.assert_called_once()
+
+    shared = MagicMock()
+    with RebuildPipeline(client=shared, memory_manager=local_memory_manager):
+        pass
+    shared.close.assert_not_called()
@@ -0,0 +1,59 @@
+"""
+Tests for workspace snapshot export and the offline client.
+"""
+
+import pytest
+from notion_assistant.api.client import edited_since_filter
+from notion_assistant.api.fake import FakeNotionWorkspace, block, date_property
+from notion_assistant.api.snapshot import OfflineNotionClient, iter_snapshot
+
+
+def _workspace():
+    workspace = FakeNotionWorkspace(page_size=3)
+    journal = workspace.add_synthetic_journal(days=3, blocks_per_day=3, depth=2)
+    workspace.add_page("Empty")
+    database_id = workspace.add_database("Daily log")
+    for day in (1, 2):
+        workspace.add_database_row(
+            database_id,
+            f"Day {day}",
+            properties={"Date": date_property(f"2024-04-0{day}")},
+            blocks=[block("paragraph", f"row {day}")],
+            last_edited_time=f"2024-04-0{day}T12:00:00.000Z",
+        )
+    return workspace, journal, database_id
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz"])
+def test_offline_client_replays_exported_workspace(fake_client, tmp_path, suffix):
+    """Test that a snapshot answers every read like the live workspace."""
+    workspace, journal, database_id = _workspace()
+    live = fake_client(workspace)
+    path = str(tmp_path / f"workspace{suffix}")
+
+    stats = live.export_snapshot(path)
+    assert stats.pages == len(workspace.pages)
+    assert stats.databases == 1
+    assert stats.blocks == len(workspace.blocks)
+    assert next(iter_snapshot(path))["kind"] == "snapshot"
+
+    offline = OfflineNotionClient(path)
+    assert offline.list_shared_pages() == live.list_shared_pages()
+    assert offline.list_shared_databases() == live.list_shared_databases()
+    assert offline.get_page_content(journal) == live.get_page_content(journal)
+    edited = edited_since_filter("2024-04-01T23:00:00.000Z")
+    assert list(offline.query_database(database_id, filter=edited)) == list(
+        live.query_database(database_id, filter=edited)
+    )
+    assert offline.get_page_content("missing-page") is None
+
+
+def test_zstd_snapshot_round_trip(fake_client, tmp_path):
+    """Test the zstd format when the optional zstandard package is installed."""
+    pytest.importorskip("zstandard")
+    workspace, journal, _ = _workspace()
+    live = fake_client(workspace)
+    path = str(tmp_path / "workspace.jsonl.zst")
+    live.export_snapshot(path)
+    offline = OfflineNotionClient(path)
+    assert offline.get_page_content(journal) == live.get_page_content(journal)
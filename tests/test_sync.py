@@ -0,0 +1,285 @@
+"""
+Tests for incremental sync.
+"""
+
+from unittest.mock import patch
+from notion_assistant.api.client import edited_since_filter
+from notion_assistant.api.fake import DEFAULT_EDITED_TIME, FakeNotionWorkspace, block
+from notion_assistant.memory.diff import diff_entries
+from notion_assistant.memory.processor import LogEntryProcessor
+from notion_assistant.memory.rebuild import RebuildPipeline
+from notion_assistant.memory.selector import PageSelector
+from notion_assistant.memory.sync import IncrementalSync
+
+
+def _journal(workspace):
+    return workspace.add_page(
+        "Journal",
+        [
+            block("heading_2", "2024-03-27"),
+            block("paragraph", "first day", id="p1"),
+            block("heading_2", "2024-03-28"),
+            block("paragraph", "second day", id="p2"),
+        ],
+    )
+
+
+def test_unchanged_pages_are_skipped(fake_client, local_memory_manager):
+    """Test that a second sync without edits does no work."""
+    workspace = FakeNotionWorkspace()
+    _journal(workspace)
+    sync = IncrementalSync(fake_client(workspace), memory_manager=local_memory_manager)
+
+    first = sync.run()
+    assert first.entries_added == 2
+    second = sync.run()
+    assert second.pages_skipped == 1
+    assert second.entries_added == 0
+    assert len(local_memory_manager.get_all_entries()) == 2
+
+
+def test_only_changed_entries_are_reembedded(fake_client, local_memory_manager):
+    """Test that editing one block replaces only its log entry."""
+    workspace = FakeNotionWorkspace()
+    _journal(workspace)
+    sync = IncrementalSync(fake_client(workspace), memory_manager=local_memory_manager)
+    sync.run()
+
+    workspace.edit_block("p2", "second day, edited", "2024-03-29T10:00:00.000Z")
+    stats = sync.run()
+
+    assert stats.entries_updated == 1
+    assert stats.entries_unchanged == 1
+    assert stats.entries_added == 0
+    assert stats.entries_deleted == 0
+    texts = sorted(e.raw_text for e in local_memory_manager.get_all_entries())
+    assert texts == ["2024-03-27\nfirst day", "2024-03-28\nsecond day, edited"]
+
+
+def test_nested_edits_are_picked_up(fake_client, local_memory_manager):
+    """Test that an edit below an unchanged block still updates its entry."""
+    workspace = FakeNotionWorkspace()
+    workspace.add_page(
+        "Journal",
+        [
+            block("heading_2", "2024-03-27"),
+            block("toggle", "notes", children=[block("paragraph", "old", id="c1")]),
+        ],
+    )
+    sync = IncrementalSync(fake_client(workspace), memory_manager=local_memory_manager)
+    sync.run()
+
+    workspace.edit_block("c1", "new", "2024-03-29T10:00:00.000Z")
+    stats = sync.run()
+
+    assert stats.entries_updated == 1
+    assert stats.entries_unchanged == 0
+
+
+def test_deleted_pages_are_removed(fake_client, local_memory_manager):
+    """Test that entries of a page no longer in the workspace are deleted."""
+    workspace = FakeNotionWorkspace()
+    page_id = _journal(workspace)
+    sync = IncrementalSync(fake_client(workspace), memory_manager=local_memory_manager)
+    sync.run()
+
+    workspace.remove_page(page_id)
+    stats = sync.run()
+
+    assert stats.pages_deleted == 1
+    assert local_memory_manager.get_all_entries() == []
+
+
+def test_pages_deleted_after_rebuild_are_removed(fake_client, local_memory_manager):
+    """Test that a sync after a rebuild drops pages the state never recorded."""
+    workspace = FakeNotionWorkspace()
+    kept = workspace.add_page(
+        "Kept", [block("heading_2", "2024-03-27"), block("paragraph", "kept")]
+    )
+    gone = workspace.add_page(
+        "Gone", [block("heading_2", "2024-03-28"), block("paragraph", "gone")]
+    )
+    RebuildPipeline(fake_client(workspace), memory_manager=local_memory_manager).run()
+
+    workspace.remove_page(gone)
+    stats = IncrementalSync(
+        fake_client(workspace), memory_manager=local_memory_manager
+    ).run()
+
+    assert stats.pages_deleted == 1
+    assert stats.entries_deleted == 1
+    assert local_memory_manager.get_page_ids() == {kept}
+
+
+def _excluded_pages(workspace):
+    workspace.add_page(
+        "Scratchpad", [block("heading_2", "2024-03-29"), block("paragraph", "secret")]
+    )
+    database_id = workspace.add_database("Private log")
+    workspace.add_database_row(
+        database_id,
+        "Monday",
+        blocks=[block("heading_2", "2024-03-30"), block("paragraph", "private")],
+    )
+
+
+def test_sync_keeps_pages_excluded_from_the_rebuild_out(
+    fake_client, local_memory_manager, monkeypatch
+):
+    """Test that sync and rebuild follow the same include/exclude lists."""
+    monkeypatch.setenv("NOTION_REBUILD_EXCLUDE", "Scratchpad,Private log")
+    workspace = FakeNotionWorkspace()
+    _journal(workspace)
+    _excluded_pages(workspace)
+    RebuildPipeline(fake_client(workspace), memory_manager=local_memory_manager).run()
+
+    stats = IncrementalSync(
+        fake_client(workspace), memory_manager=local_memory_manager
+    ).run()
+
+    assert stats.pages_excluded == 2
+    texts = sorted(e.raw_text for e in local_memory_manager.get_all_entries())
+    assert texts == ["2024-03-27\nfirst day", "2024-03-28\nsecond day"]
+
+
+def test_sync_removes_pages_no_longer_selected(fake_client, local_memory_manager):
+    """Test that entries of newly excluded pages and database rows are removed."""
+    workspace = FakeNotionWorkspace()
+    _journal(workspace)
+    _excluded_pages(workspace)
+    selector = PageSelector()
+    IncrementalSync(
+        fake_client(workspace), memory_manager=local_memory_manager, selector=selector
+    ).run()
+    assert len(local_memory_manager.get_page_ids()) == 3
+
+    selector = PageSelector(exclude=["scratchpad", "private log"])
+    stats = IncrementalSync(
+        fake_client(workspace), memory_manager=local_memory_manager, selector=selector
+    ).run()
+
+    assert stats.pages_excluded == 2
+    assert stats.pages_deleted == 2
+    texts = sorted(e.raw_text for e in local_memory_manager.get_all_entries())
+    assert texts == ["2024-03-27\nfirst day", "2024-03-28\nsecond day"]
+
+
+def test_trashed_pages_are_removed(fake_client, local_memory_manager):
+    """Test that a page moved to the trash counts as deleted."""
+    workspace = FakeNotionWorkspace()
+    page_id = _journal(workspace)
+    sync = IncrementalSync(fake_client(workspace), memory_manager=local_memory_manager)
+    sync.run()
+
+    workspace.pages[page_id].update(
+        in_trash=True, last_edited_time="2024-03-29T10:00:00.000Z"
+    )
+    stats = sync.run()
+
+    assert stats.pages_deleted == 1
+    assert local_memory_manager.get_all_entries() == []
+
+
+def test_only_rows_edited_since_the_last_sync_are_requested(
+    fake_client, local_memory_manager
+):
+    """Test that database rows are fetched with an edited-since filter."""
+    workspace = FakeNotionWorkspace()
+    database_id = workspace.add_database("Daily log")
+    for day, (date, text) in enumerate(
+        [("2024-03-27", "monday"), ("2024-03-28", "tuesday")]
+    ):
+        workspace.add_database_row(
+            database_id,
+            date,
+            blocks=[block("heading_2", date), block("paragraph", text, id=f"r{day}")],
+        )
+    client = fake_client(workspace)
+    sync = IncrementalSync(client, memory_manager=local_memory_manager)
+    assert sync.run().entries_added == 2
+
+    workspace.edit_block("r1", "tuesday, edited", "2024-03-29T10:00:00.000Z")
+    with patch.object(client, "query_database", wraps=client.query_database) as query:
+        stats = sync.run()
+
+    query.assert_called_once_with(
+        database_id,
+        filter=edited_since_filter(DEFAULT_EDITED_TIME),
+        include_blocks=False,
+    )
+    assert stats.entries_updated == 1
+    assert stats.pages_skipped == 1
+    texts = sorted(e.raw_text for e in local_memory_manager.get_all_entries())
+    assert texts == ["2024-03-27\nmonday", "2024-03-28\ntuesday, edited"]
+
+
+def test_diff_yields_minimal_operations(fake_client):
+    """Test that only entries whose content changed are added, updated or deleted."""
+    workspace = FakeNotionWorkspace()
+    page_id = _journal(workspace)
+    client = fake_client(workspace)
+    processor = LogEntryProcessor()
+
+    first = diff_entries({}, processor.process_page(client.get_page_content(page_id)))
+    assert len(first.added) == 2
+    previous = {
+        key: {"hash": content_hash, "entry_id": f"entry-{i}"}
+        for i, (key, content_hash, _) in enumerate(first.added)
+    }
+
+    # Touching a block without changing its text is not a change
+    workspace.edit_block("p1", "first day", "2024-03-29T10:00:00.000Z")
+    workspace.edit_block("p2", "second day, edited", "2024-03-29T10:00:00.000Z")
+    workspace.add_block(page_id, block("heading_2", "2024-03-29"))
+    workspace.add_block(page_id, block("paragraph", "third day"))
+    entries = processor.process_page(client.get_page_content(page_id))
+    del previous[next(iter(previous))]  # pretend the first entry was never stored
+    previous["gone"] = {"hash": "x", "entry_id": "entry-gone"}
+    diff = diff_entries(previous, entries)
+
+    assert [entry.raw_text for _, _, entry in diff.added] == [
+        "2024-03-27\nfirst day",
+        "2024-03-29\nthird day",
+    ]
+    assert [entry_id for *_, entry_id in diff.updated] == ["entry-1"]
+    assert diff.deleted == ["entry-gone"]
+
+
+def test_updated_entries_keep_their_ids(fake_client, local_memory_manager):
+    """Test that an edited entry is overwritten in place."""
+    workspace = FakeNotionWorkspace()
+    _journal(workspace)
+    sync = IncrementalSync(fake_client(workspace), memory_manager=local_memory_manager)
+    sync.run()
+    ids = {e.raw_text: e.id for e in local_memory_manager.get_all_entries()}
+
+    workspace.edit_block("p1", "first day", "2024-03-29T10:00:00.000Z")
+    workspace.edit_block("p2", "second day, edited", "2024-03-29T10:00:00.000Z")
+    stats = sync.run()
+
+    assert stats.entries_unchanged == 1
+    after = {e.raw_text: e.id for e in local_memory_manager.get_all_entries()}
+    assert after["2024-03-27\nfirst day"] == ids["2024-03-27\nfirst day"]
+    assert after["2024-03-28\nsecond day, edited"] == ids["2024-03-28\nsecond day"]
+
+
+def test_first_sync_reuses_rebuilt_entries(fake_client, local_memory_manager):
+    """Test that a sync after a rebuild compares against the stored hashes."""
+    workspace = FakeNotionWorkspace()
+    page_id = _journal(workspace)
+    processor = LogEntryProcessor()
+    entries = processor.process_page(fake_client(workspace).get_page_content(page_id))
+    for entry in entries:
+        entry.page_id = page_id
+    assert local_memory_manager.upsert_entries(entries) == 2
+    assert local_memory_manager.upsert_entries(entries) == 0
+
+    workspace.edit_block("p2", "second day, edited", "2024-03-29T10:00:00.000Z")
+    stats = IncrementalSync(
+        fake_client(workspace), memory_manager=local_memory_manager
+    ).run()
+
+    assert stats.entries_unchanged == 1
+    assert stats.entries_updated == 1
+    assert stats.entries_added == 0
+    assert sorted(local_memory_manager.get_entry_ids()) == sorted(e.id for e in entries)
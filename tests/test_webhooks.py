@@ -0,0 +1,174 @@
+"""
+Tests for the webhook listener, its debouncer and the event replayer.
+"""
+
+import json
+import threading
+from notion_assistant.api.fake import FakeNotionWorkspace, block
+from notion_assistant.memory.rebuild import RebuildPipeline
+from notion_assistant.memory.selector import PageSelector
+from notion_assistant.memory.sync import IncrementalSync
+from notion_assistant.webhooks.debounce import PageDebouncer
+from notion_assistant.webhooks.listener import WebhookIndexer, create_app
+from notion_assistant.webhooks.replay import (
+    EventReplayer,
+    blocks_updated_event,
+    comment_event,
+    page_event,
+)
+
+
+def test_debouncer_collapses_bursts_per_page():
+    """Test that a burst of events for one page triggers a single callback."""
+    calls = []
+    lock = threading.Lock()
+
+    def callback(page_id, deleted):
+        with lock:
+            calls.append((page_id, deleted))
+
+    debouncer = PageDebouncer(callback, delay=60)
+    for _ in range(5):
+        debouncer.submit("page-a")
+    debouncer.submit("page-b")
+    debouncer.submit("page-b", deleted=True)
+    debouncer.submit("page-b")  # a late edit doesn't undo the deletion
+
+    assert calls == []  # still inside the quiet period
+    assert debouncer.flush(timeout=5)
+    debouncer.close()
+    assert sorted(calls) == [("page-a", False), ("page-b", True)]
+    assert debouncer.events == 8
+
+
+def test_replayed_events_reindex_only_changed_entries(
+    fake_client, local_memory_manager
+):
+    """Test that replayed edit events re-embed only the edited entry."""
+    workspace = FakeNotionWorkspace()
+    page_id = workspace.add_page(
+        "Journal",
+        [
+            block("heading_2", "2024-03-27"),
+            block("paragraph", "first day", id="p1"),
+            block("heading_2", "2024-03-28"),
+            block("paragraph", "second day", id="p2"),
+        ],
+    )
+    sync = IncrementalSync(fake_client(workspace), memory_manager=local_memory_manager)
+    sync.run()
+
+    indexer = WebhookIndexer(sync)
+    app = create_app(indexer, delay=60, verification_token="secret")
+    replayer = EventReplayer(app, verification_token="secret")
+
+    workspace.edit_block("p2", "second day, edited", "2024-03-29T10:00:00.000Z")
+    responses = replayer.replay(
+        [
+            page_event(page_id),
+            blocks_updated_event(page_id, ["p2"]),
+            comment_event("c1", page_id),
+            page_event(page_id),
+        ]
+    )
+    statuses = [r.json()["status"] for r in responses]
+    assert statuses == ["queued", "queued", "ignored", "queued"]
+    assert app.state.debouncer.flush(timeout=10)
+
+    assert indexer.stats.entries_updated == 1
+    assert indexer.stats.entries_unchanged == 1
+    texts = sorted(e.raw_text for e in local_memory_manager.get_all_entries())
+    assert texts == ["2024-03-27\nfirst day", "2024-03-28\nsecond day, edited"]
+
+    replayer.send(page_event(page_id, "page.deleted"))
+    assert app.state.debouncer.flush(timeout=10)
+    assert local_memory_manager.get_all_entries() == []
+    replayer.close()
+
+
+def test_deleted_event_after_rebuild_removes_entries(fake_client, local_memory_manager):
+    """Test that a deleted page is removed even if only a rebuild stored it."""
+    workspace = FakeNotionWorkspace()
+    kept = workspace.add_page(
+        "Kept", [block("heading_2", "2024-03-27"), block("paragraph", "kept")]
+    )
+    gone = workspace.add_page(
+        "Gone", [block("heading_2", "2024-03-28"), block("paragraph", "gone")]
+    )
+    RebuildPipeline(fake_client(workspace), memory_manager=local_memory_manager).run()
+    indexer = WebhookIndexer(
+        IncrementalSync(fake_client(workspace), memory_manager=local_memory_manager)
+    )
+
+    indexer.handle(gone, deleted=True)
+
+    assert indexer.stats.entries_deleted == 1
+    assert local_memory_manager.get_page_ids() == {kept}
+
+
+def test_indexer_removes_trashed_pages(fake_client, local_memory_manager):
+    """Test that an update event for a page in the trash removes its entries."""
+    workspace = FakeNotionWorkspace()
+    page_id = workspace.add_page(
+        "Journal", [block("heading_2", "2024-03-27"), block("paragraph", "day")]
+    )
+    indexer = WebhookIndexer(
+        IncrementalSync(fake_client(workspace), memory_manager=local_memory_manager)
+    )
+    indexer.handle(page_id)
+    assert local_memory_manager.get_page_ids() == {page_id}
+
+    workspace.pages[page_id]["archived"] = True
+    indexer.handle(page_id)
+
+    assert indexer.stats.pages_deleted == 1
+    assert local_memory_manager.get_all_entries() == []
+
+
+def test_indexer_skips_excluded_pages(fake_client, local_memory_manager):
+    """Test that webhook updates follow the include/exclude lists."""
+    workspace = FakeNotionWorkspace()
+    scratchpad = workspace.add_page(
+        "Scratchpad", [block("heading_2", "2024-03-29"), block("paragraph", "secret")]
+    )
+    database_id = workspace.add_database("Private log")
+    row = workspace.add_database_row(
+        database_id,
+        "Monday",
+        blocks=[block("heading_2", "2024-03-30"), block("paragraph", "private")],
+    )
+    indexer = WebhookIndexer(
+        IncrementalSync(
+            fake_client(workspace),
+            memory_manager=local_memory_manager,
+            selector=PageSelector(),
+        )
+    )
+    indexer.handle(row)
+    assert local_memory_manager.get_page_ids() == {row}
+
+    indexer.sync.selector = PageSelector(exclude=["Scratchpad", "Private log"])
+    indexer.handle(scratchpad)
+    indexer.handle(row)
+
+    assert indexer.stats.pages_excluded == 2
+    assert local_memory_manager.get_all_entries() == []
+
+
+def test_listener_rejects_bad_signatures(fake_client, local_memory_manager):
+    """Test that unsigned events are refused when a token is configured."""
+    client = fake_client(FakeNotionWorkspace())
+    indexer = WebhookIndexer(
+        IncrementalSync(client, memory_manager=local_memory_manager)
+    )
+    app = create_app(indexer, verification_token="secret")
+    unsigned = EventReplayer(app)
+
+    assert unsigned.send(page_event("page-a")).status_code == 401
+    # Unsigned verification payloads can't put tokens into the logs either
+    response = unsigned.http.post(
+        "/webhooks/notion", content=json.dumps({"verification_token": "forged"})
+    )
+    assert response.status_code == 401
+    assert app.state.debouncer.pending() == 0
+    unsigned.close()